@@ -3,6 +3,10 @@ ASGI config for saw_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Endpoint /calculate/stream/ (server-sent events, lihat spk.live) hanya jalan
+di bawah server ASGI, mis. ``uvicorn saw_project.asgi:application``; satu
+event loop menahan banyak koneksi tanpa satu worker/thread per client.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
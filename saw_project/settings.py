@@ -43,12 +43,17 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Melayani STATIC_ROOT (hasil collectstatic) beserta varian .br/.gz
+    'spk.staticfiles.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'spk.routers.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Harus paling akhir: menjalankan view di bawah profiler jika diminta staff
+    'spk.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'saw_project.urls'
@@ -86,6 +91,71 @@ DATABASES = {
     }
 }
 
+# Cache bersama untuk semua proses (worker WSGI, proses ASGI untuk stream SSE,
+# management command): data version dan hasil SAW.
+# Buat tabelnya sekali dengan ``python manage.py createcachetable``. Bila Redis
+# tersedia, ganti dengan 'django.core.cache.backends.redis.RedisCache'.
+# Jangan memakai LocMemCache di produksi: kenaikan data version dari proses
+# lain tidak akan terlihat.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'spk_cache',
+        'TIMEOUT': 3600,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+}
+# Umur maksimum hasil turunan di cache (detik), walau key sudah memuat data version
+SPK_CACHE_TIMEOUT = 3600
+
+# Read replica: tambahkan alias di DATABASES lalu daftarkan di SPK_DB_REPLICAS,
+# contoh 'replica': {... 'HOST': 'db-replica'}. View bertanda @replica_reads akan
+# membaca dari replica; tulis dan read-after-write tetap di primary.
+DATABASE_ROUTERS = ['spk.routers.PrimaryReplicaRouter']
+SPK_DB_REPLICAS = []
+# Lama (detik) session tetap membaca dari primary setelah menulis
+SPK_REPLICA_PIN_SECONDS = 5
+# Umur maksimum cache untuk hasil yang dihitung dari replica
+SPK_REPLICA_CACHE_TIMEOUT = 30
+
+
+# Session dan user yang login hanya di-cache bila ada cache non-database:
+# dengan DatabaseCache setiap hit tetap satu SELECT, sama mahalnya dengan
+# session database biasa. Isi SPK_SESSION_CACHE_URL (mis. redis://127.0.0.1:6379/1,
+# butuh paket ``redis``) agar request yang login tidak perlu query session/user.
+# Saat DEBUG dipakai LocMemCache (satu proses runserver). Tanpa keduanya session
+# disimpan di database dan user dimuat dari database setiap request.
+SPK_SESSION_CACHE_URL = os.environ.get('SPK_SESSION_CACHE_URL')
+if SPK_SESSION_CACHE_URL:
+    CACHES['sessions'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SPK_SESSION_CACHE_URL,
+    }
+elif DEBUG:
+    CACHES['sessions'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'spk-sessions',
+    }
+
+if 'sessions' in CACHES:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    SESSION_CACHE_ALIAS = 'sessions'
+    # Alias cache untuk CachedModelBackend; None = tanpa cache user
+    SPK_AUTH_USER_CACHE_ALIAS = 'sessions'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    SPK_AUTH_USER_CACHE_ALIAS = None
+
+# ModelBackend tetap terdaftar agar session lama yang menyimpan backend tersebut
+# (``_auth_user_backend``) tidak ter-logout; login baru memakai CachedModelBackend.
+AUTHENTICATION_BACKENDS = [
+    'spk.auth_backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+# Umur cache user yang login (detik); batas waktu berlakunya perubahan password
+# atau status aktif yang tidak lewat signal (mis. queryset.update())
+SPK_AUTH_USER_CACHE_TIMEOUT = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -130,6 +200,18 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 
+# Build: ``python manage.py collectstatic`` menulis file ber-hash beserta varian
+# .gz/.br (brotli opsional) ke STATIC_ROOT; dilayani spk.staticfiles.StaticFilesMiddleware
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'spk.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+
+# Umur cache (detik) untuk file static tanpa hash di nama file
+SPK_STATIC_MAX_AGE = 60
+
 LOGIN_REDIRECT_URL = 'saw'
 LOGOUT_REDIRECT_URL = 'login'
 
@@ -137,3 +219,34 @@ LOGOUT_REDIRECT_URL = 'login'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Alamat IP yang boleh membaca endpoint /metrics/ (scraper lokal)
+SPK_METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# Hasil profiling on-demand (header X-SPK-Profile atau ?_profile=1, khusus staff)
+SPK_PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+SPK_PROFILE_SAMPLE_INTERVAL = 0.001
+
+# Jumlah framework per halaman di framework_list (keyset pagination)
+SPK_FRAMEWORK_PAGE_SIZE = 50
+
+# Umur fragment cache tabel (detik); key sudah memuat data version
+SPK_FRAGMENT_CACHE_TIMEOUT = 600
+
+# Jumlah baris matriks X/R/kontribusi per halaman di hasil SAW
+SPK_MATRIX_PAGE_SIZE = 20
+
+# Di atas jumlah framework ini, bobot objektif dihitung per chunk (spk.streaming)
+SPK_STREAMING_THRESHOLD = 50000
+
+# Server-sent events ranking (spk.live): interval cek data version, heartbeat
+# untuk koneksi idle (detik) dan jumlah baris teratas yang dikirim
+SPK_SSE_POLL_INTERVAL = 2
+SPK_SSE_HEARTBEAT = 15
+SPK_SSE_RANKING_SIZE = 100
+
+# Warm-up cache setelah data berubah (spk.warmup): jeda debounce dan batas
+# tunda maksimum (detik) untuk rentetan perubahan
+SPK_WARMUP_ENABLED = True
+SPK_WARMUP_DELAY = 2
+SPK_WARMUP_MAX_DELAY = 30
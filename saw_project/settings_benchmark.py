@@ -0,0 +1,16 @@
+"""
+Settings untuk menjalankan benchmark terhadap SQLite:
+
+    python manage.py benchmark_saw --settings=saw_project.settings_benchmark
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'benchmarks' / 'benchmark.sqlite3',
+    }
+}
+
+# Benchmark mengukur perhitungan dingin; jangan hangatkan cache di latar
+SPK_WARMUP_ENABLED = False
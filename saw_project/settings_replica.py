@@ -0,0 +1,24 @@
+"""
+Settings lokal untuk mencoba routing primary/replica dengan dua file SQLite:
+
+    python manage.py migrate --settings=saw_project.settings_replica
+    python manage.py migrate --database=replica --settings=saw_project.settings_replica
+    python manage.py runserver --settings=saw_project.settings_replica
+
+Replikasi tidak disimulasikan; salin ``primary.sqlite3`` ke ``replica.sqlite3``
+untuk menyamakan isinya.
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'primary.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+SPK_DB_REPLICAS = ['replica']
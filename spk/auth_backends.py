@@ -0,0 +1,52 @@
+"""
+Backend autentikasi yang menyimpan hasil ``get_user`` di cache.
+
+Cache yang dipakai adalah alias ``SPK_AUTH_USER_CACHE_ALIAS`` (cache session
+non-database, lihat settings). Bersama ``SESSION_ENGINE = cached_db`` request
+yang sudah login tidak perlu query ke tabel session maupun ``auth_user``.
+Tanpa alias tersebut backend ini sama dengan ``ModelBackend``: menyimpan user
+di DatabaseCache tidak menghemat round trip ke database.
+
+Cache dihapus oleh signal setiap kali User disimpan/dihapus (lihat
+``spk.signals``). Perubahan yang melewati signal (``queryset.update()``, SQL
+langsung) berlaku paling lambat setelah ``SPK_AUTH_USER_CACHE_TIMEOUT`` detik:
+saat itu user dimuat ulang dari database, ``is_active`` dicek ulang dan hash
+session dibandingkan dengan password terbaru oleh ``django.contrib.auth``.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+from . import metrics as spk_metrics
+
+
+def user_cache_key(user_id):
+    return f'spk:auth-user:{user_id}'
+
+
+def _user_cache():
+    alias = getattr(settings, 'SPK_AUTH_USER_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def invalidate_user(user_id):
+    cache = _user_cache()
+    if cache is not None:
+        cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        cache = _user_cache()
+        if cache is None:
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is not None:
+            spk_metrics.record_cache(True)
+            return user if self.user_can_authenticate(user) else None
+        spk_metrics.record_cache(False)
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(key, user, getattr(settings, 'SPK_AUTH_USER_CACHE_TIMEOUT', 60))
+        return user
@@ -0,0 +1,300 @@
+"""
+Generator dataset sintetis dan runner benchmark untuk hot path SAW.
+
+Dipakai oleh management command ``benchmark_saw``. Semua skenario dijalankan
+end-to-end lewat Django test client (middleware, session, login_required,
+render template) terhadap database test, sehingga angka yang keluar sebanding
+dengan yang dirasakan user.
+"""
+import csv
+import io
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+
+import django
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from . import history
+from .caching import bump_data_version
+from .models import Criteria, Framework, FrameworkScore
+
+SCENARIOS = ('calculate_saw', 'framework_list', 'export_data', 'upload_csv', 'import_data')
+
+# Batas ukuran file dari CSVUploadForm
+UPLOAD_LIMIT = 5 * 1024 * 1024
+
+# Skema tetap yang dipahami command import_data
+IMPORT_COLUMNS = {
+    'Performa (req/s)': ('Performa', 'benefit'),
+    'Skalabilitas (1-5)': ('Skalabilitas', 'benefit'),
+    'Komunitas (User)': ('Komunitas', 'benefit'),
+    'Kemudahan Belajar (Jam)': ('Kemudahan Belajar', 'cost'),
+    'Pemeliharaan & Update (per Tahun)': ('Pemeliharaan & Update', 'benefit'),
+}
+
+
+def parse_sizes(text):
+    """'100x5,1000x20' -> [(100, 5), (1000, 20)]"""
+    sizes = []
+    for part in text.split(','):
+        part = part.strip().lower()
+        if not part:
+            continue
+        frameworks, _, criteria = part.partition('x')
+        sizes.append((int(frameworks), int(criteria)))
+    return sizes
+
+
+def clear_dataset():
+    with transaction.atomic(), history.suppressed():
+        FrameworkScore.objects.all().delete()
+        Framework.objects.all().delete()
+        Criteria.objects.all().delete()
+        history.record_reset(include_criteria=True)
+    bump_data_version()
+
+
+def generate_dataset(n_frameworks, n_criteria, null_density=0.0, seed=0, batch_size=5000):
+    """
+    Isi database dengan dataset sintetis. Bobot kriteria dibagi rata sehingga
+    totalnya 1.0; sekitar 30% kriteria bertipe cost. ``null_density`` adalah
+    proporsi sel FrameworkScore yang bernilai NULL.
+    """
+    rng = random.Random(seed)
+    clear_dataset()
+
+    weight = 1.0 / n_criteria
+    Criteria.objects.bulk_create([
+        Criteria(
+            name=f'Kriteria {i + 1}',
+            weight=weight,
+            attribute='cost' if rng.random() < 0.3 else 'benefit',
+        )
+        for i in range(n_criteria)
+    ])
+    criteria_ids = list(Criteria.objects.order_by('id').values_list('id', flat=True))
+
+    for start in range(0, n_frameworks, batch_size):
+        stop = min(start + batch_size, n_frameworks)
+        Framework.objects.bulk_create([
+            Framework(name=f'Framework {i + 1}', description=f'Framework sintetis #{i + 1}')
+            for i in range(start, stop)
+        ])
+
+    n_scores = 0
+    batch = []
+    for framework_id in Framework.objects.order_by('id').values_list('id', flat=True).iterator():
+        for criteria_id in criteria_ids:
+            value = None if rng.random() < null_density else float(rng.randint(1, 100))
+            batch.append(FrameworkScore(framework_id=framework_id, criteria_id=criteria_id, value=value))
+            if len(batch) >= batch_size:
+                FrameworkScore.objects.bulk_create(batch)
+                n_scores += len(batch)
+                batch = []
+    if batch:
+        FrameworkScore.objects.bulk_create(batch)
+        n_scores += len(batch)
+    # bulk_create tidak melewati log riwayat; simpan keadaannya sebagai snapshot
+    history.take_snapshot()
+    bump_data_version()
+    return n_scores
+
+
+def scores_csv():
+    """Dataset saat ini dalam format scores.csv (framework,criteria,value)."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['framework', 'criteria', 'value'])
+    rows = (
+        FrameworkScore.objects
+        .filter(value__isnull=False)
+        .values_list('framework__name', 'criteria__name', 'value')
+        .iterator()
+    )
+    writer.writerows(rows)
+    return out.getvalue().encode('utf-8')
+
+
+def write_import_csvs(directory, n_frameworks, seed=0):
+    """Tulis criteria.csv dan data.csv untuk command import_data."""
+    rng = random.Random(seed)
+    criteria_path = os.path.join(directory, 'criteria.csv')
+    data_path = os.path.join(directory, 'data.csv')
+    weight = 1.0 / len(IMPORT_COLUMNS)
+
+    with open(criteria_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['name', 'weight', 'attribute'])
+        for name, attribute in IMPORT_COLUMNS.values():
+            writer.writerow([name, weight, attribute])
+
+    with open(data_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Framework'] + list(IMPORT_COLUMNS))
+        for i in range(n_frameworks):
+            writer.writerow([f'Framework {i + 1}'] + [rng.randint(1, 100) for _ in IMPORT_COLUMNS])
+    return criteria_path, data_path
+
+
+class QueryCounter:
+    """Execute wrapper yang hanya menghitung query (tanpa batas log seperti CaptureQueriesContext)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def time_call(fn, repeat, setup=None):
+    """
+    Jalankan ``fn`` sebanyak ``repeat`` kali; catat durasi dan jumlah query.
+    ``setup`` dipanggil sebelum setiap run, di luar pengukuran.
+    """
+    durations = []
+    queries = 0
+    status = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            status = fn()
+            durations.append(time.perf_counter() - started)
+        queries = counter.count
+    return {
+        'runs': repeat,
+        'min': min(durations),
+        'median': statistics.median(durations),
+        'mean': statistics.fmean(durations),
+        'max': max(durations),
+        'queries': queries,
+        'status': status,
+    }
+
+
+def invalidate_caches():
+    """Naikkan data version agar setiap run menghitung ulang (bukan cache hit)."""
+    # Di luar transaksi on_commit langsung dijalankan
+    bump_data_version()
+
+
+def _client():
+    from django.contrib.auth.models import User
+
+    user, _ = User.objects.get_or_create(username='benchmark', defaults={'is_staff': True})
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def run_suite(sizes, null_density=0.0, repeat=5, seed=0, scenarios=SCENARIOS, log=None):
+    """Jalankan skenario untuk tiap ukuran dan kembalikan hasil siap-JSON."""
+    log = log or (lambda message: None)
+    client = _client()
+    results = {}
+
+    for n_frameworks, n_criteria in sizes:
+        size = f'{n_frameworks}x{n_criteria}'
+        log(f'Generating dataset {size} (null density {null_density})...')
+        generated = time.perf_counter()
+        n_scores = generate_dataset(n_frameworks, n_criteria, null_density, seed)
+        log(f'  {n_scores} scores in {time.perf_counter() - generated:.2f}s')
+
+        for name in ('calculate_saw', 'framework_list', 'export_data'):
+            if name not in scenarios:
+                continue
+            url = reverse(name)
+            results[f'{name}[{size}]'] = time_call(
+                lambda: client.get(url).status_code, repeat, setup=invalidate_caches
+            )
+            log(f'  {name}: {results[f"{name}[{size}]"]["median"] * 1000:.1f} ms')
+
+        if 'upload_csv' in scenarios:
+            payload = scores_csv()
+            key = f'upload_csv[{size}]'
+            if len(payload) > UPLOAD_LIMIT:
+                log(f'  upload_csv: skipped ({len(payload)} bytes > 5MB upload limit)')
+            else:
+                def upload():
+                    upload_file = SimpleUploadedFile('scores.csv', payload, content_type='text/csv')
+                    return client.post(reverse('upload_csv'), {'csv_file': upload_file}).status_code
+
+                results[key] = time_call(upload, repeat)
+                results[key]['rows'] = payload.count(b'\n') - 1
+                log(f'  upload_csv: {results[key]["median"] * 1000:.1f} ms')
+
+        # import_data mereset kriteria, jadi selalu dijalankan terakhir
+        if 'import_data' in scenarios:
+            key = f'import_data[{n_frameworks}x{len(IMPORT_COLUMNS)}]'
+            with tempfile.TemporaryDirectory() as directory:
+                criteria_path, data_path = write_import_csvs(directory, n_frameworks, seed)
+
+                def run_import():
+                    call_command('import_data', criteria_csv=criteria_path, data_csv=data_path,
+                                 stdout=io.StringIO(), stderr=io.StringIO())
+                    return 0
+
+                results[key] = time_call(run_import, repeat)
+                results[key]['rows'] = n_frameworks
+            log(f'  import_data: {results[key]["median"] * 1000:.1f} ms')
+
+    clear_dataset()
+    return {
+        'meta': {
+            'created': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'null_density': null_density,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25):
+    """
+    Bandingkan median tiap skenario dengan baseline. Mengembalikan list dict
+    (key, baseline, current, change, queries, status) dengan status
+    'regression', 'improved', 'ok', 'new' atau 'missing'.
+    """
+    rows = []
+    current_results = current.get('results', {})
+    baseline_results = baseline.get('results', {})
+    for key in sorted(set(current_results) | set(baseline_results)):
+        cur = current_results.get(key)
+        base = baseline_results.get(key)
+        row = {
+            'key': key,
+            'baseline': base['median'] if base else None,
+            'current': cur['median'] if cur else None,
+            'change': None,
+            'queries': (base['queries'] if base else None, cur['queries'] if cur else None),
+        }
+        if cur is None:
+            row['status'] = 'missing'
+        elif base is None:
+            row['status'] = 'new'
+        else:
+            row['change'] = cur['median'] / base['median'] - 1 if base['median'] else 0.0
+            if row['change'] > tolerance or cur['queries'] > base['queries']:
+                row['status'] = 'regression'
+            elif row['change'] < -tolerance:
+                row['status'] = 'improved'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
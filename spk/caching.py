@@ -0,0 +1,157 @@
+"""
+Versi data dan helper cache untuk hasil turunan (statistik, ranking, dll).
+
+Setiap perubahan pada Criteria, Framework atau FrameworkScore menaikkan
+"data version" (lihat ``spk.signals``). Semua hasil turunan di-cache dengan key
+yang memuat versi tersebut, sehingga invalidasi cukup dengan satu increment dan
+entry lama akan kedaluwarsa sendiri.
+
+Versi disimpan di cache ``default`` yang harus dipakai bersama semua proses
+(worker WSGI, proses ASGI, management command): lihat ``CACHES`` di settings.
+Dengan cache per proses (LocMemCache) kenaikan versi dari proses lain tidak
+pernah terlihat. Hasil turunan disimpan paling lama ``SPK_CACHE_TIMEOUT``
+detik sebagai batas aman bila sebuah kenaikan versi terlewat.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.dispatch import Signal
+
+from . import metrics as spk_metrics
+from .routers import replica_active
+
+DATA_VERSION_KEY = 'spk:data-version'
+_MISSING = object()
+
+_batch = contextvars.ContextVar('spk_data_version_batch', default=None)
+
+# Dikirim setelah data version naik (argumen: version), mis. untuk warm-up cache
+data_version_changed = Signal()
+
+
+def _fresh_version(current=None):
+    # Berbasis waktu agar versi tidak pernah terulang walau key sempat ter-evict
+    version = int(time.time() * 1000)
+    return max(version, current + 1) if isinstance(current, int) else version
+
+
+def get_data_version():
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def _bump():
+    # Bukan incr: pada backend tanpa incr atomik (DatabaseCache) dua proses yang
+    # menaikkan versi bersamaan bisa menulis angka yang sama dan salah satu
+    # perubahan tidak menginvalidasi cache. Nilai baru berbasis waktu tidak bentrok.
+    version = _fresh_version(cache.get(DATA_VERSION_KEY))
+    cache.set(DATA_VERSION_KEY, version, timeout=None)
+    data_version_changed.send(sender=None, version=version)
+
+
+def bump_data_version():
+    """
+    Naikkan versi data setelah transaksi yang sedang berjalan di-commit.
+    Di dalam ``bump_once()`` hanya menandai bahwa data berubah.
+    """
+    batch = _batch.get()
+    if batch is not None:
+        batch['dirty'] = True
+        return
+    transaction.on_commit(_bump)
+
+
+@contextmanager
+def bump_once():
+    """
+    Gabungkan semua kenaikan versi di dalam blok menjadi satu, dijadwalkan saat
+    blok selesai tanpa error. Setiap kenaikan adalah round trip ke cache bersama,
+    jadi penulisan massal (upload, import) memakai
+    ``with transaction.atomic(), bump_once():``.
+    """
+    if _batch.get() is not None:
+        yield
+        return
+    batch = {'dirty': False}
+    token = _batch.set(batch)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    if batch['dirty']:
+        transaction.on_commit(_bump)
+
+
+def cached(name, compute, timeout=None, version=None):
+    """
+    Ambil ``name`` dari cache untuk versi data saat ini, atau hitung dengan
+    ``compute()`` lalu simpan (``timeout`` default ``SPK_CACHE_TIMEOUT``).
+    Hit/miss dicatat di metrics.
+    """
+    if version is None:
+        version = get_data_version()
+    if timeout is None:
+        timeout = getattr(settings, 'SPK_CACHE_TIMEOUT', 3600)
+    key = f'spk:{name}:{version}'
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        spk_metrics.record_cache(False)
+        value = compute()
+        if replica_active():
+            # Hasil dari replica bisa tertinggal dari versi data; batasi umurnya
+            timeout = min(timeout, getattr(settings, 'SPK_REPLICA_CACHE_TIMEOUT', 30))
+        cache.set(key, value, timeout)
+    else:
+        spk_metrics.record_cache(True)
+    return value
+
+
+def cached_rows(name, start, stop, compute, chunk_size, version=None, timeout=None):
+    """
+    Baris ``start``..``stop`` (``stop=None``: sampai akhir) dari daftar panjang
+    yang di-cache per potongan ``chunk_size`` baris (key
+    ``spk:{name}:{i}:{version}``): halaman kecil tidak perlu membaca seluruh
+    daftar dan tidak ada satu entry cache raksasa. Bila ada potongan yang
+    hilang, ``compute()`` mengembalikan semua baris dan semua potongan disimpan
+    ulang. Mengembalikan (baris, jumlah total baris).
+    """
+    if version is None:
+        version = get_data_version()
+    if timeout is None:
+        timeout = getattr(settings, 'SPK_CACHE_TIMEOUT', 3600)
+    total_key = f'spk:{name}:total:{version}'
+    total = cache.get(total_key) if stop is None else None
+
+    if stop is not None or total is not None:
+        end = stop if stop is not None else total
+        first = start // chunk_size
+        last = max(end - 1, start) // chunk_size
+        keys = [f'spk:{name}:{i}:{version}' for i in range(first, last + 1)]
+        found = cache.get_many(keys + [total_key])
+        total = found.get(total_key)
+        if total is not None:
+            # Potongan di luar jumlah baris memang tidak pernah disimpan
+            needed = [key for i, key in enumerate(keys, start=first) if i * chunk_size < total]
+            if all(key in found for key in needed):
+                spk_metrics.record_cache(True)
+                rows = [row for key in needed for row in found[key]]
+                return rows[start - first * chunk_size:end - first * chunk_size], total
+
+    spk_metrics.record_cache(False)
+    all_rows = compute()
+    if replica_active():
+        timeout = min(timeout, getattr(settings, 'SPK_REPLICA_CACHE_TIMEOUT', 30))
+    chunks = {
+        f'spk:{name}:{i // chunk_size}:{version}': all_rows[i:i + chunk_size]
+        for i in range(0, len(all_rows), chunk_size)
+    }
+    chunks[total_key] = len(all_rows)
+    cache.set_many(chunks, timeout)
+    return all_rows[start:stop], len(all_rows)
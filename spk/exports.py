@@ -0,0 +1,35 @@
+"""
+Snapshot export CSV (framework x kriteria) per data version.
+
+Isi CSV dibangun dari satu query skor dan di-cache sebagai string, sehingga
+export berulang (dan export pertama setelah warm-up, lihat ``spk.warmup``)
+tidak menyentuh database lagi.
+"""
+import csv
+import io
+
+from .caching import cached
+from .models import Criteria, Framework, FrameworkScore
+
+
+def build_export_csv():
+    """Kembalikan (isi CSV, jumlah framework)."""
+    criteria = list(Criteria.objects.values_list('id', 'name'))
+    grid = {}
+    for fid, cid, value in FrameworkScore.objects.values_list(
+        'framework_id', 'criteria_id', 'value'
+    ).iterator(chunk_size=5000):
+        grid[(fid, cid)] = value
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['Framework'] + [name for _, name in criteria])
+    rows = 0
+    for fid, name in Framework.objects.values_list('id', 'name').iterator(chunk_size=5000):
+        writer.writerow([name] + [grid.get((fid, cid), '') for cid, _ in criteria])
+        rows += 1
+    return buffer.getvalue(), rows
+
+
+def export_snapshot(data_version=None):
+    return cached('export-csv', build_export_csv, version=data_version)
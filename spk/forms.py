@@ -110,7 +110,7 @@ class CSVUploadForm(forms.Form):
         # Validate CSV content
         try:
             csv_file.seek(0)
-            content = csv_file.read().decode('utf-8')
+            content = csv_file.read().decode('utf-8-sig')
             csv_file.seek(0)  # Reset file pointer
             
             # Check if file has content
@@ -124,11 +124,9 @@ class CSVUploadForm(forms.Form):
             if not headers:
                 raise ValidationError('File CSV tidak memiliki header.')
             
-            expected_headers = ['nama', 'deskripsi', 'performa', 'skalabilitas', 'komunitas', 'kemudahan_belajar', 'pemeliharaan']
-            headers_lower = [h.lower().strip() for h in headers]
-            
-            if headers_lower[:2] != ['nama', 'deskripsi']:  # At least nama and deskripsi required
-                raise ValidationError('Header CSV harus dimulai dengan: nama,deskripsi,...')
+            # Kolom wajib dicek di view sesuai jenis file (criteria/data/score)
+            if not any(h.strip() for h in headers):
+                raise ValidationError('File CSV tidak memiliki header.')
                 
         except UnicodeDecodeError:
             raise ValidationError('File tidak dapat dibaca. Pastikan encoding UTF-8.')
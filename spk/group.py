@@ -0,0 +1,181 @@
+"""
+Mode keputusan kelompok (multi-rater).
+
+Skor setiap rater (``RaterScore``) dimuat sebagai tensor
+``tensor[r][i][j]`` (rater x framework x kriteria, None = kosong) dalam satu
+query. Tensor diagregasi per sel menjadi satu matriks keputusan dengan mean,
+median atau geometric mean (opsional berbobot per rater), lalu dinilai oleh
+engine SAW yang sama. Ranking tiap rater dan sebaran konsensus dihitung pada
+lintasan yang sama.
+"""
+import math
+import statistics
+
+from . import saw
+from .caching import cached, get_data_version
+from .models import Criteria, Framework, RaterScore
+
+AGGREGATION_METHODS = {
+    'mean': 'Rata-rata',
+    'median': 'Median',
+    'geomean': 'Rata-rata geometrik',
+}
+
+
+class RaterTensor:
+    def __init__(self, criteria, framework_ids, framework_names, rater_ids, rater_names, values):
+        self.criteria = criteria
+        self.framework_ids = framework_ids
+        self.framework_names = framework_names
+        self.rater_ids = rater_ids
+        self.rater_names = rater_names
+        self.values = values
+
+    def rater_matrix(self, r):
+        """Matriks keputusan rater ke-r (kosong dianggap 0.0 seperti SAW biasa)."""
+        values = [[0.0 if v is None else v for v in row] for row in self.values[r]]
+        return saw.DecisionMatrix(self.criteria, self.framework_ids, self.framework_names, values)
+
+
+def load_tensor(criteria_list=None):
+    if criteria_list is None:
+        criteria_list = list(Criteria.objects.all())
+    frameworks = list(Framework.objects.order_by('id').values_list('id', 'name'))
+    raters = list(
+        RaterScore.objects.order_by('rater_id').values_list('rater_id', 'rater__username').distinct()
+    )
+
+    rater_index = {rid: r for r, (rid, _) in enumerate(raters)}
+    row_index = {fid: i for i, (fid, _) in enumerate(frameworks)}
+    col_index = {c.id: j for j, c in enumerate(criteria_list)}
+    values = [[[None] * len(criteria_list) for _ in frameworks] for _ in raters]
+
+    scores = RaterScore.objects.filter(value__isnull=False).values_list(
+        'rater_id', 'framework_id', 'criteria_id', 'value'
+    )
+    for rater_id, framework_id, criteria_id, value in scores.iterator(chunk_size=5000):
+        j = col_index.get(criteria_id)
+        if j is not None:
+            values[rater_index[rater_id]][row_index[framework_id]][j] = value
+
+    return RaterTensor(
+        criteria_list,
+        [fid for fid, _ in frameworks],
+        [name for _, name in frameworks],
+        [rid for rid, _ in raters],
+        [name for _, name in raters],
+        values,
+    )
+
+
+def _pairs(cell, weights):
+    return [(v, w) for v, w in zip(cell, weights) if v is not None and w > 0]
+
+
+def _mean(cell, weights):
+    pairs = _pairs(cell, weights)
+    total = sum(w for _, w in pairs)
+    return sum(v * w for v, w in pairs) / total if total else 0.0
+
+
+def _median(cell, weights):
+    pairs = sorted(_pairs(cell, weights))
+    if not pairs:
+        return 0.0
+    half = sum(w for _, w in pairs) / 2
+    cumulative = 0.0
+    for k, (v, w) in enumerate(pairs):
+        cumulative += w
+        if math.isclose(cumulative, half) and k + 1 < len(pairs):
+            return (v + pairs[k + 1][0]) / 2
+        if cumulative > half:
+            return v
+    return pairs[-1][0]
+
+
+def _geomean(cell, weights):
+    pairs = _pairs(cell, weights)
+    total = sum(w for _, w in pairs)
+    if not total or any(v <= 0 for v, _ in pairs):
+        return 0.0
+    return math.exp(sum(w * math.log(v) for v, w in pairs) / total)
+
+
+_AGGREGATORS = {'mean': _mean, 'median': _median, 'geomean': _geomean}
+
+
+def aggregate(tensor, method='mean', rater_weights=None):
+    """
+    Gabungkan ``tensor.values`` per sel (framework, kriteria) lintas rater.
+    ``rater_weights`` sejajar ``tensor.rater_ids`` (default semua 1).
+    """
+    fn = _AGGREGATORS[method]
+    if rater_weights is None:
+        rater_weights = [1.0] * len(tensor.rater_ids)
+    if not tensor.values:
+        return [[0.0] * len(tensor.criteria) for _ in tensor.framework_ids]
+    # zip(*tensor) -> baris framework per rater; zip(*rows) -> nilai sel per rater
+    return [[fn(cell, rater_weights) for cell in zip(*rows)] for rows in zip(*tensor.values)]
+
+
+def kendall_w(rank_lists):
+    """Koefisien konkordansi Kendall W untuk ranking tanpa ties (0..1)."""
+    m = len(rank_lists)
+    n = len(rank_lists[0]) if rank_lists else 0
+    if m < 2 or n < 2:
+        return None
+    totals = [sum(ranks) for ranks in zip(*rank_lists)]
+    mean_total = m * (n + 1) / 2
+    s = sum((t - mean_total) ** 2 for t in totals)
+    return 12 * s / (m * m * (n ** 3 - n))
+
+
+def _positions(ranking):
+    return {item['framework_id']: item['rank'] for item in ranking}
+
+
+def group_ranking(criteria_list, method='mean', rater_weights=None, data_version=None):
+    """
+    Ranking konsensus + ranking tiap rater + sebaran rank per framework.
+    ``rater_weights``: {rater_id: bobot}; rater yang tidak disebut berbobot 1.
+    """
+    if method not in _AGGREGATORS:
+        raise ValueError(f'Metode agregasi tidak dikenal: {method}')
+    rater_weights = rater_weights or {}
+    if data_version is None:
+        data_version = get_data_version()
+    weights_key = ','.join(f'{rid}={w}' for rid, w in sorted(rater_weights.items()))
+    key = f'group-ranking:{method}:{saw.weights_key(criteria_list, [c.weight for c in criteria_list])}:{weights_key}'
+
+    def compute():
+        tensor = load_tensor(criteria_list)
+        weights = [float(rater_weights.get(rid, 1.0)) for rid in tensor.rater_ids]
+        matrix = saw.DecisionMatrix(
+            criteria_list, tensor.framework_ids, tensor.framework_names, aggregate(tensor, method, weights)
+        )
+        consensus = saw.rank(saw.evaluate(matrix))
+        rater_positions = [
+            _positions(saw.rank(saw.evaluate(tensor.rater_matrix(r))))
+            for r in range(len(tensor.rater_ids))
+        ]
+
+        rows = []
+        for item in consensus:
+            ranks = [positions[item['framework_id']] for positions in rater_positions]
+            rows.append(dict(
+                item,
+                rater_ranks=ranks,
+                rank_min=min(ranks, default=None),
+                rank_max=max(ranks, default=None),
+                rank_stdev=round(statistics.pstdev(ranks), 3) if ranks else None,
+            ))
+        return {
+            'method': method,
+            'raters': list(zip(tensor.rater_ids, tensor.rater_names, weights)),
+            'ranking': rows,
+            'kendall_w': kendall_w([
+                [positions[fid] for fid in tensor.framework_ids] for positions in rater_positions
+            ]),
+        }
+
+    return cached(key, compute, version=data_version)
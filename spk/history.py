@@ -0,0 +1,183 @@
+"""
+Riwayat perubahan data SAW dan ranking "as-of" waktu tertentu.
+
+Setiap perubahan Criteria, Framework dan FrameworkScore ditambahkan ke
+``ScoreChange`` (append-only, satu INSERT per penulisan; upsert massal menulis
+satu bulk INSERT). ``ScoreSnapshot`` menyimpan keadaan lengkap secara ringkas
+pada titik tertentu (lihat command ``snapshot_history``), sehingga keadaan
+pada waktu T dibangun dari snapshot terdekat sebelum T ditambah replay
+perubahan sesudahnya, bukan dari awal riwayat.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import saw
+from .models import Criteria, Framework, FrameworkScore, ScoreChange, ScoreSnapshot
+
+_suppressed = contextvars.ContextVar('spk_history_suppressed', default=False)
+
+
+@contextmanager
+def suppressed():
+    """Matikan pencatatan per objek, mis. saat reset yang dicatat sebagai satu entry."""
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def record_criteria(criteria, deleted=False):
+    if _suppressed.get():
+        return
+    ScoreChange.objects.create(
+        kind=ScoreChange.CRITERIA, criteria_id=criteria.pk, name=criteria.name,
+        weight=criteria.weight, attribute=criteria.attribute, deleted=deleted,
+    )
+
+
+def record_framework(framework, deleted=False):
+    if _suppressed.get():
+        return
+    ScoreChange.objects.create(
+        kind=ScoreChange.FRAMEWORK, framework_id=framework.pk, name=framework.name, deleted=deleted,
+    )
+
+
+def record_score(score):
+    if _suppressed.get():
+        return
+    ScoreChange.objects.create(
+        kind=ScoreChange.SCORE, framework_id=score.framework_id, criteria_id=score.criteria_id, value=score.value,
+    )
+
+
+def record_scores(cells, batch_size=1000):
+    """Catat banyak (framework_id, criteria_id, value) dengan satu bulk INSERT."""
+    now = timezone.now()
+    ScoreChange.objects.bulk_create([
+        ScoreChange(changed_at=now, kind=ScoreChange.SCORE, framework_id=fid, criteria_id=cid, value=value)
+        for fid, cid, value in cells
+    ], batch_size=batch_size)
+
+
+def record_reset(include_criteria=False):
+    """Satu entry untuk penghapusan semua framework (dan kriteria) beserta skornya."""
+    ScoreChange.objects.create(kind=ScoreChange.RESET_ALL if include_criteria else ScoreChange.RESET)
+
+
+class HistoryState:
+    """Keadaan data pada satu titik: kriteria, framework dan skor."""
+
+    def __init__(self, criteria=None, frameworks=None, scores=None):
+        self.criteria = criteria or {}      # id -> (name, weight, attribute)
+        self.frameworks = frameworks or {}  # id -> name
+        self.scores = scores or {}          # (framework_id, criteria_id) -> value
+
+    @classmethod
+    def from_snapshot(cls, data):
+        return cls(
+            {cid: (name, weight, attribute) for cid, name, weight, attribute in data['criteria']},
+            {fid: name for fid, name in data['frameworks']},
+            {(fid, cid): value for fid, cid, value in data['scores']},
+        )
+
+    def to_snapshot(self):
+        return {
+            'criteria': [[cid, *fields] for cid, fields in sorted(self.criteria.items())],
+            'frameworks': [[fid, name] for fid, name in sorted(self.frameworks.items())],
+            'scores': [[fid, cid, value] for (fid, cid), value in sorted(self.scores.items())],
+        }
+
+    def apply(self, change):
+        kind = change.kind
+        if kind == ScoreChange.SCORE:
+            if change.deleted:
+                self.scores.pop((change.framework_id, change.criteria_id), None)
+            else:
+                self.scores[(change.framework_id, change.criteria_id)] = change.value
+        elif kind == ScoreChange.CRITERIA:
+            if change.deleted:
+                self.criteria.pop(change.criteria_id, None)
+                self.scores = {key: v for key, v in self.scores.items() if key[1] != change.criteria_id}
+            else:
+                self.criteria[change.criteria_id] = (change.name, change.weight, change.attribute)
+        elif kind == ScoreChange.FRAMEWORK:
+            if change.deleted:
+                self.frameworks.pop(change.framework_id, None)
+                self.scores = {key: v for key, v in self.scores.items() if key[0] != change.framework_id}
+            else:
+                self.frameworks[change.framework_id] = change.name
+        elif kind in (ScoreChange.RESET, ScoreChange.RESET_ALL):
+            self.frameworks = {}
+            self.scores = {}
+            if kind == ScoreChange.RESET_ALL:
+                self.criteria = {}
+
+    def matrix(self):
+        criteria_list = [
+            Criteria(id=cid, name=name, weight=weight, attribute=attribute)
+            for cid, (name, weight, attribute) in sorted(self.criteria.items())
+        ]
+        framework_ids = sorted(self.frameworks)
+        col_index = {c.id: j for j, c in enumerate(criteria_list)}
+        row_index = {fid: i for i, fid in enumerate(framework_ids)}
+        values = [[0.0] * len(criteria_list) for _ in framework_ids]
+        for (fid, cid), value in self.scores.items():
+            i, j = row_index.get(fid), col_index.get(cid)
+            if i is not None and j is not None and value is not None:
+                values[i][j] = value
+        return saw.DecisionMatrix(criteria_list, framework_ids, [self.frameworks[f] for f in framework_ids], values)
+
+
+def current_state():
+    return HistoryState(
+        {cid: (name, weight, attribute) for cid, name, weight, attribute in
+         Criteria.objects.values_list('id', 'name', 'weight', 'attribute')},
+        dict(Framework.objects.values_list('id', 'name')),
+        {(fid, cid): value for fid, cid, value in
+         FrameworkScore.objects.values_list('framework_id', 'criteria_id', 'value').iterator(chunk_size=5000)},
+    )
+
+
+def take_snapshot():
+    """Simpan keadaan saat ini sebagai snapshot (mencakup semua perubahan s/d sekarang)."""
+    with transaction.atomic():
+        last_change = ScoreChange.objects.aggregate(last=Max('id'))['last'] or 0
+        state = current_state()
+        return ScoreSnapshot.objects.create(change_id=last_change, data=state.to_snapshot())
+
+
+def state_as_of(when):
+    """
+    Keadaan pada waktu ``when``: snapshot terakhir sebelum ``when`` + replay.
+    Mengembalikan (state, snapshot atau None, jumlah perubahan yang di-replay).
+    """
+    snapshot = ScoreSnapshot.objects.filter(created_at__lte=when).order_by('-created_at', '-id').first()
+    if snapshot is None:
+        state, after = HistoryState(), 0
+    else:
+        state, after = HistoryState.from_snapshot(snapshot.data), snapshot.change_id
+
+    replayed = 0
+    changes = ScoreChange.objects.filter(id__gt=after, changed_at__lte=when).order_by('id')
+    for change in changes.iterator(chunk_size=5000):
+        state.apply(change)
+        replayed += 1
+    return state, snapshot, replayed
+
+
+def ranking_as_of(when):
+    state, snapshot, replayed = state_as_of(when)
+    matrix = state.matrix()
+    ranking = saw.rank(saw.evaluate(matrix)) if matrix.framework_ids and matrix.criteria else []
+    return {
+        'ranking': ranking,
+        'criteria': matrix.criteria,
+        'snapshot': snapshot.created_at if snapshot else None,
+        'replayed': replayed,
+    }
@@ -0,0 +1,164 @@
+"""
+Server-sent events untuk pembaruan ranking (butuh server ASGI, lihat
+``saw_project/asgi.py``).
+
+Satu ``RankingBroadcaster`` per proses memeriksa data version setiap
+``SPK_SSE_POLL_INTERVAL`` detik selama masih ada client terhubung. Hanya saat
+versi berubah ranking dihitung (lewat cache yang sama dengan calculate_saw)
+dan diff terhadap ranking sebelumnya dibuat sekali, lalu dikirim ke semua
+client; perubahan data yang tidak menggeser top-N tidak dikirim. Client yang
+menunggu tidak melakukan apa pun selain menerima heartbeat.
+
+Perubahan dari proses lain (worker WSGI, management command) hanya terlihat
+jika data version disimpan di cache bersama (``CACHES`` di settings, bukan
+LocMemCache).
+
+Format event ``ranking`` (JSON):
+
+- ``{"version": v, "full": true, "ranking": [[id, nama, skor, rank], ...]}``
+  untuk event pertama atau client yang tertinggal lebih dari satu versi;
+- ``{"version": v, "full": false, "changed": [[id, nama, skor, rank], ...],
+  "removed": [id, ...]}`` untuk client yang sudah punya versi sebelumnya.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import saw
+from .caching import get_data_version
+from .models import Criteria
+
+
+def _top_ranking():
+    criteria_list = list(Criteria.objects.all())
+    if not criteria_list:
+        return []
+    size = getattr(settings, 'SPK_SSE_RANKING_SIZE', 100)
+    return [
+        [item['framework_id'], item['framework'], item['score_display'], item['rank']]
+        for item in saw.cached_result(criteria_list)['ranking'][:size]
+    ]
+
+
+def ranking_diff(previous, current):
+    """Entry yang baru/berubah dan id yang keluar dari ``previous`` ke ``current``."""
+    before = {row[0]: row for row in previous}
+    current_ids = {row[0] for row in current}
+    return {
+        'changed': [row for row in current if before.get(row[0]) != row],
+        'removed': [fid for fid in before if fid not in current_ids],
+    }
+
+
+class RankingBroadcaster:
+    def __init__(self):
+        # ``version``: data version ranking terakhir yang dikirim (id event SSE);
+        # ``checked_version``: data version terakhir yang sudah diperiksa
+        self.version = None
+        self.previous_version = None
+        self.checked_version = None
+        self.ranking = []
+        self.diff = None
+        self.subscribers = 0
+        self._condition = None
+        self._lock = None
+        self._task = None
+
+    @property
+    def condition(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @property
+    def lock(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _refresh(self):
+        # Serial: subscribe() dan _poll() bisa memanggil bersamaan
+        async with self.lock:
+            version = await sync_to_async(get_data_version)()
+            if version == self.checked_version:
+                return
+            ranking = await sync_to_async(_top_ranking)()
+            self.checked_version = version
+            if self.version is None:
+                self.version, self.ranking = version, ranking
+                return
+            diff = ranking_diff(self.ranking, ranking)
+            if not diff['changed'] and not diff['removed']:
+                return
+            self.diff = diff
+            self.previous_version, self.version, self.ranking = self.version, version, ranking
+        async with self.condition:
+            self.condition.notify_all()
+
+    async def _poll(self):
+        interval = getattr(settings, 'SPK_SSE_POLL_INTERVAL', 2)
+        try:
+            while self.subscribers:
+                await asyncio.sleep(interval)
+                await self._refresh()
+        finally:
+            self._task = None
+
+    async def subscribe(self):
+        self.subscribers += 1
+        if self.version is None:
+            await self._refresh()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._poll())
+
+    def unsubscribe(self):
+        self.subscribers -= 1
+
+    async def wait_for_change(self, seen_version, timeout):
+        """True jika versi berubah dari ``seen_version`` sebelum ``timeout``."""
+        async with self.condition:
+            try:
+                await asyncio.wait_for(
+                    self.condition.wait_for(lambda: self.version != seen_version), timeout
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def payload_for(self, seen_version):
+        if seen_version is not None and seen_version == self.previous_version and self.diff is not None:
+            return {'version': self.version, 'full': False, **self.diff}
+        return {'version': self.version, 'full': True, 'ranking': self.ranking}
+
+
+broadcaster = RankingBroadcaster()
+
+
+def format_event(payload):
+    data = json.dumps(payload, separators=(',', ':'))
+    return f"id: {payload['version']}\nevent: ranking\ndata: {data}\n\n"
+
+
+async def ranking_events(last_event_id=None):
+    """Async iterator event SSE untuk satu client."""
+    heartbeat = getattr(settings, 'SPK_SSE_HEARTBEAT', 15)
+    await broadcaster.subscribe()
+    try:
+        yield 'retry: 5000\n\n'
+        # Reconnect dengan Last-Event-ID versi terkini tidak perlu ranking ulang
+        seen = broadcaster.version if last_event_id == str(broadcaster.version) else None
+        if seen is None:
+            payload = broadcaster.payload_for(None)
+            seen = payload['version']
+            yield format_event(payload)
+        while True:
+            if await broadcaster.wait_for_change(seen, heartbeat):
+                payload = broadcaster.payload_for(seen)
+                seen = payload['version']
+                yield format_event(payload)
+            else:
+                yield ': ping\n\n'
+    finally:
+        broadcaster.unsubscribe()
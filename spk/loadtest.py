@@ -0,0 +1,325 @@
+"""
+Load driver end-to-end untuk aplikasi WSGI.
+
+Sejumlah user virtual (thread) login lalu menjalankan campuran aksi
+dashboard, list, calculate, edit dan upload terhadap
+``saw_project.wsgi.application`` di dalam proses yang sama, atau terhadap
+server lokal lewat HTTP. Setiap request melewati stack lengkap: session
+middleware, CSRF, ``@login_required`` dan render template.
+
+Request hanya dihitung berhasil bila status-nya sesuai yang diharapkan aksi:
+200 untuk halaman, 302 (bukan ke halaman login) untuk POST form yang
+redirect setelah sukses. Redirect lain, termasuk ke login karena sesi hilang,
+dihitung gagal dan dilaporkan terpisah di kolom ``redirects``.
+"""
+import io
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookies import SimpleCookie
+
+from django.conf import settings
+from django.db import connections
+from django.shortcuts import resolve_url
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+DEFAULT_MIX = {
+    'dashboard': 30,
+    'list': 25,
+    'calculate': 25,
+    'edit': 12,
+    'upload': 8,
+}
+
+
+def parse_mix(text):
+    """'dashboard=3,calculate=1' -> {'dashboard': 3, 'calculate': 1}"""
+    mix = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f'Aksi tidak dikenal: {name}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class WSGITransport:
+    """Memanggil aplikasi WSGI langsung di proses yang sama."""
+
+    def __init__(self, application, host='localhost'):
+        self.application = application
+        self.host = host
+
+    def request(self, method, path, body=b'', headers=None):
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': urllib.parse.unquote(path),
+            'QUERY_STRING': query,
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in (headers or {}).items():
+            key = name.upper().replace('-', '_')
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = 'HTTP_' + key
+            environ[key] = value
+
+        captured = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            captured['status'] = int(status.split(' ', 1)[0])
+            captured['headers'] = response_headers
+
+        result = self.application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return captured['status'], captured['headers'], content
+
+
+class HTTPTransport:
+    """Mengirim request ke server lokal (mis. ``runserver`` atau gunicorn)."""
+
+    class _NoRedirect(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, *args, **kwargs):
+            return None
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(self._NoRedirect)
+
+    def request(self, method, path, body=b'', headers=None):
+        req = urllib.request.Request(self.base_url + path, data=body or None, method=method,
+                                     headers=headers or {})
+        try:
+            with self.opener.open(req, timeout=60) as response:
+                return response.status, list(response.headers.items()), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, list(e.headers.items()), e.read()
+
+
+class VirtualUser:
+    """Satu sesi browser: menyimpan cookie dan menjalankan aksi."""
+
+    def __init__(self, transport, username, password, frameworks, criteria, rng):
+        self.transport = transport
+        self.username = username
+        self.password = password
+        self.frameworks = frameworks
+        self.criteria = criteria
+        self.rng = rng
+        self.cookies = {}
+        self.location = None
+
+    def request(self, method, path, body=b'', content_type=None):
+        headers = {}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        if content_type:
+            headers['Content-Type'] = content_type
+        status, response_headers, content = self.transport.request(method, path, body, headers)
+        self.location = None
+        for name, value in response_headers:
+            if name.lower() == 'location':
+                self.location = value
+            elif name.lower() == 'set-cookie':
+                cookie = SimpleCookie()
+                cookie.load(value)
+                for key, morsel in cookie.items():
+                    self.cookies[key] = morsel.value
+        return status, content
+
+    def post_form(self, path, data):
+        data = dict(data, csrfmiddlewaretoken=self.cookies.get('csrftoken', ''))
+        body = urllib.parse.urlencode(data).encode()
+        return self.request('POST', path, body, 'application/x-www-form-urlencoded')
+
+    def get_page(self, path):
+        return self.request('GET', path)[0], 200
+
+    def submit_form(self, path, data):
+        # Sukses = redirect ke halaman berikutnya (post/redirect/get)
+        return self.post_form(path, data)[0], 302
+
+    def login(self):
+        self.request('GET', '/login/')
+        status, _ = self.post_form('/login/', {'username': self.username, 'password': self.password})
+        return status == 302
+
+    # Setiap aksi mengembalikan (status, status yang diharapkan)
+    def dashboard(self):
+        return self.get_page('/')
+
+    def list(self):
+        return self.get_page('/frameworks/')
+
+    def calculate(self):
+        return self.get_page('/calculate/')
+
+    def edit(self):
+        if not self.frameworks:
+            return self.list()
+        framework_id, _ = self.rng.choice(self.frameworks)
+        path = f'/edit-scores/{framework_id}/'
+        status, expected = self.get_page(path)
+        if status != expected:
+            return status, expected
+        data = {f'score_{cid}': self.rng.randint(1, 100) for cid, _ in self.criteria}
+        return self.submit_form(path, data)
+
+    def upload(self):
+        if not self.frameworks or not self.criteria:
+            return self.list()
+        lines = ['framework,criteria,value']
+        for _ in range(10):
+            lines.append('"{}","{}",{}'.format(
+                self.rng.choice(self.frameworks)[1], self.rng.choice(self.criteria)[1], self.rng.randint(1, 100)))
+        upload_file = io.BytesIO('\n'.join(lines).encode('utf-8'))
+        upload_file.name = 'scores.csv'
+        data = {
+            'csv_file': upload_file,
+            'csrfmiddlewaretoken': self.cookies.get('csrftoken', ''),
+        }
+        status = self.request('POST', '/upload/', encode_multipart(BOUNDARY, data), MULTIPART_CONTENT)[0]
+        return status, 302
+
+
+class LoadTest:
+    def __init__(self, transport, users, duration, username, password,
+                 mix=None, think_time=0.0, frameworks=(), criteria=(), seed=0):
+        self.transport = transport
+        self.users = users
+        self.duration = duration
+        self.username = username
+        self.password = password
+        self.mix = mix or DEFAULT_MIX
+        self.think_time = think_time
+        self.frameworks = list(frameworks)
+        self.criteria = list(criteria)
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.latencies = {name: [] for name in self.mix}
+        self.errors = {name: 0 for name in self.mix}
+        self.redirects = {name: 0 for name in self.mix}
+        self.login_failures = 0
+        self.login_path = urllib.parse.urlsplit(resolve_url(settings.LOGIN_URL)).path
+
+    def _record(self, action, latency, ok, redirected=False):
+        with self._lock:
+            self.latencies[action].append(latency)
+            if not ok:
+                self.errors[action] += 1
+            if redirected:
+                self.redirects[action] += 1
+
+    def _check(self, user, status, expected):
+        """(berhasil, redirect tak terduga) untuk satu respons."""
+        to_login = (300 <= status < 400 and user.location is not None
+                    and urllib.parse.urlsplit(user.location).path == self.login_path)
+        ok = status == expected and not to_login
+        return ok, not ok and 300 <= status < 400
+
+    def _run_user(self, index, deadline):
+        rng = random.Random(self.seed + index)
+        user = VirtualUser(self.transport, self.username, self.password,
+                           self.frameworks, self.criteria, rng)
+        actions = list(self.mix)
+        weights = [self.mix[a] for a in actions]
+        try:
+            if not user.login():
+                with self._lock:
+                    self.login_failures += 1
+                return
+            while time.monotonic() < deadline:
+                action = rng.choices(actions, weights)[0]
+                started = time.perf_counter()
+                redirected = False
+                try:
+                    ok, redirected = self._check(user, *getattr(user, action)())
+                except Exception:
+                    ok = False
+                self._record(action, time.perf_counter() - started, ok, redirected)
+                if self.think_time:
+                    time.sleep(rng.uniform(0, 2 * self.think_time))
+        finally:
+            connections.close_all()
+
+    def run(self):
+        started = time.monotonic()
+        deadline = started + self.duration
+        threads = [
+            threading.Thread(target=self._run_user, args=(i, deadline), daemon=True)
+            for i in range(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed):
+        actions = {}
+        all_latencies = []
+        total_errors = total_redirects = 0
+        for action, latencies in self.latencies.items():
+            all_latencies.extend(latencies)
+            total_errors += self.errors[action]
+            total_redirects += self.redirects[action]
+            actions[action] = summarize(latencies, self.errors[action], elapsed, self.redirects[action])
+        return {
+            'users': self.users,
+            'elapsed': elapsed,
+            'login_failures': self.login_failures,
+            'total': summarize(all_latencies, total_errors, elapsed, total_redirects),
+            'actions': actions,
+        }
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def summarize(latencies, errors, elapsed, redirects=0):
+    """``errors`` = semua respons tak sesuai harapan; ``redirects`` bagian darinya yang 3xx."""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': errors / count if count else 0.0,
+        'redirects': redirects,
+        'throughput': count / elapsed if elapsed else 0.0,
+        'mean': statistics.fmean(values) if values else 0.0,
+        'p50': percentile(values, 50),
+        'p90': percentile(values, 90),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else 0.0,
+    }
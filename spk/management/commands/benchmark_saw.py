@@ -0,0 +1,115 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from ... import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark calculate_saw, framework_list, export_data, upload_csv and import_data "
+        "against a synthetic dataset in a throwaway test database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='10x5,100x10,1000x20',
+            help="Comma separated FRAMEWORKSxCRITERIA sizes, e.g. 100x5,10000x50"
+        )
+        parser.add_argument('--null-density', type=float, default=0.1,
+                            help="Fraction of score cells stored as NULL")
+        parser.add_argument('--repeat', type=int, default=5, help="Runs per scenario")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--scenarios', default=','.join(benchmark.SCENARIOS),
+            help="Comma separated subset of: " + ', '.join(benchmark.SCENARIOS)
+        )
+        parser.add_argument(
+            '--output', default=os.path.join(settings.BASE_DIR, 'benchmarks', 'latest.json'),
+            help="Where to write the JSON results"
+        )
+        parser.add_argument(
+            '--baseline', default=os.path.join(settings.BASE_DIR, 'benchmarks', 'baseline.json'),
+            help="Baseline JSON to compare against"
+        )
+        parser.add_argument('--update-baseline', action='store_true',
+                            help="Store this run as the new baseline")
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="Allowed relative slowdown before a scenario counts as a regression")
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help="Exit with an error when any scenario regressed")
+
+    def handle(self, *args, **options):
+        scenarios = [s.strip() for s in options['scenarios'].split(',') if s.strip()]
+        unknown = set(scenarios) - set(benchmark.SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        sizes = benchmark.parse_sizes(options['sizes'])
+        if not sizes:
+            raise CommandError("No sizes given.")
+
+        # Jalankan di database test agar data asli tidak tersentuh
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            result = benchmark.run_suite(
+                sizes,
+                null_density=options['null_density'],
+                repeat=options['repeat'],
+                seed=options['seed'],
+                scenarios=scenarios,
+                log=self.stdout.write,
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self._write(options['output'], result)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        baseline_path = options['baseline']
+        regressions = []
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding='utf-8') as f:
+                baseline = json.load(f)
+            rows = benchmark.compare(result, baseline, options['tolerance'])
+            self._print_comparison(rows)
+            regressions = [row for row in rows if row['status'] == 'regression']
+        else:
+            self.stdout.write(f"No baseline at {baseline_path}; run with --update-baseline to store one.")
+
+        if options['update_baseline']:
+            self._write(baseline_path, result)
+            self.stdout.write(f"Baseline updated: {baseline_path}")
+
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f"{len(regressions)} scenario(s) regressed.")
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    def _print_comparison(self, rows):
+        def ms(value):
+            return '-' if value is None else f'{value * 1000:.1f} ms'
+
+        width = max(len(row['key']) for row in rows) if rows else 10
+        self.stdout.write(f"{'scenario'.ljust(width)}  {'baseline':>12}  {'current':>12}  {'change':>8}  queries")
+        for row in rows:
+            change = '' if row['change'] is None else f"{row['change'] * 100:+.1f}%"
+            base_q, cur_q = row['queries']
+            line = (
+                f"{row['key'].ljust(width)}  {ms(row['baseline']):>12}  {ms(row['current']):>12}  "
+                f"{change:>8}  {base_q if base_q is not None else '-'} -> {cur_q if cur_q is not None else '-'}"
+                f"  {row['status']}"
+            )
+            if row['status'] == 'regression':
+                line = self.style.ERROR(line)
+            elif row['status'] == 'improved':
+                line = self.style.SUCCESS(line)
+            self.stdout.write(line)
@@ -0,0 +1,113 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ... import metrics as spk_metrics
+from ... import warmup
+from ...caching import bump_once
+from ...models import Criteria, Framework
+from ...scores import upsert_scores
+
+
+class Command(BaseCommand):
+    help = "Import criteria & framework data from CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--criteria-csv', required=True,
+            help="Path to criteria.csv (name,weight,attribute)"
+        )
+        parser.add_argument(
+            '--data-csv', required=True,
+            help="Path to data.csv with framework metrics"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        # Satu transaksi dan satu kenaikan data version untuk seluruh import
+        with transaction.atomic(), bump_once():
+            rows = self._import(options['criteria_csv'], options['data_csv'])
+        spk_metrics.record_import('command', rows, time.perf_counter() - started)
+
+        # Proses command segera selesai: jalankan warm-up sekarang, bukan di thread
+        if warmup.scheduler.flush():
+            self.stdout.write("✔️ Cache warmed.")
+
+    def _import(self, criteria_csv, data_csv):
+        rows = 0
+
+        # 1. Reset & load kriteria
+        self.stdout.write("🔄 Resetting Criteria...")
+        Criteria.objects.all().delete()
+        
+        with open(criteria_csv, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                rows += 1
+                Criteria.objects.create(
+                    name=row['name'].strip(),
+                    weight=float(row['weight']),
+                    attribute=row['attribute'].strip().lower()
+                )
+        
+        all_criteria = list(Criteria.objects.all())
+        self.stdout.write(f"✔️ Loaded {len(all_criteria)} criteria.")
+
+        # 2. Load data.csv dan mapping kolom ke nama kriteria
+        mapping = {
+            'Performa (req/s)': 'Performa',
+            'Skalabilitas (1-5)': 'Skalabilitas',
+            'Komunitas (User)': 'Komunitas',
+            'Kemudahan Belajar (Jam)': 'Kemudahan Belajar',
+            'Pemeliharaan & Update (per Tahun)': 'Pemeliharaan & Update',
+        }
+
+        self.stdout.write("🔄 Processing data.csv for frameworks & scores...")
+        created_fw = 0
+        cells = []
+        criteria_by_name = {c.name: c for c in all_criteria}
+        # Nama framework tidak unik: nama ganda dipetakan ke id terkecil
+        framework_ids = {}
+        for framework_id, name in Framework.objects.order_by('-id').values_list('id', 'name'):
+            framework_ids[name] = framework_id
+
+        with open(data_csv, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f, delimiter=',')
+            for row in reader:
+                # Skip empty rows
+                if not row.get('Framework') or row.get('Framework').strip() == '':
+                    continue
+                    
+                fw_name = row['Framework'].strip()
+                rows += 1
+                
+                # 3. Create or get Framework
+                if fw_name not in framework_ids:
+                    framework_ids[fw_name] = Framework.objects.create(
+                        name=fw_name, description=f'Framework {fw_name}'
+                    ).id
+                    created_fw += 1
+
+                # 4. For each mapped kriteria, update or create score
+                for col, crit_name in mapping.items():
+                    raw_val = row.get(col)
+                    if raw_val is None or raw_val == '':
+                        continue
+                    try:
+                        value = float(raw_val)
+                    except ValueError:
+                        continue
+
+                    crit = criteria_by_name.get(crit_name)
+                    if not crit:
+                        self.stderr.write(f"⚠️ Criteria '{crit_name}' not found, skipping.")
+                        continue
+
+                    cells.append((framework_ids[fw_name], crit.id, value))
+
+        updated_scores = upsert_scores(cells)
+        self.stdout.write(f"✔️ Created {created_fw} new frameworks.")
+        self.stdout.write(f"✔️ Updated/Created {updated_scores} framework scores.")
+        return rows
@@ -0,0 +1,96 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import loadtest
+from ...models import Criteria, Framework
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent simulated users (login, dashboard, list, calculate, edit, upload) "
+        "against the WSGI application in-process or a local server"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help="Concurrent simulated users")
+        parser.add_argument('--duration', type=float, default=30, help="Run time in seconds")
+        parser.add_argument('--url', help="Base URL of a running server; default is in-process WSGI")
+        parser.add_argument('--username', default='loadtest')
+        parser.add_argument('--password', default='loadtest-password')
+        parser.add_argument('--create-user', action='store_true',
+                            help="Create/reset the load test user before running")
+        parser.add_argument(
+            '--mix', default=','.join(f'{k}={v}' for k, v in loadtest.DEFAULT_MIX.items()),
+            help="Weighted action mix, e.g. dashboard=30,list=25,calculate=25,edit=12,upload=8"
+        )
+        parser.add_argument('--think-time', type=float, default=0.0,
+                            help="Mean pause between actions per user (seconds)")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', dest='json_path', help="Also write the report to this JSON file")
+
+    def handle(self, *args, **options):
+        try:
+            mix = loadtest.parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['create_user']:
+            user, _ = User.objects.get_or_create(username=options['username'])
+            user.set_password(options['password'])
+            user.save()
+
+        if options['url']:
+            transport = loadtest.HTTPTransport(options['url'])
+        else:
+            from saw_project.wsgi import application
+            transport = loadtest.WSGITransport(application)
+
+        frameworks = list(Framework.objects.values_list('id', 'name'))
+        criteria = list(Criteria.objects.values_list('id', 'name'))
+
+        self.stdout.write(
+            f"Running {options['users']} users for {options['duration']}s "
+            f"against {options['url'] or 'saw_project.wsgi.application'}..."
+        )
+        report = loadtest.LoadTest(
+            transport,
+            users=options['users'],
+            duration=options['duration'],
+            username=options['username'],
+            password=options['password'],
+            mix=mix,
+            think_time=options['think_time'],
+            frameworks=frameworks,
+            criteria=criteria,
+            seed=options['seed'],
+        ).run()
+
+        self._print_report(report)
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        if report['login_failures']:
+            self.stderr.write(f"{report['login_failures']} user(s) failed to log in.")
+        if report['total']['redirects']:
+            self.stderr.write(
+                f"{report['total']['redirects']} request(s) got an unexpected redirect "
+                "(e.g. to the login page); they are counted as errors."
+            )
+
+    def _print_report(self, report):
+        def ms(value):
+            return f'{value * 1000:.1f}'
+
+        self.stdout.write(
+            f"{'action':<10} {'requests':>9} {'req/s':>8} {'errors':>7} {'redir':>6} "
+            f"{'mean':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)"
+        )
+        rows = list(report['actions'].items()) + [('TOTAL', report['total'])]
+        for name, stats in rows:
+            self.stdout.write(
+                f"{name:<10} {stats['requests']:>9} {stats['throughput']:>8.1f} "
+                f"{stats['error_rate'] * 100:>6.1f}% {stats['redirects']:>6} {ms(stats['mean']):>8} {ms(stats['p50']):>8} "
+                f"{ms(stats['p90']):>8} {ms(stats['p95']):>8} {ms(stats['p99']):>8} {ms(stats['max']):>8}"
+            )
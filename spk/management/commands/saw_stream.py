@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ... import streaming
+from ...models import Criteria
+
+
+class Command(BaseCommand):
+    help = (
+        "Rank frameworks with the two-pass streaming SAW engine: memory is bounded by "
+        "--chunk-size and --top instead of the catalog size"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help="Number of best frameworks to print")
+        parser.add_argument('--chunk-size', type=int, default=streaming.DEFAULT_CHUNK_SIZE,
+                            help="Frameworks scored per database round trip")
+        parser.add_argument('--output', help="Write the full ranking to this CSV file (external merge sort)")
+        parser.add_argument('--json', action='store_true', help="Print the top-k as JSON")
+
+    def handle(self, *args, **options):
+        if options['top'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--top and --chunk-size must be positive')
+        criteria_list = list(Criteria.objects.all())
+        if not criteria_list:
+            raise CommandError('Data kriteria masih kosong.')
+        total_weight = sum(c.weight for c in criteria_list)
+        if abs(total_weight - 1.0) > 0.001:
+            raise CommandError(f'Total bobot kriteria harus 1.0 (saat ini: {total_weight:.3f}).')
+
+        result = streaming.stream_rank(
+            criteria_list,
+            k=options['top'],
+            chunk_size=options['chunk_size'],
+            spill_path=options['output'],
+        )
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+
+        self.stdout.write(f"{result['total']} frameworks ranked")
+        for item in result['top']:
+            self.stdout.write(f"#{item['rank']:<4} {item['score_display']:<10} {item['framework']}")
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f"Full ranking written to {options['output']}"))
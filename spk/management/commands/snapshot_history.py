@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ... import history
+
+
+class Command(BaseCommand):
+    help = (
+        "Store a compact snapshot of criteria, frameworks and scores so as-of rankings "
+        "replay only the changes made after it (run periodically, e.g. from cron)"
+    )
+
+    def handle(self, *args, **options):
+        snapshot = history.take_snapshot()
+        data = snapshot.data
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot #{snapshot.pk}: {len(data['criteria'])} criteria, {len(data['frameworks'])} frameworks, "
+            f"{len(data['scores'])} scores (up to change #{snapshot.change_id})"
+        ))
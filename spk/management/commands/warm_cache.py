@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ... import warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute dashboard stats, rankings for the global weights and every saved "
+        "weight profile, and the CSV export for the current data version (e.g. after deploy)"
+    )
+
+    def handle(self, *args, **options):
+        summary = warmup.warm()
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed data version {summary['version']}: {summary['rankings']} rankings "
+            f"in {summary['seconds']:.2f}s"
+        ))
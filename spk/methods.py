@@ -0,0 +1,177 @@
+"""
+Registry metode MCDM yang berbagi satu matriks dan satu tahap normalisasi.
+
+Setiap metode adalah fungsi ``fn(context) -> [skor per framework]`` yang
+didaftarkan dengan ``@register``. ``MethodContext`` memuat matriks X, bobot,
+dan matriks R hasil normalisasi SAW (benefit x/max, cost min/x) yang dihitung
+sekali; turunan lain (norma vektor TOPSIS, produk WP) juga dihitung sekali
+lalu dipakai ulang oleh metode berikutnya, misalnya WASPAS memakai hasil SAW
+dan WP yang sudah ada.
+
+Sel kosong (atau 0) selalu lebih buruk dari nilai terisi terburuk pada
+kriteria tersebut, di semua metode:
+
+- SAW: r = 0; min kriteria cost dihitung dari sel terisi saja
+  (``saw.normalize(..., skip_empty=True)``). Halaman ranking utama tetap
+  memakai aturan lama (sel kosong = 0 ikut ke min), jadi skor SAW di sini
+  bisa berbeda dari ``calculate_saw`` bila ada sel cost kosong.
+- WP (dan bagian WP dari WASPAS): r = 0 akan membuat seluruh produk 0, jadi
+  diganti setengah r positif terkecil di kolom itu; kolom tanpa r positif
+  diabaikan (faktor 1 untuk semua framework).
+- TOPSIS (memakai X, bukan R): sel kriteria cost bernilai 2 x max kolom,
+  setara r = setengah r terkecil; sel benefit tetap 0.
+"""
+import math
+from functools import cached_property
+
+from . import saw
+from .caching import cached, get_data_version
+from .rank_compare import spearman_rho
+
+METHODS = {}
+
+# Porsi SAW dalam WASPAS: Q = lambda * SAW + (1 - lambda) * WP
+WASPAS_LAMBDA = 0.5
+
+
+def register(name, label):
+    def decorator(fn):
+        METHODS[name] = (label, fn)
+        return fn
+    return decorator
+
+
+class MethodContext:
+    def __init__(self, matrix, weights, normalized):
+        self.matrix = matrix
+        self.weights = weights
+        self.normalized = normalized
+        self.scores = {}
+
+    def run(self, name):
+        if name not in self.scores:
+            self.scores[name] = METHODS[name][1](self)
+        return self.scores[name]
+
+    @cached_property
+    def wp_floors(self):
+        """Pengganti r = 0 per kolom untuk WP (1.0 jika kolom tidak punya r positif)."""
+        columns = zip(*self.normalized) if self.normalized else [() for _ in self.weights]
+        return [min((r for r in col if r > 0), default=2.0) / 2 for col in columns]
+
+    @cached_property
+    def wp_products(self):
+        # prod r_ij^w_j pada R sama urutannya dengan WP klasik (x^w / x^-w)
+        return [
+            math.prod((r if r > 0 else floor) ** w for r, w, floor in zip(row, self.weights, self.wp_floors))
+            for row in self.normalized
+        ]
+
+    @cached_property
+    def topsis_values(self):
+        """X untuk TOPSIS: sel cost kosong/0 menjadi 2 x max kolom (lebih buruk dari terisi)."""
+        replacements = [
+            2 * max(col, default=0) if c.attribute == 'cost' else None
+            for c, col in zip(self.matrix.criteria, self.matrix.columns())
+        ]
+        return [
+            [x if x > 0 or worst is None else worst for x, worst in zip(row, replacements)]
+            for row in self.matrix.values
+        ]
+
+    @cached_property
+    def vector_norms(self):
+        columns = zip(*self.topsis_values) if self.topsis_values else [() for _ in self.weights]
+        return [math.sqrt(sum(x * x for x in col)) or 1.0 for col in columns]
+
+
+@register('saw', 'SAW')
+def simple_additive_weighting(context):
+    return [sum(r * w for r, w in zip(row, context.weights)) for row in context.normalized]
+
+
+@register('wp', 'Weighted Product')
+def weighted_product(context):
+    products = context.wp_products
+    total = sum(products)
+    return [p / total if total else 0.0 for p in products]
+
+
+@register('topsis', 'TOPSIS')
+def topsis(context):
+    criteria = context.matrix.criteria
+    weighted = [
+        [x / norm * w for x, norm, w in zip(row, context.vector_norms, context.weights)]
+        for row in context.topsis_values
+    ]
+    columns = list(zip(*weighted)) if weighted else []
+    ideal = [max(col) if c.attribute == 'benefit' else min(col) for c, col in zip(criteria, columns)]
+    anti_ideal = [min(col) if c.attribute == 'benefit' else max(col) for c, col in zip(criteria, columns)]
+    scores = []
+    for row in weighted:
+        d_plus = math.dist(row, ideal)
+        d_minus = math.dist(row, anti_ideal)
+        scores.append(d_minus / (d_plus + d_minus) if d_plus + d_minus else 0.0)
+    return scores
+
+
+@register('waspas', 'WASPAS')
+def waspas(context):
+    return [
+        WASPAS_LAMBDA * s + (1 - WASPAS_LAMBDA) * p
+        for s, p in zip(context.run('saw'), context.wp_products)
+    ]
+
+
+def ranks(scores):
+    """Posisi rank (1 = terbaik) sejajar ``scores``; seri mengikuti urutan baris."""
+    order = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+    positions = [0] * len(scores)
+    for position, i in enumerate(order, start=1):
+        positions[i] = position
+    return positions
+
+
+def compare_methods(criteria_list, names=None, weights=None, data_version=None):
+    """
+    Jalankan ``names`` (default semua metode) pada matriks bersama dan
+    kembalikan skor, rank dan statistik kesepakatan antar metode.
+    """
+    names = [n for n in (names or METHODS) if n in METHODS]
+    if weights is None:
+        weights = [c.weight for c in criteria_list]
+    if data_version is None:
+        data_version = get_data_version()
+    key = f"mcdm:{','.join(names)}:{saw.weights_key(criteria_list, weights)}"
+
+    def compute():
+        shared = saw.shared_matrix(criteria_list, data_version)
+        matrix = shared['matrix']
+        context = MethodContext(matrix, weights, saw.normalize(matrix, skip_empty=True))
+        scores = {name: context.run(name) for name in names}
+        positions = {name: ranks(scores[name]) for name in names}
+
+        rows = [
+            {
+                'framework_id': fid,
+                'framework': matrix.framework_names[i],
+                'results': [(scores[name][i], positions[name][i]) for name in names],
+                'rank_spread': max(positions[n][i] for n in names) - min(positions[n][i] for n in names) if names else 0,
+            }
+            for i, fid in enumerate(matrix.framework_ids)
+        ]
+        rows.sort(key=lambda row: row['results'][0][1] if names else 0)
+
+        winners = {name: matrix.framework_names[positions[name].index(1)] for name in names if positions[name]}
+        agreement = [
+            (a, b, spearman_rho(positions[a], positions[b]), winners.get(a) == winners.get(b))
+            for k, a in enumerate(names) for b in names[k + 1:]
+        ]
+        return {
+            'methods': [(name, METHODS[name][0]) for name in names],
+            'rows': rows,
+            'winners': winners,
+            'agreement': agreement,
+        }
+
+    return cached(key, compute, version=data_version)
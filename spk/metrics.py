@@ -0,0 +1,234 @@
+"""
+Counter metrik ringan untuk engine SAW, import CSV dan export.
+
+Setiap metrik punya lock sendiri sehingga aman di-update dari beberapa thread
+(worker WSGI, management command, scheduler). Hasilnya dirender ke format teks
+Prometheus atau JSON oleh view ``metrics``.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+class Metric:
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def _labels(self, key):
+        return tuple(zip(self.labelnames, key))
+
+    def samples(self):
+        """Daftar (suffix, labels, value) untuk dirender."""
+        with self._lock:
+            items = list(self._values.items())
+        return [('', self._labels(key), value) for key, value in sorted(items)]
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        self._function = function
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self._function is not None:
+            return [('', (), self._function())]
+        return super().samples()
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def value(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return {'count': state[2], 'sum': state[1]} if state else {'count': 0, 'sum': 0.0}
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(s[0]), s[1], s[2])) for key, s in self._values.items()]
+        result = []
+        for key, (counts, total, count) in sorted(items):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                result.append(('_bucket', labels + (('le', _format_value(float(bound))),), cumulative))
+            result.append(('_sum', labels, total))
+            result.append(('_count', labels, count))
+        return result
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render_text(self):
+        """Render semua metrik ke format eksposisi teks Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for suffix, labels, value in metric.samples():
+                lines.append(f'{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def as_dict(self):
+        data = {}
+        for metric in self._metrics:
+            data[metric.name] = [
+                {'name': metric.name + suffix, 'labels': dict(labels), 'value': value}
+                for suffix, labels, value in metric.samples()
+            ]
+        return data
+
+
+REGISTRY = Registry()
+
+# Engine SAW
+ranking_total = REGISTRY.register(Counter(
+    'spk_ranking_total', 'Jumlah perhitungan ranking SAW.'))
+ranking_seconds = REGISTRY.register(Histogram(
+    'spk_ranking_seconds', 'Durasi perhitungan ranking SAW (detik).'))
+matrix_frameworks = REGISTRY.register(Gauge(
+    'spk_matrix_frameworks', 'Jumlah baris (framework) pada matriks keputusan terakhir.'))
+matrix_criteria = REGISTRY.register(Gauge(
+    'spk_matrix_criteria', 'Jumlah kolom (kriteria) pada matriks keputusan terakhir.'))
+
+# Cache
+cache_requests_total = REGISTRY.register(Counter(
+    'spk_cache_requests_total', 'Jumlah lookup cache aplikasi per hasil (hit/miss).', ('result',)))
+
+
+def _cache_hit_ratio():
+    hits = cache_requests_total.value(result='hit')
+    total = hits + cache_requests_total.value(result='miss')
+    return hits / total if total else 0.0
+
+
+cache_hit_ratio = REGISTRY.register(Gauge(
+    'spk_cache_hit_ratio', 'Rasio hit cache aplikasi sejak proses dimulai.', function=_cache_hit_ratio))
+
+# Import / export
+import_rows_total = REGISTRY.register(Counter(
+    'spk_import_rows_total', 'Jumlah baris CSV yang diimport.', ('source',)))
+import_seconds_total = REGISTRY.register(Counter(
+    'spk_import_seconds_total', 'Total waktu import CSV (detik).', ('source',)))
+import_rows_per_second = REGISTRY.register(Gauge(
+    'spk_import_rows_per_second', 'Throughput import terakhir (baris/detik).', ('source',)))
+export_rows_total = REGISTRY.register(Counter(
+    'spk_export_rows_total', 'Jumlah baris yang diexport.'))
+export_seconds_total = REGISTRY.register(Counter(
+    'spk_export_seconds_total', 'Total waktu export (detik).'))
+export_rows_per_second = REGISTRY.register(Gauge(
+    'spk_export_rows_per_second', 'Throughput export terakhir (baris/detik).'))
+
+# Warm-up cache (spk.warmup)
+warmup_total = REGISTRY.register(Counter(
+    'spk_warmup_total', 'Jumlah warm-up cache per hasil (ok/error).', ('result',)))
+warmup_seconds = REGISTRY.register(Histogram(
+    'spk_warmup_seconds', 'Durasi warm-up cache (detik).'))
+
+
+def record_cache(hit):
+    cache_requests_total.inc(result='hit' if hit else 'miss')
+
+
+def record_import(source, rows, seconds):
+    import_rows_total.inc(rows, source=source)
+    import_seconds_total.inc(seconds, source=source)
+    if seconds > 0:
+        import_rows_per_second.set(rows / seconds, source=source)
+
+
+def record_export(rows, seconds):
+    export_rows_total.inc(rows)
+    export_seconds_total.inc(seconds)
+    if seconds > 0:
+        export_rows_per_second.set(rows / seconds)
+
+
+def record_warmup(seconds):
+    """``seconds`` None berarti warm-up gagal."""
+    if seconds is None:
+        warmup_total.inc(result='error')
+        return
+    warmup_total.inc(result='ok')
+    warmup_seconds.observe(seconds)
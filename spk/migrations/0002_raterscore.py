@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spk', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='frameworkscore',
+            name='framework',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='spk.framework'),
+        ),
+        migrations.CreateModel(
+            name='RaterScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.FloatField(blank=True, null=True)),
+                ('criteria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='spk.criteria')),
+                ('framework', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rater_scores', to='spk.framework')),
+                ('rater', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rater_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('rater', 'framework', 'criteria')},
+            },
+        ),
+    ]
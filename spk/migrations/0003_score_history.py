@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def baseline_snapshot(apps, schema_editor):
+    # Data yang sudah ada sebelum log dimulai menjadi snapshot awal
+    Criteria = apps.get_model('spk', 'Criteria')
+    Framework = apps.get_model('spk', 'Framework')
+    FrameworkScore = apps.get_model('spk', 'FrameworkScore')
+    ScoreSnapshot = apps.get_model('spk', 'ScoreSnapshot')
+    ScoreSnapshot.objects.create(change_id=0, data={
+        'criteria': [list(row) for row in Criteria.objects.order_by('id').values_list('id', 'name', 'weight', 'attribute')],
+        'frameworks': [list(row) for row in Framework.objects.order_by('id').values_list('id', 'name')],
+        'scores': [
+            list(row) for row in
+            FrameworkScore.objects.order_by('framework_id', 'criteria_id').values_list('framework_id', 'criteria_id', 'value')
+        ],
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spk', '0002_raterscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('changed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('kind', models.CharField(choices=[('criteria', 'Criteria'), ('framework', 'Framework'), ('score', 'Score'), ('reset', 'Reset framework & skor'), ('reset_all', 'Reset semua')], max_length=10)),
+                ('criteria_id', models.BigIntegerField(blank=True, null=True)),
+                ('framework_id', models.BigIntegerField(blank=True, null=True)),
+                ('name', models.CharField(blank=True, default='', max_length=100)),
+                ('weight', models.FloatField(blank=True, null=True)),
+                ('attribute', models.CharField(blank=True, default='', max_length=10)),
+                ('value', models.FloatField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScoreSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('change_id', models.BigIntegerField()),
+                ('data', models.JSONField()),
+            ],
+        ),
+        migrations.RunPython(baseline_snapshot, migrations.RunPython.noop),
+    ]
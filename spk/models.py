@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 
 class Criteria(models.Model):
@@ -35,9 +36,63 @@ class FrameworkScore(models.Model):
     def __str__(self):
         return f"{self.framework.name} - {self.criteria.name}: {self.value}"
 
+class RaterScore(models.Model):
+    """Skor dari satu penilai (rater) untuk mode keputusan kelompok."""
+    rater = models.ForeignKey(User, on_delete=models.CASCADE, related_name="rater_scores")
+    framework = models.ForeignKey(Framework, on_delete=models.CASCADE, related_name="rater_scores")
+    criteria = models.ForeignKey(Criteria, on_delete=models.CASCADE)
+    value = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('rater', 'framework', 'criteria')
+
+    def __str__(self):
+        return f"{self.rater.username} - {self.framework.name} - {self.criteria.name}: {self.value}"
+
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     preferences = models.JSONField(default=dict)
 
     def __str__(self):
         return f"Profil: {self.user.username}"
+
+
+class ScoreChange(models.Model):
+    """Log append-only perubahan data SAW (lihat ``spk.history``)."""
+    CRITERIA = 'criteria'
+    FRAMEWORK = 'framework'
+    SCORE = 'score'
+    RESET = 'reset'
+    RESET_ALL = 'reset_all'
+    KIND_CHOICES = (
+        (CRITERIA, 'Criteria'),
+        (FRAMEWORK, 'Framework'),
+        (SCORE, 'Score'),
+        (RESET, 'Reset framework & skor'),
+        (RESET_ALL, 'Reset semua'),
+    )
+
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # Id disimpan tanpa FK agar log tetap ada setelah objeknya dihapus
+    criteria_id = models.BigIntegerField(null=True, blank=True)
+    framework_id = models.BigIntegerField(null=True, blank=True)
+    name = models.CharField(max_length=100, blank=True, default='')
+    weight = models.FloatField(null=True, blank=True)
+    attribute = models.CharField(max_length=10, blank=True, default='')
+    value = models.FloatField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"{self.changed_at:%Y-%m-%d %H:%M:%S} {self.kind}"
+
+
+class ScoreSnapshot(models.Model):
+    """Keadaan lengkap data SAW setelah ``ScoreChange`` dengan id ``change_id``."""
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    change_id = models.BigIntegerField()
+    data = models.JSONField()
+
+    def __str__(self):
+        return f"Snapshot {self.created_at:%Y-%m-%d %H:%M:%S} (s/d perubahan #{self.change_id})"
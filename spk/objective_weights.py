@@ -0,0 +1,132 @@
+"""
+Bobot objektif kriteria dari data: metode entropy dan CRITIC.
+
+Keduanya dihitung pada matriks R (normalisasi SAW, arah cost sudah dibalik;
+min cost dari sel terisi saja agar sel kosong tidak menolkan kolom cost)
+dari akumulator kolom satu lintasan: jumlah, jumlah r*ln(r) dan jumlah
+hasil kali antar kolom. Akumulator bisa diisi dari matriks yang sudah di-cache
+atau dari chunk ``spk.streaming`` untuk katalog besar, tanpa memuat seluruh
+matriks sekaligus.
+
+- Entropy: ``p_ij = r_ij / S_j`` sehingga
+  ``sum p ln p = T_j / S_j - ln S_j`` dengan ``T_j = sum r ln r``;
+  ``E_j = -(...) / ln n`` dan bobot sebanding dengan ``1 - E_j``.
+- CRITIC: bobot sebanding dengan ``sigma_j * sum_k (1 - rho_jk)``.
+"""
+import math
+
+from . import saw, streaming
+
+METHODS = {
+    'entropy': 'Entropy',
+    'critic': 'CRITIC',
+}
+
+# Presisi bobot yang disimpan; sisa pembulatan diberikan ke bobot terbesar
+WEIGHT_DECIMALS = 4
+
+
+class ColumnStats:
+    def __init__(self, m):
+        self.n = 0
+        self.sums = [0.0] * m
+        self.xlogx = [0.0] * m
+        self.cross = [[0.0] * m for _ in range(m)]
+
+    def add(self, row):
+        self.n += 1
+        for j, r in enumerate(row):
+            self.sums[j] += r
+            if r > 0:
+                self.xlogx[j] += r * math.log(r)
+            cross = self.cross[j]
+            for k in range(j, len(row)):
+                cross[k] += r * row[k]
+
+    def update(self, rows):
+        for row in rows:
+            self.add(row)
+        return self
+
+    def covariance(self, j, k):
+        j, k = min(j, k), max(j, k)
+        cov = self.cross[j][k] / self.n - (self.sums[j] / self.n) * (self.sums[k] / self.n)
+        # Varians tidak boleh negatif akibat galat pembulatan
+        return max(cov, 0.0) if j == k else cov
+
+
+def _normalize(values):
+    total = sum(values)
+    if total <= 0:
+        return [1.0 / len(values)] * len(values) if values else []
+    return [v / total for v in values]
+
+
+def entropy_weights(stats):
+    m = len(stats.sums)
+    if stats.n < 2:
+        return [1.0 / m] * m if m else []
+    scale = 1 / math.log(stats.n)
+    divergence = []
+    for s, t in zip(stats.sums, stats.xlogx):
+        entropy = -scale * (t / s - math.log(s)) if s > 0 else 1.0
+        divergence.append(max(1 - entropy, 0.0))
+    return _normalize(divergence)
+
+
+def critic_weights(stats):
+    m = len(stats.sums)
+    if stats.n < 2:
+        return [1.0 / m] * m if m else []
+    sigma = [math.sqrt(stats.covariance(j, j)) for j in range(m)]
+    information = []
+    for j in range(m):
+        conflict = 0.0
+        for k in range(m):
+            if sigma[j] > 0 and sigma[k] > 0:
+                rho = stats.covariance(j, k) / (sigma[j] * sigma[k])
+            else:
+                rho = 0.0
+            conflict += 1 - rho
+        information.append(sigma[j] * conflict)
+    return _normalize(information)
+
+
+_WEIGHTS = {'entropy': entropy_weights, 'critic': critic_weights}
+
+
+def round_weights(weights, decimals=WEIGHT_DECIMALS):
+    """Bulatkan dengan total tetap tepat 1.0 (lolos cek total bobot)."""
+    if not weights:
+        return []
+    rounded = [round(w, decimals) for w in weights]
+    largest = max(range(len(rounded)), key=rounded.__getitem__)
+    rounded[largest] = round(rounded[largest] + 1.0 - sum(rounded), decimals)
+    return rounded
+
+
+def column_stats(criteria_list, stream=False, chunk_size=streaming.DEFAULT_CHUNK_SIZE):
+    stats = ColumnStats(len(criteria_list))
+    if not stream:
+        matrix = saw.shared_matrix(criteria_list)['matrix']
+        return stats.update(saw.normalize(matrix, skip_empty=True))
+
+    max_vals, min_vals = streaming.column_bounds(criteria_list, skip_empty=True)
+    benefit = [c.attribute == 'benefit' for c in criteria_list]
+    for chunk in streaming.iter_chunks(criteria_list, chunk_size):
+        stats.update(
+            [
+                (x / top) if is_benefit else ((low / x) if x > 0 else 0)
+                for x, is_benefit, top, low in zip(values, benefit, max_vals, min_vals)
+            ]
+            for _, _, values in chunk
+        )
+    return stats
+
+
+def derive_weights(criteria_list, method='entropy', stream=False):
+    """Bobot objektif (sudah dibulatkan, total 1.0) sejajar ``criteria_list``."""
+    if method not in _WEIGHTS:
+        raise ValueError(f'Metode bobot tidak dikenal: {method}')
+    stats = column_stats(criteria_list, stream=stream)
+    return round_weights(_WEIGHTS[method](stats))
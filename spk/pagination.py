@@ -0,0 +1,95 @@
+"""
+Keyset (seek) pagination.
+
+Berbeda dengan OFFSET, query halaman berikutnya memakai ``WHERE (kolom) >
+(nilai terakhir)`` sehingga biayanya tidak tumbuh dengan posisi halaman.
+Cursor berisi nilai kolom urutan dari baris batas plus posisi baris (untuk
+penomoran di tabel), di-encode base64 agar aman di query string.
+"""
+import base64
+import json
+
+from django.db.models import Q
+
+
+def encode_cursor(values, position):
+    raw = json.dumps({'v': list(values), 'p': position}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Mengembalikan (values, position) atau None jika cursor tidak valid."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return list(data['v']), int(data['p'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _seek_filter(fields, values, op):
+    """(f1, f2) > (v1, v2)  ->  f1 > v1 OR (f1 = v1 AND f2 > v2)"""
+    condition = Q()
+    for i, field in enumerate(fields):
+        term = Q(**{f'{field}__{op}': values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            term &= Q(**{prev_field: prev_value})
+        condition |= term
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, items, start_index, has_next, has_previous, next_cursor, previous_cursor):
+        self.items = items
+        self.start_index = start_index
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_page(queryset, fields, size, after=None, before=None):
+    """
+    Ambil satu halaman dari ``queryset`` terurut menurut ``fields`` (kolom
+    terakhir harus unik, mis. ``id``). ``after``/``before`` adalah cursor dari
+    halaman sebelumnya.
+    """
+    fields = tuple(fields)
+    after = decode_cursor(after)
+    before = decode_cursor(before) if after is None else None
+
+    if before is not None:
+        values, position = before
+        qs = queryset.filter(_seek_filter(fields, values, 'lt'))
+        qs = qs.order_by(*[f'-{f}' for f in fields])
+        rows = list(qs[:size + 1])
+        has_previous = len(rows) > size
+        rows = rows[:size][::-1]
+        start_index = max(position - len(rows), 0)
+        has_next = True
+    else:
+        qs = queryset
+        start_index = 0
+        if after is not None:
+            values, position = after
+            qs = qs.filter(_seek_filter(fields, values, 'gt'))
+            start_index = position + 1
+        rows = list(qs.order_by(*fields)[:size + 1])
+        has_next = len(rows) > size
+        rows = rows[:size]
+        has_previous = after is not None
+
+    def cursor_for(obj, position):
+        return encode_cursor([getattr(obj, f) for f in fields], position)
+
+    next_cursor = cursor_for(rows[-1], start_index + len(rows) - 1) if rows and has_next else None
+    previous_cursor = cursor_for(rows[0], start_index) if rows and has_previous else None
+    return KeysetPage(rows, start_index, has_next, has_previous, next_cursor, previous_cursor)
@@ -0,0 +1,111 @@
+"""
+Pareto front (skyline) dan lapisan dominansi atas matriks keputusan.
+
+Dominansi dihitung pada matriks R hasil normalisasi SAW sehingga arah
+kriteria cost sudah dibalik (lebih besar selalu lebih baik, nilai kosong =
+terburuk). Framework a mendominasi b jika a >= b di semua kriteria dan > di
+minimal satu kriteria.
+
+Algoritma sort-filter-skyline: baris diurutkan menurun menurut (jumlah
+nilai, vektor nilai). Urutan ini monoton terhadap dominansi, jadi sebuah
+baris hanya bisa didominasi baris yang datang lebih dulu. Lapisan ke-k
+berisi baris yang hanya didominasi baris dari lapisan < k. Karena
+"didominasi oleh lapisan k" bersifat monoton terhadap k, lapisan tiap baris
+dicari dengan binary search, tidak perlu mengupas front berulang-ulang.
+"""
+from operator import ge
+
+from . import saw
+
+
+def dominates(a, b):
+    return a != b and all(map(ge, a, b))
+
+
+def dominance_layers(rows, block_size=8192):
+    """
+    ``rows`` adalah list vektor (lebih besar lebih baik). Mengembalikan list
+    nomor lapisan (1 = Pareto front) dalam urutan ``rows``.
+
+    Pengecekan dominansi dilakukan bit-paralel dengan integer Python: untuk
+    setiap blok baris, himpunan pendominasi tiap baris adalah irisan (AND)
+    bitset "nilai >= nilai baris ini" dari semua kriteria. Lapisan disimpan
+    sebagai bitset juga, sehingga "didominasi oleh lapisan k" cukup satu AND.
+    """
+    # Vektor identik tidak saling mendominasi dan selalu satu lapisan
+    unique = {}
+    for row in rows:
+        unique.setdefault(tuple(row), None)
+    order = sorted(unique, key=lambda row: (sum(row), row), reverse=True)
+    n = len(order)
+
+    # Posisi dalam ``order``: pendominasi selalu berada di posisi lebih kecil
+    columns = list(zip(*order))
+    ranked_columns = [sorted(range(n), key=col.__getitem__, reverse=True) for col in columns]
+    layer_masks = []
+    layer_of = [0] * n
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = range(start, stop)
+        dominators = [(1 << pos) - 1 for pos in block]
+        for col, ranked in zip(columns, ranked_columns):
+            seen = bytearray((stop + 7) // 8)
+            snapshot = 0
+            k = 0
+            for pos in sorted(block, key=col.__getitem__, reverse=True):
+                value = col[pos]
+                if k < n and col[ranked[k]] >= value:
+                    while k < n and col[ranked[k]] >= value:
+                        other = ranked[k]
+                        if other < stop:
+                            seen[other >> 3] |= 1 << (other & 7)
+                        k += 1
+                    snapshot = int.from_bytes(seen, 'little')
+                dominators[pos - start] &= snapshot
+
+        for pos in block:
+            mask = dominators[pos - start]
+            lo, hi = 0, len(layer_masks)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if mask & layer_masks[mid]:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == len(layer_masks):
+                layer_masks.append(0)
+            layer_masks[lo] |= 1 << pos
+            layer_of[pos] = lo + 1
+
+    for row, layer in zip(order, layer_of):
+        unique[row] = layer
+    return [unique[tuple(row)] for row in rows]
+
+
+def pareto_layers(matrix=None):
+    """
+    Lapisan dominansi untuk semua framework:
+    ``[{'layer', 'framework_id', 'framework', 'values'}, ...]`` terurut
+    menurut lapisan lalu nama.
+    """
+    if matrix is None:
+        matrix = saw.load_matrix()
+    normalized = saw.normalize(matrix)
+    layers = dominance_layers(normalized)
+    result = [
+        {'layer': layer, 'framework_id': fid, 'framework': name, 'values': values}
+        for layer, fid, name, values in zip(layers, matrix.framework_ids, matrix.framework_names, matrix.values)
+    ]
+    result.sort(key=lambda d: (d['layer'], d['framework']))
+    return result
+
+
+def group_layers(items):
+    """[(layer, [item, ...]), ...] dari hasil pareto_layers."""
+    groups = []
+    for item in items:
+        if not groups or groups[-1][0] != item['layer']:
+            groups.append((item['layer'], []))
+        groups[-1][1].append(item)
+    return groups
@@ -0,0 +1,162 @@
+"""
+Profiling on-demand per request untuk user staff.
+
+Request diprofile hanya jika user staff mengirim header ``X-SPK-Profile`` atau
+query parameter ``_profile``. View dijalankan di bawah cProfile sekaligus
+sampler stack (mulai di ``process_view``, berhenti setelah response kembali ke
+middleware ini, jadi exception tetap melewati ``process_exception`` middleware
+lain), lalu hasilnya disimpan di ``SPK_PROFILE_DIR`` sebagai
+``<id>.pstats`` (untuk pstats/snakeviz), ``<id>.collapsed`` (untuk flamegraph)
+dan ``<id>.json`` (metadata). Request tanpa trigger tidak melewati kode ini
+selain satu pengecekan dict. View async tidak diprofile: cProfile dan sampler
+hanya mengikuti satu thread.
+"""
+import asyncio
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+PROFILE_HEADER = 'HTTP_X_SPK_PROFILE'
+PROFILE_PARAM = '_profile'
+PROFILE_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+PROFILE_FORMATS = {
+    'pstats': ('.pstats', 'application/octet-stream'),
+    'collapsed': ('.collapsed', 'text/plain; charset=utf-8'),
+}
+
+
+def profile_dir():
+    return str(getattr(settings, 'SPK_PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def profile_path(profile_id, fmt):
+    return os.path.join(profile_dir(), profile_id + PROFILE_FORMATS[fmt][0])
+
+
+class StackSampler(threading.Thread):
+    """Mengambil sampel stack satu thread secara berkala (format collapsed)."""
+
+    def __init__(self, thread_id, interval=0.001):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+def is_profiling_requested(request):
+    return PROFILE_HEADER in request.META or PROFILE_PARAM in request.GET
+
+
+class Capture:
+    """Satu capture profil untuk satu request, dari view dipanggil sampai response jadi."""
+
+    def __init__(self, request, view_func):
+        self.id = uuid.uuid4().hex
+        self.request = request
+        self.view_name = getattr(view_func, '__name__', str(view_func))
+        interval = getattr(settings, 'SPK_PROFILE_SAMPLE_INTERVAL', 0.001)
+        self.sampler = StackSampler(threading.get_ident(), interval)
+        self.profiler = cProfile.Profile()
+        self.started = None
+
+    def start(self):
+        self.sampler.start()
+        self.started = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        """Hentikan profiler dan simpan hasilnya."""
+        self.profiler.disable()
+        duration = time.perf_counter() - self.started
+        self.sampler.stop()
+
+        os.makedirs(profile_dir(), exist_ok=True)
+        self.profiler.dump_stats(profile_path(self.id, 'pstats'))
+        with open(profile_path(self.id, 'collapsed'), 'w', encoding='utf-8') as f:
+            f.write(self.sampler.collapsed())
+        with open(os.path.join(profile_dir(), self.id + '.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'id': self.id,
+                'path': self.request.get_full_path(),
+                'method': self.request.method,
+                'view': self.view_name,
+                'user': self.request.user.get_username(),
+                'duration': duration,
+                'samples': sum(self.sampler.stacks.values()),
+                'created': timezone.now().isoformat(),
+            }, f)
+
+
+def list_profiles():
+    """Metadata semua capture, terbaru lebih dulu."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    captures = []
+    for name in os.listdir(directory):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                captures.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    captures.sort(key=lambda c: c.get('created', ''), reverse=True)
+    return captures
+
+
+class ProfilingMiddleware:
+    """Letakkan setelah AuthenticationMiddleware agar ``request.user`` tersedia."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            capture = getattr(request, '_spk_profile', None)
+            if capture is not None:
+                del request._spk_profile
+                capture.stop()
+        if capture is not None:
+            response['X-SPK-Profile-Id'] = capture.id
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Tidak mengembalikan response: view dan middleware lain tetap berjalan normal
+        if not is_profiling_requested(request) or asyncio.iscoroutinefunction(view_func):
+            return None
+        if not request.user.is_staff:
+            return None
+        request._spk_profile = Capture(request, view_func)
+        request._spk_profile.start()
+        return None
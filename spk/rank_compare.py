@@ -0,0 +1,110 @@
+"""
+Perbandingan dua ranking: Kendall tau, Spearman rho, framework yang paling
+banyak berpindah dan irisan top-k.
+
+Kendall tau dihitung dari jumlah inversi lewat merge sort (O(n log n)),
+bukan dengan membandingkan semua pasangan, sehingga ranking 100k framework
+tetap bisa dibandingkan secara interaktif.
+"""
+
+
+def count_inversions(sequence):
+    """Jumlah pasangan i < j dengan sequence[i] > sequence[j] (merge sort bottom-up)."""
+    items = list(sequence)
+    n = len(items)
+    buffer = [None] * n
+    inversions = 0
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                if items[i] <= items[j]:
+                    buffer[k] = items[i]
+                    i += 1
+                else:
+                    buffer[k] = items[j]
+                    inversions += mid - i
+                    j += 1
+                k += 1
+            buffer[k:k + mid - i] = items[i:mid]
+            k += mid - i
+            buffer[k:k + hi - j] = items[j:hi]
+        items, buffer = buffer, items
+        width *= 2
+    return inversions
+
+
+def kendall_tau(a, b):
+    """Kendall tau-a untuk dua list rank tanpa seri yang sejajar."""
+    n = len(a)
+    if n < 2:
+        return None
+    by_a = [rank_b for _, rank_b in sorted(zip(a, b))]
+    pairs = n * (n - 1) // 2
+    return 1 - 2 * count_inversions(by_a) / pairs
+
+
+def spearman_rho(a, b):
+    n = len(a)
+    if n < 2:
+        return None
+    d2 = sum((x - y) ** 2 for x, y in zip(a, b))
+    return 1 - 6 * d2 / (n * (n * n - 1))
+
+
+def _rerank(positions, ids):
+    # Rank ulang 1..n di dalam framework yang ada di kedua ranking
+    order = sorted(ids, key=positions.__getitem__)
+    return {fid: rank for rank, fid in enumerate(order, start=1)}
+
+
+def compare_rankings(ranking_a, ranking_b, k=10, movers=10):
+    """
+    ``ranking_a``/``ranking_b``: list dict dengan ``framework_id``,
+    ``framework`` dan ``rank`` (format ``saw.rank``). Pada ``movers``,
+    ``change`` positif berarti framework naik peringkat di ranking b.
+    """
+    positions_a = {item['framework_id']: item['rank'] for item in ranking_a}
+    positions_b = {item['framework_id']: item['rank'] for item in ranking_b}
+    names = {item['framework_id']: item['framework'] for item in ranking_b}
+    names.update((item['framework_id'], item['framework']) for item in ranking_a)
+
+    common = [fid for fid in positions_a if fid in positions_b]
+    rerank_a = _rerank(positions_a, common)
+    rerank_b = _rerank(positions_b, common)
+    a = [rerank_a[fid] for fid in common]
+    b = [rerank_b[fid] for fid in common]
+
+    deltas = sorted(
+        ((positions_a[fid] - positions_b[fid], fid) for fid in common),
+        key=lambda d: (-abs(d[0]), positions_a[d[1]]),
+    )
+    top_a = {item['framework_id'] for item in ranking_a if item['rank'] <= k}
+    top_b = {item['framework_id'] for item in ranking_b if item['rank'] <= k}
+    top_n = min(k, len(ranking_a), len(ranking_b))
+
+    return {
+        'compared': len(common),
+        'only_in_a': len(positions_a) - len(common),
+        'only_in_b': len(positions_b) - len(common),
+        'kendall_tau': kendall_tau(a, b),
+        'spearman_rho': spearman_rho(a, b),
+        'top_k': k,
+        # Ranking lebih pendek dari k: dua ranking identik tetap bernilai 1.0
+        'top_k_overlap': len(top_a & top_b) / top_n if top_n else None,
+        'entered_top_k': sorted((names[fid] for fid in top_b - top_a)),
+        'left_top_k': sorted((names[fid] for fid in top_a - top_b)),
+        'movers': [
+            {
+                'framework_id': fid,
+                'framework': names[fid],
+                'rank_a': positions_a[fid],
+                'rank_b': positions_b[fid],
+                'change': delta,
+            }
+            for delta, fid in deltas[:movers] if delta
+        ],
+    }
@@ -0,0 +1,95 @@
+"""
+Routing database primary/replica untuk view SAW yang berat di baca.
+
+- Query tulis selalu ke ``default`` (primary).
+- Query baca model app ``spk`` diarahkan ke salah satu alias di
+  ``SPK_DB_REPLICAS`` hanya selama request ke view yang ditandai
+  ``@replica_reads`` dan hanya untuk method aman (GET/HEAD).
+- Setelah sebuah session menulis, session itu di-"pin" ke primary selama
+  ``SPK_REPLICA_PIN_SECONDS`` agar user langsung melihat perubahannya sendiri
+  (read-after-write) walaupun replica masih tertinggal.
+- Session dan auth tidak pernah dibaca dari replica.
+"""
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+PIN_SESSION_KEY = '_spk_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = contextvars.ContextVar('spk_use_replica', default=False)
+_wrote = contextvars.ContextVar('spk_wrote', default=False)
+
+
+def replicas():
+    return list(getattr(settings, 'SPK_DB_REPLICAS', []))
+
+
+def replica_active():
+    return _use_replica.get() and bool(replicas())
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Aktifkan (atau matikan) baca dari replica di dalam blok ini."""
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def replica_reads(view_func):
+    """Tandai view read-only yang boleh membaca dari replica."""
+    view_func.use_replica = True
+    return view_func
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label != 'spk' or not _use_replica.get():
+            return None
+        aliases = replicas()
+        return random.choice(aliases) if aliases else None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == 'spk':
+            _wrote.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary dan replica berisi data yang sama
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Letakkan setelah SessionMiddleware dan AuthenticationMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replica_token = _use_replica.set(False)
+        wrote_token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if (_wrote.get() or request.method not in SAFE_METHODS) and hasattr(request, 'session'):
+                pin = getattr(settings, 'SPK_REPLICA_PIN_SECONDS', 5)
+                request.session[PIN_SESSION_KEY] = time.time() + pin
+            return response
+        finally:
+            _wrote.reset(wrote_token)
+            _use_replica.reset(replica_token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(view_func, 'use_replica', False) or request.method not in SAFE_METHODS:
+            return None
+        session = getattr(request, 'session', None)
+        if session is not None and session.get(PIN_SESSION_KEY, 0) > time.time():
+            return None
+        if replicas():
+            _use_replica.set(True)
+        return None
@@ -0,0 +1,274 @@
+"""
+Engine perhitungan SAW (Simple Additive Weighting).
+
+Matriks keputusan X dimuat dalam satu query, lalu normalisasi dan skor
+dihitung per kolom kriteria. View hanya menerima hasil yang sudah siap
+ditampilkan.
+"""
+import hashlib
+import json
+import time
+
+from . import metrics as spk_metrics
+from .caching import cached, cached_rows, get_data_version
+from .models import Criteria, Framework, FrameworkScore
+
+MEDALS = {1: '🥇', 2: '🥈', 3: '🥉'}
+RANK_BADGES = {1: 'bg-warning fs-6', 2: 'bg-secondary fs-6', 3: 'bg-info fs-6'}
+PROGRESS_BARS = {1: 'success', 2: 'info'}
+# Baris per potongan cache untuk matriks X/R/kontribusi (lihat matrix_page)
+MATRIX_CHUNK_ROWS = 500
+
+
+class DecisionMatrix:
+    """
+    Matriks keputusan: ``values[i][j]`` adalah nilai framework ke-i pada
+    kriteria ke-j (NULL/kosong dianggap 0.0).
+    """
+
+    def __init__(self, criteria, framework_ids, framework_names, values):
+        self.criteria = criteria
+        self.framework_ids = framework_ids
+        self.framework_names = framework_names
+        self.values = values
+
+    @property
+    def shape(self):
+        return len(self.framework_ids), len(self.criteria)
+
+    def columns(self):
+        return [list(col) for col in zip(*self.values)] if self.values else [[] for _ in self.criteria]
+
+
+def load_matrix(criteria_list=None):
+    """Bangun matriks X dari database: satu query untuk semua skor."""
+    if criteria_list is None:
+        criteria_list = list(Criteria.objects.all())
+    frameworks = list(Framework.objects.order_by('id').values_list('id', 'name'))
+
+    row_index = {fid: i for i, (fid, _) in enumerate(frameworks)}
+    col_index = {c.id: j for j, c in enumerate(criteria_list)}
+    values = [[0.0] * len(criteria_list) for _ in frameworks]
+
+    scores = FrameworkScore.objects.filter(value__isnull=False).values_list(
+        'framework_id', 'criteria_id', 'value'
+    )
+    for framework_id, criteria_id, value in scores.iterator(chunk_size=5000):
+        j = col_index.get(criteria_id)
+        if j is not None:
+            values[row_index[framework_id]][j] = value
+
+    return DecisionMatrix(
+        criteria_list,
+        [fid for fid, _ in frameworks],
+        [name for _, name in frameworks],
+        values,
+    )
+
+
+def column_bounds(matrix, skip_empty=False):
+    """
+    max/min per kriteria; kolom nol semua diberi max=1 agar tidak div/0.
+    Sel kosong dihitung 0 dan ikut ke min kriteria cost (perilaku ranking
+    SAW). ``skip_empty`` menghitung min cost dari sel terisi > 0 saja, dipakai
+    registry MCDM dan bobot objektif agar sel kosong tidak menolkan kolom.
+    """
+    max_vals = []
+    min_vals = []
+    for col in matrix.columns():
+        top = max(col, default=0)
+        max_vals.append(top if top > 0 else 1)
+        if skip_empty:
+            col = [x for x in col if x > 0]
+        min_vals.append(min(col, default=0))
+    return max_vals, min_vals
+
+
+def normalize(matrix, skip_empty=False):
+    """Matriks R: benefit x / max, cost min / x (0 jika x kosong/0)."""
+    max_vals, min_vals = column_bounds(matrix, skip_empty)
+    normalized_cols = []
+    for c, col, top, low in zip(matrix.criteria, matrix.columns(), max_vals, min_vals):
+        if c.attribute == 'benefit':
+            normalized_cols.append([x / top for x in col])
+        else:
+            normalized_cols.append([low / x if x > 0 else 0 for x in col])
+    return [list(row) for row in zip(*normalized_cols)] if normalized_cols else [[] for _ in matrix.values]
+
+
+class Evaluation:
+    """
+    Hasil satu kali evaluasi SAW: matriks X, R, kontribusi terbobot
+    (``weighted[i][j] = w_j * r_ij``) dan skor V, semuanya dalam urutan
+    baris ``matrix.framework_ids``.
+    """
+
+    def __init__(self, matrix, weights, normalized, weighted, scores):
+        self.matrix = matrix
+        self.weights = weights
+        self.normalized = normalized
+        self.weighted = weighted
+        self.scores = scores
+
+    def matrices(self):
+        return {
+            'decision': self.matrix.values,
+            'normalized': self.normalized,
+            'weighted': self.weighted,
+        }
+
+
+def weighted_matrix(normalized, weights):
+    """Kontribusi terbobot ``w_j * r_ij``."""
+    return [[r * w for r, w in zip(row, weights)] for row in normalized]
+
+
+def evaluate(matrix, weights=None, normalized=None):
+    """Hitung R (jika belum ada), kontribusi dan V dalam satu lintasan."""
+    started = time.perf_counter()
+    if weights is None:
+        weights = [c.weight for c in matrix.criteria]
+    if normalized is None:
+        normalized = normalize(matrix)
+    weighted = weighted_matrix(normalized, weights)
+    values = [sum(row) for row in weighted]
+
+    spk_metrics.ranking_seconds.observe(time.perf_counter() - started)
+    spk_metrics.ranking_total.inc()
+    spk_metrics.matrix_frameworks.set(matrix.shape[0])
+    spk_metrics.matrix_criteria.set(matrix.shape[1])
+    return Evaluation(matrix, weights, normalized, weighted, values)
+
+
+def scores(matrix, weights=None):
+    """Nilai preferensi V = sum(w_j * r_ij) untuk setiap framework."""
+    return evaluate(matrix, weights).scores
+
+
+def rank(evaluation):
+    """Ranking framework (skor menurun) dalam bentuk list of dict."""
+    matrix = evaluation.matrix
+    ranking = [
+        {
+            'framework_id': fid,
+            'framework': name,
+            'score': score,
+            'score_display': round(score, 6),
+            'percentage': round(score * 100, 2),
+        }
+        for fid, name, score in zip(matrix.framework_ids, matrix.framework_names, evaluation.scores)
+    ]
+    ranking.sort(key=lambda d: d['score'], reverse=True)
+    for idx, item in enumerate(ranking, start=1):
+        item['rank'] = idx
+        item['medal'] = MEDALS.get(idx, '')
+    return ranking
+
+
+def weights_key(criteria_list, weights):
+    """Hash pendek vektor bobot (beserta id dan atribut kriteria)."""
+    raw = json.dumps([[c.id, c.attribute, float(w)] for c, w in zip(criteria_list, weights)])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def shared_matrix(criteria_list=None, data_version=None):
+    """
+    Matriks X dan R untuk satu data version; dipakai bersama semua vektor bobot.
+    Disimpan per potongan baris (lihat ``caching.cached_rows``).
+    """
+    if criteria_list is None:
+        criteria_list = list(Criteria.objects.all())
+
+    def compute():
+        matrix = load_matrix(criteria_list)
+        return list(zip(matrix.framework_ids, matrix.framework_names, matrix.values, normalize(matrix)))
+
+    rows, _ = cached_rows('saw-matrix', 0, None, compute, MATRIX_CHUNK_ROWS, version=data_version)
+    matrix = DecisionMatrix(
+        criteria_list, [row[0] for row in rows], [row[1] for row in rows], [row[2] for row in rows]
+    )
+    return {'matrix': matrix, 'normalized': [row[3] for row in rows]}
+
+
+def cached_result(criteria_list, weights=None, data_version=None):
+    """
+    Ranking untuk ``weights`` (default: bobot global). Di-cache per (hash
+    bobot, data version) sehingga user dengan profil bobot yang sama memakai
+    satu hasil perhitungan. Matriks penjelasan tidak ikut di sini: ambil per
+    halaman dengan ``matrix_page``.
+    """
+    if weights is None:
+        weights = [c.weight for c in criteria_list]
+    if data_version is None:
+        data_version = get_data_version()
+    key = weights_key(criteria_list, weights)
+    shared = shared_matrix(criteria_list, data_version)
+
+    def compute():
+        evaluation = evaluate(shared['matrix'], weights, normalized=shared['normalized'])
+        ranking = rank(evaluation)
+        return {'ranking': ranking}
+
+    result = cached(f'saw-result:{key}', compute, version=data_version)
+    return dict(result, key=key)
+
+
+def matrix_page(criteria_list, kind, offset, limit, weights=None, data_version=None):
+    """
+    Potongan matriks ``kind`` ('decision', 'normalized' atau 'weighted') siap
+    tampil, dalam urutan id framework: ([(framework, ['0.123', ...]), ...], total).
+
+    Matriks disimpan di cache per ``MATRIX_CHUNK_ROWS`` baris; satu halaman
+    hanya membaca potongan yang dibutuhkan, bukan seluruh matriks.
+    """
+    if weights is None:
+        weights = [c.weight for c in criteria_list]
+    if data_version is None:
+        data_version = get_data_version()
+    name = f'saw-rows:{kind}'
+    if kind == 'weighted':
+        name += ':' + weights_key(criteria_list, weights)
+
+    def compute():
+        shared = shared_matrix(criteria_list, data_version)
+        if kind == 'decision':
+            values = shared['matrix'].values
+        elif kind == 'normalized':
+            values = shared['normalized']
+        else:
+            values = weighted_matrix(shared['normalized'], weights)
+        return list(zip(shared['matrix'].framework_names, values))
+
+    rows, total = cached_rows(name, offset, offset + limit, compute, MATRIX_CHUNK_ROWS, version=data_version)
+    return matrix_rows([framework for framework, _ in rows], [values for _, values in rows]), total
+
+
+def matrix_rows(names, values, offset=0, limit=None):
+    """Potongan matriks siap tampil: [(framework, ['0.123', ...]), ...]"""
+    stop = None if limit is None else offset + limit
+    return [
+        (name, [f'{v:.3f}' for v in row])
+        for name, row in zip(names[offset:stop], values[offset:stop])
+    ]
+
+
+def ranking_rows(ranking):
+    """
+    Baris tabel ranking siap tampil:
+    (rank, label, badge_class, row_class, framework, score, percent, bar_class)
+    """
+    rows = []
+    for item in ranking:
+        idx = item['rank']
+        label = f"{item['medal']} #{idx}" if item['medal'] else f'#{idx}'
+        rows.append((
+            idx,
+            label,
+            RANK_BADGES.get(idx, 'bg-light text-dark'),
+            'table-success' if idx == 1 else '',
+            item['framework'],
+            item['score'],
+            f"{item['score'] * 100:.1f}",
+            PROGRESS_BARS.get(idx, 'secondary'),
+        ))
+    return rows
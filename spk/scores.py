@@ -0,0 +1,103 @@
+"""
+Penulisan FrameworkScore (dan RaterScore) secara batch.
+
+Semua perubahan ditulis sebagai satu upsert (INSERT ... ON CONFLICT/ON
+DUPLICATE KEY UPDATE) per batch di dalam satu transaksi, menggantikan
+``update_or_create`` per sel yang masing-masing autocommit.
+"""
+import math
+
+from django.db import connections, router, transaction
+
+from . import history
+from .caching import bump_data_version
+from .models import FrameworkScore, RaterScore
+
+# Normalisasi SAW (benefit x/max, cost min/x) hanya bermakna untuk x >= 0
+MIN_SCORE = 0.0
+
+
+def parse_score(value):
+    """Nilai sel dari input user: None untuk sel kosong; ValueError berisi pesan bila tidak valid."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, bool):
+        raise ValueError('Nilai harus berupa angka.')
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        raise ValueError('Nilai harus berupa angka.') from None
+    if not math.isfinite(score):
+        raise ValueError('Nilai harus berupa angka hingga.')
+    if score < MIN_SCORE:
+        raise ValueError('Nilai tidak boleh negatif.')
+    return score
+
+
+def _conflict_options(model, unique_fields):
+    options = {'update_conflicts': True, 'update_fields': ['value']}
+    # MySQL (ON DUPLICATE KEY UPDATE) tidak menerima target konflik; unique_together
+    # yang sama tetap dipakai sebagai kunci duplikat oleh database
+    if connections[router.db_for_write(model)].features.supports_update_conflicts_with_target:
+        options['unique_fields'] = unique_fields
+    return options
+
+
+def _upsert(model, objs, unique_fields, batch_size, log=None):
+    with transaction.atomic():
+        if log is not None:
+            log(batch_size)
+        model.objects.bulk_create(objs, batch_size=batch_size, **_conflict_options(model, unique_fields))
+        # bulk_create tidak mengirim signal post_save
+        bump_data_version()
+    return len(objs)
+
+
+def _latest(cells):
+    latest = {}
+    for framework_id, criteria_id, value in cells:
+        latest[(framework_id, criteria_id)] = value
+    return latest
+
+
+def upsert_scores(cells, batch_size=1000):
+    """
+    Tulis ``cells`` berupa iterable (framework_id, criteria_id, value).
+    Sel yang sama muncul lebih dari sekali memakai nilai terakhir.
+    Mengembalikan jumlah sel yang ditulis.
+    """
+    latest = _latest(cells)
+    if not latest:
+        return 0
+    objs = [
+        FrameworkScore(framework_id=framework_id, criteria_id=criteria_id, value=value)
+        for (framework_id, criteria_id), value in latest.items()
+    ]
+    cells = [(fid, cid, value) for (fid, cid), value in latest.items()]
+    return _upsert(FrameworkScore, objs, ['framework', 'criteria'], batch_size,
+                   log=lambda size: history.record_scores(cells, size))
+
+
+def upsert_rater_scores(rater_id, cells, batch_size=1000):
+    """Seperti ``upsert_scores`` tetapi untuk skor milik satu rater."""
+    latest = _latest(cells)
+    if not latest:
+        return 0
+    objs = [
+        RaterScore(rater_id=rater_id, framework_id=framework_id, criteria_id=criteria_id, value=value)
+        for (framework_id, criteria_id), value in latest.items()
+    ]
+    return _upsert(RaterScore, objs, ['rater', 'framework', 'criteria'], batch_size)
+
+
+def dirty_cells(changes, existing):
+    """
+    Saring ``changes`` {(framework_id, criteria_id): value} terhadap nilai
+    tersimpan ``existing`` dan kembalikan hanya sel yang benar-benar berubah.
+    """
+    missing = object()
+    return [
+        (framework_id, criteria_id, value)
+        for (framework_id, criteria_id), value in changes.items()
+        if existing.get((framework_id, criteria_id), missing) != value
+    ]
@@ -0,0 +1,65 @@
+"""
+Receiver yang menaikkan data version setiap kali data SAW berubah.
+
+post_delete sengaja tidak dipasang pada FrameworkScore dan RaterScore: receiver delete membuat
+Django memuat setiap baris sebelum menghapus (tidak bisa fast-delete), padahal
+skor paling sering terhapus lewat cascade dari Criteria/Framework. Kode yang
+menghapus FrameworkScore langsung atau memakai bulk_create/update harus
+memanggil ``bump_data_version()`` sendiri, dan mencatat perubahannya lewat
+``spk.history`` (``record_scores``/``record_reset``). Penulisan massal dibungkus
+``caching.bump_once()`` agar receiver ini hanya menghasilkan satu kenaikan versi.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import history, warmup
+from .auth_backends import invalidate_user
+from .caching import bump_data_version, data_version_changed
+from .models import Criteria, Framework, FrameworkScore, RaterScore
+
+
+@receiver(post_save, sender=Criteria)
+@receiver(post_save, sender=Framework)
+@receiver(post_save, sender=FrameworkScore)
+@receiver(post_save, sender=RaterScore)
+@receiver(post_delete, sender=Criteria)
+@receiver(post_delete, sender=Framework)
+def data_changed(sender, **kwargs):
+    bump_data_version()
+
+
+@receiver(data_version_changed)
+def schedule_warmup(sender, **kwargs):
+    warmup.scheduler.schedule()
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Criteria)
+def criteria_logged(sender, instance, **kwargs):
+    history.record_criteria(instance)
+
+
+@receiver(post_delete, sender=Criteria)
+def criteria_delete_logged(sender, instance, **kwargs):
+    history.record_criteria(instance, deleted=True)
+
+
+@receiver(post_save, sender=Framework)
+def framework_logged(sender, instance, **kwargs):
+    history.record_framework(instance)
+
+
+@receiver(post_delete, sender=Framework)
+def framework_delete_logged(sender, instance, **kwargs):
+    history.record_framework(instance, deleted=True)
+
+
+@receiver(post_save, sender=FrameworkScore)
+def score_logged(sender, instance, **kwargs):
+    history.record_score(instance)
@@ -0,0 +1,140 @@
+"""
+Pencarian framework pengganti terdekat di ruang kriteria ternormalisasi.
+
+Jarak antar framework adalah jarak Euclidean berbobot pada matriks R:
+``d(a, b) = sqrt(sum w_j * (r_aj - r_bj)^2)``. Dengan menskalakan setiap
+kolom dengan ``sqrt(w_j)`` jarak ini menjadi Euclidean biasa sehingga bisa
+dilayani KD-tree. Struktur tree (hanya index baris, kecil) disimpan di cache
+bersama per data version dan dibangun oleh warm-up setelah data berubah
+(lihat ``spk.warmup``); titik-titiknya diambil dari ``saw.shared_matrix``.
+Setiap proses menyimpan index di memori sehingga query berikutnya hanya
+menelusuri tree.
+"""
+import heapq
+import math
+import threading
+
+from . import saw
+from .caching import cached, get_data_version
+from .models import Criteria
+
+LEAF_SIZE = 16
+
+
+class KDTree:
+    """KD-tree sederhana dengan leaf berisi beberapa titik (dipindai linear)."""
+
+    def __init__(self, points, leaf_size=LEAF_SIZE, root=None):
+        self.points = points
+        self.leaf_size = leaf_size
+        # ``root`` dari tree yang sudah dibangun untuk titik yang sama (mis. dari cache)
+        self.root = root if root is not None else self._build(list(range(len(points))))
+
+    def _build(self, indices):
+        if len(indices) <= self.leaf_size:
+            return (None, None, indices, None)
+        points = self.points
+        # Pisah pada sumbu dengan sebaran terbesar
+        spreads = [
+            max(points[i][axis] for i in indices) - min(points[i][axis] for i in indices)
+            for axis in range(len(points[indices[0]]))
+        ]
+        axis = max(range(len(spreads)), key=spreads.__getitem__)
+        if spreads[axis] == 0:
+            return (None, None, indices, None)
+        indices.sort(key=lambda i: points[i][axis])
+        mid = len(indices) // 2
+        return (axis, points[indices[mid]][axis], self._build(indices[:mid]), self._build(indices[mid:]))
+
+    def query(self, point, k, exclude=None):
+        """k tetangga terdekat: [(jarak, index), ...] terurut menaik."""
+        heap = []  # max-heap (-jarak, index)
+        points = self.points
+        dist = math.dist
+
+        def visit(node):
+            axis, split, left, right = node
+            if axis is None:
+                for i in left:
+                    if i == exclude:
+                        continue
+                    d = dist(point, points[i])
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d, i))
+                    elif d < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d, i))
+                return
+            diff = point[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(heap) < k or abs(diff) < -heap[0][0]:
+                visit(far)
+
+        if k > 0:
+            visit(self.root)
+        return sorted((-d, i) for d, i in heap)
+
+
+class SimilarityIndex:
+    def __init__(self, version, matrix, weights, normalized=None, root=None):
+        self.version = version
+        self.framework_ids = matrix.framework_ids
+        self.framework_names = matrix.framework_names
+        self.row_index = {fid: i for i, fid in enumerate(matrix.framework_ids)}
+        if normalized is None:
+            normalized = saw.normalize(matrix)
+        scale = [math.sqrt(max(w, 0)) for w in weights]
+        points = [tuple(r * s for r, s in zip(row, scale)) for row in normalized]
+        self.points = points
+        self.tree = KDTree(points, root=root)
+
+    @classmethod
+    def build(cls, version, criteria_list=None):
+        """Index untuk ``version``; tree diambil dari cache bersama bila sudah ada."""
+        if criteria_list is None:
+            criteria_list = list(Criteria.objects.all())
+        weights = [c.weight for c in criteria_list]
+        shared = saw.shared_matrix(criteria_list, version)
+        index = None
+
+        def build_tree():
+            nonlocal index
+            index = cls(version, shared['matrix'], weights, shared['normalized'])
+            return index.tree.root
+
+        root = cached(f'similarity-tree:{saw.weights_key(criteria_list, weights)}', build_tree, version=version)
+        if index is None:
+            index = cls(version, shared['matrix'], weights, shared['normalized'], root=root)
+        return index
+
+    def neighbours(self, framework_id, k=5):
+        """
+        ``[{'framework_id', 'framework', 'distance'}, ...]`` atau None jika
+        framework tidak ada di index.
+        """
+        i = self.row_index.get(framework_id)
+        if i is None:
+            return None
+        return [
+            {'framework_id': self.framework_ids[j], 'framework': self.framework_names[j], 'distance': distance}
+            for distance, j in self.tree.query(self.points[i], k, exclude=i)
+        ]
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def get_index(version=None):
+    """Index untuk data version saat ini; dibangun ulang hanya jika versi berubah."""
+    global _index
+    if version is None:
+        version = get_data_version()
+    with _lock:
+        index = _index
+    if index is not None and index.version == version:
+        return index
+    index = SimilarityIndex.build(version)
+    with _lock:
+        _index = index
+    return index
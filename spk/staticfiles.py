@@ -0,0 +1,192 @@
+"""
+Pipeline static: nama file ber-hash, varian terkompresi dan handler ringan.
+
+``CompressedManifestStaticFilesStorage`` dipakai oleh ``collectstatic``:
+selain menyalin file dengan nama ber-hash (``styles.3f2a9c1e.css``, lewat
+``ManifestStaticFilesStorage``), file teks juga ditulis ulang sebagai ``.gz``
+dan ``.br`` (brotli, jika paket ``brotli`` terpasang) bila hasilnya lebih kecil.
+
+``StaticFilesMiddleware`` melayani isi ``STATIC_ROOT`` langsung dari Django
+tanpa web server terpisah. Index file dibangun sekali per proses; varian
+dipilih dari header Accept-Encoding dengan ``Content-Encoding`` yang sesuai,
+dan file ber-hash (tercantum di manifest) dikirim dengan cache
+``immutable`` satu tahun. File lain mendapat ``SPK_STATIC_MAX_AGE`` detik.
+"""
+import gzip
+import mimetypes
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse, HttpResponseNotModified
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.map', '.xml', '.ico'}
+# File sangat kecil tidak sepadan dikompresi (overhead header > penghematan)
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Urutan preferensi: (token Accept-Encoding, sufiks file)
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def _compress_variants(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return []
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Tanpa collectstatic (test, dev dengan DEBUG off) halaman tetap bisa dirender
+    # dengan URL tanpa hash, bukan ValueError "Missing staticfiles manifest entry"
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # File belum dikumpulkan ke STATIC_ROOT: hash tidak bisa dihitung
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = []
+        for name, hashed_name, was_processed in super().post_process(paths, dry_run, **options):
+            processed.append((name, hashed_name))
+            yield name, hashed_name, was_processed
+        if dry_run:
+            return
+        for name, hashed_name in processed:
+            # Kompres file asli dan versi ber-hash (template lama bisa masih merujuk nama asli)
+            for stored in {name, hashed_name}:
+                if isinstance(stored, str) and os.path.splitext(stored)[1] in COMPRESSIBLE_EXTENSIONS and self.exists(stored):
+                    _compress_variants(self.path(stored))
+
+
+class StaticFile:
+    def __init__(self, path, immutable):
+        stat = os.stat(path)
+        self.path = path
+        self.immutable = immutable
+        self.size = stat.st_size
+        self.mtime = int(stat.st_mtime)
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.etag = f'"{self.mtime:x}-{self.size:x}"'
+        self.variants = {
+            token: path + suffix
+            for token, suffix in ENCODINGS
+            if os.path.isfile(path + suffix)
+        }
+
+
+def build_index(root, storage=None):
+    """{path URL relatif: StaticFile} untuk semua file di ``root`` (tanpa varian .gz/.br)."""
+    storage = storage or CompressedManifestStaticFilesStorage(location=root)
+    hashed = set(storage.hashed_files.values())
+    index = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(('.gz', '.br')) and os.path.isfile(os.path.join(dirpath, filename[:-3])):
+                continue
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            index[name] = StaticFile(path, name in hashed)
+    return index
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        token, _, params = part.partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_modified_since:
+        try:
+            return int(parsedate_to_datetime(if_modified_since).timestamp()) >= mtime
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class StaticFilesMiddleware:
+    """Letakkan tepat setelah SecurityMiddleware agar request static tidak melewati session/auth."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else '/' + settings.STATIC_URL
+        self.root = settings.STATIC_ROOT
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = build_index(self.root) if self.root and os.path.isdir(self.root) else {}
+        return self._index
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            static_file = self.index.get(request.path_info[len(self.prefix):])
+            if static_file is not None:
+                return self.serve(request, static_file)
+        return self.get_response(request)
+
+    def serve(self, request, static_file):
+        accepted = _accepted_encodings(request)
+        path, encoding = static_file.path, None
+        for token, _ in ENCODINGS:
+            if token in accepted and token in static_file.variants:
+                path, encoding = static_file.variants[token], token
+                break
+        # ETag per representasi: varian terkompresi berbeda isi dengan aslinya
+        etag = static_file.etag[:-1] + (f'-{encoding}"' if encoding else '"')
+
+        if _not_modified(request, etag, static_file.mtime):
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=static_file.content_type)
+            # FileResponse menambahkan nama file (.gz/.br); aset tidak perlu Content-Disposition
+            del response['Content-Disposition']
+            if encoding:
+                response['Content-Encoding'] = encoding
+            response['Last-Modified'] = formatdate(static_file.mtime, usegmt=True)
+        response['ETag'] = etag
+        if static_file.immutable:
+            response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = f"public, max-age={getattr(settings, 'SPK_STATIC_MAX_AGE', 60)}"
+        if static_file.variants:
+            response['Vary'] = 'Accept-Encoding'
+        return response
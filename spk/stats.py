@@ -0,0 +1,57 @@
+"""
+Statistik ringkas untuk dashboard, dihitung dalam satu query agregat.
+"""
+from django.db.models import Count, F, Func, IntegerField, Q, Subquery
+
+from .caching import cached
+from .models import Criteria, Framework
+
+
+def compute_dashboard_stats():
+    framework_count = Subquery(
+        Framework.objects.order_by().values(c=Func(F('id'), function='COUNT'))[:1],
+        output_field=IntegerField(),
+    )
+    # Satu baris per kriteria: jumlah skor terisi + total framework (subquery skalar)
+    rows = list(
+        Criteria.objects
+        .order_by('id')
+        .annotate(
+            scored=Count('frameworkscore', filter=Q(frameworkscore__value__isnull=False)),
+            total_frameworks=framework_count,
+        )
+        .values('id', 'name', 'weight', 'attribute', 'scored', 'total_frameworks')
+    )
+
+    if rows:
+        total_frameworks = rows[0]['total_frameworks']
+    else:
+        total_frameworks = Framework.objects.count()
+    total_weight = sum(r['weight'] for r in rows)
+    total_scores = sum(r['scored'] for r in rows)
+
+    coverage = [
+        {
+            'name': r['name'],
+            'attribute': r['attribute'],
+            'weight': r['weight'],
+            'scored': r['scored'],
+            'coverage': r['scored'] / total_frameworks if total_frameworks else 0.0,
+        }
+        for r in rows
+    ]
+    expected = total_frameworks * len(rows)
+
+    return {
+        'total_frameworks': total_frameworks,
+        'total_criteria': len(rows),
+        'total_weight': total_weight,
+        'total_scores': total_scores,
+        'overall_coverage': total_scores / expected if expected else 0.0,
+        'criteria_coverage': coverage,
+        'is_ready_to_calculate': abs(total_weight - 1.0) < 0.001 and total_frameworks > 0,
+    }
+
+
+def dashboard_stats():
+    return cached('dashboard-stats', compute_dashboard_stats)
@@ -0,0 +1,169 @@
+"""
+SAW dua lintasan (out-of-core) untuk katalog yang terlalu besar untuk memori.
+
+1. Lintasan pertama: max/min per kriteria dari agregat database
+   (``MAX``/``MIN``/``COUNT`` per kriteria). Framework tanpa skor dihitung
+   sebagai 0 seperti pada ``saw.load_matrix``, jadi kolom yang tidak lengkap
+   ikut memasukkan 0 ke batas max/min. Dengan ``skip_empty`` min cost
+   diambil dari sel terisi > 0 saja (aturan registry MCDM dan bobot objektif).
+2. Lintasan kedua: framework dibaca per chunk (keyset pada ``id``) beserta
+   skornya, dinilai, lalu hanya top-k yang disimpan di heap berukuran tetap.
+   Opsional, semua skor ditulis ke disk sebagai run terurut per chunk dan
+   digabung (merge) menjadi satu file ranking lengkap.
+
+Puncak memori ditentukan oleh ``chunk_size`` dan ``k``, bukan ukuran katalog.
+"""
+import csv
+import heapq
+import os
+import tempfile
+import time
+
+from django.db.models import Count, Max, Min, Q
+
+from . import metrics as spk_metrics
+from .models import Criteria, Framework, FrameworkScore
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def column_bounds(criteria_list, skip_empty=False):
+    """max/min per kriteria dengan aturan yang sama seperti ``saw.column_bounds``."""
+    n_frameworks = Framework.objects.count()
+    low = Min('value', filter=Q(value__gt=0)) if skip_empty else Min('value')
+    aggregates = {
+        row['criteria_id']: row
+        for row in FrameworkScore.objects.filter(value__isnull=False)
+        .values('criteria_id')
+        .annotate(top=Max('value'), low=low, n=Count('value'))
+    }
+    max_vals = []
+    min_vals = []
+    for c in criteria_list:
+        row = aggregates.get(c.id)
+        if row is None:
+            top = low = 0
+        else:
+            top, low = row['top'], row['low']
+            if row['n'] < n_frameworks:
+                # Ada sel kosong yang dihitung 0
+                top = max(top, 0)
+                if not skip_empty:
+                    low = min(low, 0)
+        max_vals.append(top if top > 0 else 1)
+        min_vals.append((low or 0) if n_frameworks else 0)
+    return max_vals, min_vals
+
+
+def iter_chunks(criteria_list, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Hasilkan list (framework_id, name, [x_j ...]) per chunk, urut id."""
+    col_index = {c.id: j for j, c in enumerate(criteria_list)}
+    last_id = None
+    while True:
+        frameworks = Framework.objects.order_by('id')
+        if last_id is not None:
+            frameworks = frameworks.filter(id__gt=last_id)
+        frameworks = list(frameworks.values_list('id', 'name')[:chunk_size])
+        if not frameworks:
+            return
+        first_id, last_id = frameworks[0][0], frameworks[-1][0]
+        rows = {fid: [0.0] * len(criteria_list) for fid, _ in frameworks}
+        scores = FrameworkScore.objects.filter(
+            framework_id__gte=first_id, framework_id__lte=last_id, value__isnull=False
+        ).values_list('framework_id', 'criteria_id', 'value')
+        for framework_id, criteria_id, value in scores.iterator(chunk_size=chunk_size):
+            j = col_index.get(criteria_id)
+            if j is not None:
+                rows[framework_id][j] = value
+        yield [(fid, name, rows[fid]) for fid, name in frameworks]
+
+
+def _score(values, benefit, weights, max_vals, min_vals):
+    total = 0.0
+    for x, is_benefit, w, top, low in zip(values, benefit, weights, max_vals, min_vals):
+        if is_benefit:
+            total += (x / top) * w
+        else:
+            total += ((low / x) if x > 0 else 0) * w
+    return total
+
+
+def _write_run(directory, rows):
+    # Run terurut: skor menurun, id menaik (sama dengan sort stabil saw.rank)
+    rows.sort(key=lambda r: (-r[2], r[0]))
+    fd, path = tempfile.mkstemp(suffix='.csv', dir=directory)
+    with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+    return path
+
+
+def _read_run(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        for fid, name, score in csv.reader(f):
+            yield int(fid), name, float(score)
+
+
+def stream_rank(criteria_list=None, k=10, chunk_size=DEFAULT_CHUNK_SIZE, weights=None, spill_path=None):
+    """
+    Ranking top-k tanpa memuat seluruh matriks. Jika ``spill_path`` diisi,
+    ranking lengkap (rank, framework_id, framework, score) ditulis ke file CSV
+    tersebut lewat external merge sort.
+
+    Mengembalikan dict: ``top`` (list dict seperti ``saw.rank``), ``total``.
+    """
+    started = time.perf_counter()
+    if criteria_list is None:
+        criteria_list = list(Criteria.objects.all())
+    if weights is None:
+        weights = [c.weight for c in criteria_list]
+    benefit = [c.attribute == 'benefit' for c in criteria_list]
+    max_vals, min_vals = column_bounds(criteria_list)
+
+    heap = []  # min-heap (score, -id, name) berukuran <= k
+    total = 0
+    spill_dir = tempfile.mkdtemp(prefix='spk-saw-') if spill_path else None
+    runs = []
+    try:
+        for chunk in iter_chunks(criteria_list, chunk_size):
+            scored = []
+            for fid, name, values in chunk:
+                score = _score(values, benefit, weights, max_vals, min_vals)
+                scored.append((fid, name, score))
+                item = (score, -fid, name)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            total += len(scored)
+            if spill_dir:
+                runs.append(_write_run(spill_dir, scored))
+
+        if spill_path:
+            merged = heapq.merge(*(_read_run(path) for path in runs), key=lambda r: (-r[2], r[0]))
+            with open(spill_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['rank', 'framework_id', 'framework', 'score'])
+                for rank, (fid, name, score) in enumerate(merged, start=1):
+                    writer.writerow([rank, fid, name, score])
+    finally:
+        if spill_dir:
+            for path in runs:
+                os.remove(path)
+            os.rmdir(spill_dir)
+
+    top = []
+    for idx, (score, neg_id, name) in enumerate(sorted(heap, reverse=True), start=1):
+        top.append({
+            'framework_id': -neg_id,
+            'framework': name,
+            'score': score,
+            'score_display': round(score, 6),
+            'percentage': round(score * 100, 2),
+            'rank': idx,
+        })
+
+    spk_metrics.ranking_seconds.observe(time.perf_counter() - started)
+    spk_metrics.ranking_total.inc()
+    spk_metrics.matrix_frameworks.set(total)
+    spk_metrics.matrix_criteria.set(len(criteria_list))
+    return {'top': top, 'total': total}
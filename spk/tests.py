@@ -1,3 +1,859 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import itertools
+import json
+import math
+import os
+import random
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import (
+    group, history, live, loadtest, methods, objective_weights, pareto, profiling, rank_compare, routers, saw,
+    similarity, staticfiles, streaming, warmup, weight_profiles,
+)
+from .auth_backends import CachedModelBackend, user_cache_key
+from .benchmark import generate_dataset
+from .caching import bump_once, get_data_version
+from .models import Criteria, Framework, FrameworkScore, RaterScore, ScoreChange, ScoreSnapshot
+from .pagination import decode_cursor, encode_cursor, keyset_page
+from .scores import dirty_cells, upsert_rater_scores, upsert_scores
+
+
+def _matrix(attributes, values, weights=None):
+    n = len(attributes)
+    weights = weights or [1.0 / n] * n
+    criteria = [
+        Criteria(id=j + 1, name=f'K{j + 1}', weight=w, attribute=a)
+        for j, (a, w) in enumerate(zip(attributes, weights))
+    ]
+    ids = list(range(1, len(values) + 1))
+    return saw.DecisionMatrix(criteria, ids, [f'F{i}' for i in ids], values)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Framework.objects.bulk_create([Framework(name=f'F{i % 7}') for i in range(23)])
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(['Django', 12], 40)
+        self.assertEqual(decode_cursor(cursor), (['Django', 12], 40))
+        self.assertIsNone(decode_cursor('bukan-cursor'))
+        self.assertIsNone(decode_cursor(''))
+
+    def test_forward_and_backward_pages_cover_all_rows_once(self):
+        expected = list(Framework.objects.order_by('name', 'id').values_list('id', flat=True))
+        seen, pages, after = [], [], None
+        while True:
+            page = keyset_page(Framework.objects.all(), ('name', 'id'), 5, after=after)
+            pages.append(page)
+            seen.extend(fw.id for fw in page)
+            if not page.has_next:
+                break
+            after = page.next_cursor
+        self.assertEqual(seen, expected)
+        self.assertEqual([p.start_index for p in pages], [0, 5, 10, 15, 20])
+
+        previous = keyset_page(Framework.objects.all(), ('name', 'id'), 5, before=pages[2].previous_cursor)
+        self.assertEqual([fw.id for fw in previous], [fw.id for fw in pages[1]])
+        self.assertEqual(previous.start_index, 5)
+
+
+class ParetoLayerTests(SimpleTestCase):
+    def _brute_force(self, rows):
+        layers = [0] * len(rows)
+        remaining = set(range(len(rows)))
+        layer = 0
+        while remaining:
+            layer += 1
+            front = {i for i in remaining if not any(pareto.dominates(rows[j], rows[i]) for j in remaining)}
+            for i in front:
+                layers[i] = layer
+            remaining -= front
+        return layers
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for m in (1, 2, 3, 5):
+            rows = [tuple(rng.randint(0, 4) for _ in range(m)) for _ in range(120)]
+            self.assertEqual(pareto.dominance_layers(rows, block_size=16), self._brute_force(rows))
+
+    def test_identical_rows_share_a_layer(self):
+        self.assertEqual(pareto.dominance_layers([(1, 1), (1, 1), (0, 0)]), [1, 1, 2])
+
+
+@override_settings(SPK_MATRIX_PAGE_SIZE=5)
+class ParetoPageTests(TestCase):
+    def test_front_is_paginated(self):
+        generate_dataset(200, 4, seed=1)
+        self.client.force_login(User.objects.create_user('admin'))
+        response = self.client.get('/pareto/')
+        size = response.context['front_size']
+        self.assertGreater(size, 5)
+        self.assertEqual(len(response.context['front_rows']), 5)
+        self.assertEqual(response.context['next_offset'], 5)
+        last = self.client.get('/pareto/?offset=100000')
+        self.assertEqual(len(last.context['front_rows']), size - (size - 1) // 5 * 5)
+        self.assertIsNone(last.context['next_offset'])
+
+
+class SimilarityTests(TestCase):
+    def test_kd_tree_matches_brute_force(self):
+        rng = random.Random(7)
+        points = [tuple(rng.random() for _ in range(4)) for _ in range(300)]
+        tree = similarity.KDTree(points, leaf_size=4)
+        for i in (0, 17, 299):
+            expected = sorted((math.dist(points[i], p), j) for j, p in enumerate(points) if j != i)[:6]
+            self.assertEqual(tree.query(points[i], 6, exclude=i), expected)
+
+    def test_index_reuses_cached_tree(self):
+        generate_dataset(80, 4, null_density=0.1, seed=6)
+        criteria_list = list(Criteria.objects.all())
+        version = get_data_version()
+        built = similarity.SimilarityIndex.build(version, criteria_list)
+        with mock.patch.object(similarity.KDTree, '_build', side_effect=AssertionError('tree dibangun ulang')):
+            loaded = similarity.SimilarityIndex.build(version, criteria_list)
+        framework_id = built.framework_ids[10]
+        self.assertEqual(loaded.neighbours(framework_id, 5), built.neighbours(framework_id, 5))
+
+
+class RankCompareTests(SimpleTestCase):
+    def test_count_inversions_matches_pairwise(self):
+        rng = random.Random(3)
+        for n in (0, 1, 2, 9, 50):
+            seq = [rng.randint(0, 10) for _ in range(n)]
+            pairwise = sum(1 for i, j in itertools.combinations(range(n), 2) if seq[i] > seq[j])
+            self.assertEqual(rank_compare.count_inversions(seq), pairwise)
+
+    def test_tau_and_rho_bounds(self):
+        ranks = list(range(1, 11))
+        self.assertEqual(rank_compare.kendall_tau(ranks, ranks), 1)
+        self.assertEqual(rank_compare.kendall_tau(ranks, ranks[::-1]), -1)
+        self.assertEqual(rank_compare.spearman_rho(ranks, ranks[::-1]), -1)
+        self.assertIsNone(rank_compare.kendall_tau([1], [1]))
+
+    def test_movers_and_top_k(self):
+        a = [{'framework_id': i, 'framework': f'F{i}', 'rank': i} for i in range(1, 6)]
+        b = [dict(item, rank=r) for item, r in zip(a, [2, 1, 3, 5, 4])]
+        result = rank_compare.compare_rankings(a, b, k=2)
+        self.assertEqual(result['compared'], 5)
+        self.assertEqual(result['top_k_overlap'], 1.0)
+        self.assertEqual({m['framework_id'] for m in result['movers']}, {1, 2, 4, 5})
+
+    def test_top_k_overlap_with_fewer_items_than_k(self):
+        ranking = [{'framework_id': i, 'framework': f'F{i}', 'rank': i} for i in range(1, 4)]
+        self.assertEqual(rank_compare.compare_rankings(ranking, ranking, k=10)['top_k_overlap'], 1.0)
+
+    def test_as_of_offset_survives_query_string_decoding(self):
+        from .views import _parse_as_of
+        expected = _parse_as_of('2026-10-01T09:00+07:00')
+        self.assertEqual(expected.utcoffset().total_seconds(), 7 * 3600)
+        self.assertEqual(_parse_as_of('2026-10-01T09:00 07:00'), expected)
+        self.assertEqual(_parse_as_of('2026-10-01T02:00Z'), expected)
+        self.assertIsNotNone(_parse_as_of('2026-10-01 09:00'))
+        self.assertIsNone(_parse_as_of('kemarin'))
+
+
+class StreamingRankTests(TestCase):
+    def test_top_k_matches_in_memory_ranking(self):
+        # Dengan sel kosong: bound cost harus sama di kedua jalur
+        generate_dataset(60, 4, null_density=0.2, seed=5)
+        criteria_list = list(Criteria.objects.all())
+        expected = saw.rank(saw.evaluate(saw.load_matrix(criteria_list)))
+        result = streaming.stream_rank(criteria_list, k=10, chunk_size=7)
+        self.assertEqual(result['total'], 60)
+        self.assertEqual(
+            [(d['framework_id'], round(d['score'], 9)) for d in result['top']],
+            [(d['framework_id'], round(d['score'], 9)) for d in expected[:10]],
+        )
+
+
+class MatrixPageTests(TestCase):
+    def test_pages_across_chunks_match_full_matrix(self):
+        generate_dataset(30, 3, null_density=0.1, seed=3)
+        criteria_list = list(Criteria.objects.all())
+        weights = [0.5, 0.3, 0.2]
+        matrix = saw.load_matrix(criteria_list)
+        normalized = saw.normalize(matrix)
+        expected = {
+            'decision': matrix.values,
+            'normalized': normalized,
+            'weighted': saw.weighted_matrix(normalized, weights),
+        }
+        with mock.patch.object(saw, 'MATRIX_CHUNK_ROWS', 7):
+            for kind, values in expected.items():
+                for offset, limit in ((0, 5), (5, 10), (26, 10), (40, 5)):
+                    rows, total = saw.matrix_page(criteria_list, kind, offset, limit, weights)
+                    self.assertEqual(total, 30)
+                    self.assertEqual(rows, saw.matrix_rows(matrix.framework_names, values, offset, limit))
+            shared = saw.shared_matrix(criteria_list)
+        self.assertEqual(shared['matrix'].values, matrix.values)
+        self.assertEqual(shared['normalized'], normalized)
+
+
+class ObjectiveWeightTests(TestCase):
+    def test_cost_criteria_with_empty_cells_get_weight(self):
+        generate_dataset(40, 5, null_density=0.2, seed=2)
+        criteria_list = list(Criteria.objects.order_by('id'))
+        self.assertIn('cost', [c.attribute for c in criteria_list])
+        for method in objective_weights.METHODS:
+            weights = objective_weights.derive_weights(criteria_list, method)
+            self.assertTrue(all(w > 0 for w in weights), (method, weights))
+            self.assertAlmostEqual(sum(weights), 1.0)
+            self.assertEqual(objective_weights.derive_weights(criteria_list, method, stream=True), weights)
+
+    def test_zero_weight_is_not_applied(self):
+        constant = Criteria.objects.create(name='Konstan', weight=0.5, attribute='benefit')
+        varied = Criteria.objects.create(name='Beragam', weight=0.5, attribute='benefit')
+        for i, value in enumerate([1.0, 5.0, 9.0]):
+            framework = Framework.objects.create(name=f'F{i}')
+            FrameworkScore.objects.create(framework=framework, criteria=constant, value=3.0)
+            FrameworkScore.objects.create(framework=framework, criteria=varied, value=value)
+        self.client.force_login(User.objects.create_user('admin'))
+        response = self.client.post('/criteria/objective-weights/', {'method': 'entropy'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(sorted(Criteria.objects.values_list('weight', flat=True)), [0.5, 0.5])
+
+
+class WeightProfileTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(12, 3, seed=5)
+        cls.user = User.objects.create_user('alice')
+        cls.other = User.objects.create_user('bob')
+
+    def setUp(self):
+        self.criteria_list = list(Criteria.objects.order_by('id'))
+
+    def test_profiles_are_per_user_and_missing_criteria_weigh_zero(self):
+        first, second, third = self.criteria_list
+        weight_profiles.save_profile(self.user, 'Tim A', {first.id: 0.7, second.id: 0.3})
+        self.assertEqual(weight_profiles.list_profiles(self.other), {})
+        stored = weight_profiles.get_profile(self.user, 'Tim A')
+        self.assertEqual(weight_profiles.profile_weights(self.criteria_list, stored), [0.7, 0.3, 0.0])
+
+        self.assertFalse(weight_profiles.delete_profile(self.other, 'Tim A'))
+        self.assertTrue(weight_profiles.delete_profile(self.user, 'Tim A'))
+        self.assertIsNone(weight_profiles.get_profile(self.user, 'Tim A'))
+
+    def test_profile_ranking_leaves_global_weights_untouched(self):
+        weights = [1.0, 0.0, 0.0]
+        ranking = saw.cached_result(self.criteria_list, weights)['ranking']
+        matrix = saw.load_matrix(self.criteria_list)
+        expected = sorted(zip(saw.scores(matrix, weights), matrix.framework_ids), key=lambda p: -p[0])
+        self.assertEqual([row['score'] for row in ranking], [score for score, _ in expected])
+        self.assertEqual(
+            [c.weight for c in Criteria.objects.order_by('id')],
+            [c.weight for c in self.criteria_list],
+        )
+
+    def test_view_rejects_invalid_totals_and_unknown_profiles(self):
+        self.client.force_login(self.user)
+        post = {'name': 'Salah', **{f'weight_{c.id}': 0.5 for c in self.criteria_list}}
+        self.client.post('/weights/', post)
+        self.assertEqual(weight_profiles.list_profiles(self.user), {})
+
+        post = {'name': 'Benar', **{f'weight_{c.id}': w for c, w in zip(self.criteria_list, [0.5, 0.5, 0])}}
+        self.client.post('/weights/', post)
+        self.assertIn('Benar', weight_profiles.list_profiles(self.user))
+        self.assertEqual(self.client.get('/calculate/?profile=Benar').status_code, 200)
+
+        response = self.client.get('/calculate/?profile=Tidak+Ada')
+        self.assertRedirects(response, '/weights/', fetch_redirect_response=False)
+
+
+class GroupAggregationTests(SimpleTestCase):
+    def _tensor(self, values):
+        criteria = [Criteria(id=1, name='K1', weight=1.0, attribute='benefit')]
+        return group.RaterTensor(criteria, [1], ['F1'], list(range(len(values))), [], values)
+
+    def test_aggregators(self):
+        tensor = self._tensor([[[2.0]], [[8.0]], [[None]]])
+        self.assertEqual(group.aggregate(tensor, 'mean'), [[5.0]])
+        self.assertEqual(group.aggregate(tensor, 'median'), [[5.0]])
+        self.assertAlmostEqual(group.aggregate(tensor, 'geomean')[0][0], 4.0)
+        self.assertEqual(group.aggregate(tensor, 'mean', [3.0, 1.0, 1.0]), [[3.5]])
+
+    def test_kendall_w(self):
+        self.assertEqual(group.kendall_w([[1, 2, 3], [1, 2, 3]]), 1)
+        self.assertEqual(group.kendall_w([[1, 2], [2, 1]]), 0)
+        self.assertIsNone(group.kendall_w([[1, 2, 3]]))
+
+
+class MethodRegistryTests(SimpleTestCase):
+    def test_registered_methods(self):
+        self.assertEqual(set(methods.METHODS), {'saw', 'wp', 'topsis', 'waspas'})
+
+    def test_methods_agree_on_dominant_framework(self):
+        matrix = _matrix(['benefit', 'cost'], [[10.0, 1.0], [5.0, 2.0], [1.0, 4.0]])
+        context = methods.MethodContext(matrix, [0.5, 0.5], saw.normalize(matrix))
+        for name in methods.METHODS:
+            self.assertEqual(methods.ranks(context.run(name)), [1, 2, 3], name)
+
+    def test_saw_matches_engine(self):
+        matrix = _matrix(['benefit', 'cost', 'benefit'], [[3.0, 4.0, 1.0], [2.0, 1.0, 5.0]])
+        context = methods.MethodContext(matrix, [0.2, 0.3, 0.5], saw.normalize(matrix))
+        self.assertEqual(context.run('saw'), saw.scores(matrix, [0.2, 0.3, 0.5]))
+
+    def test_missing_cost_cell_is_worst_everywhere(self):
+        # F3 kosong di kriteria cost; kolom cost tidak boleh jadi 0 semua
+        matrix = _matrix(['benefit', 'cost'], [[5.0, 2.0], [5.0, 4.0], [5.0, 0.0]])
+        normalized = saw.normalize(matrix, skip_empty=True)
+        self.assertEqual([row[1] for row in normalized], [1.0, 0.5, 0])
+        context = methods.MethodContext(matrix, [0.5, 0.5], normalized)
+        for name in methods.METHODS:
+            scores = context.run(name)
+            self.assertEqual(methods.ranks(scores), [1, 2, 3], name)
+            self.assertGreater(min(scores[:2]), 0, name)
+
+    def test_ranking_engine_keeps_empty_cells_in_cost_min(self):
+        # calculate_saw tetap memakai aturan lama: sel kosong = 0 ikut ke min
+        matrix = _matrix(['benefit', 'cost'], [[5.0, 2.0], [5.0, 4.0], [5.0, 0.0]])
+        self.assertEqual(saw.column_bounds(matrix), ([5.0, 4.0], [5.0, 0]))
+        self.assertEqual([row[1] for row in saw.normalize(matrix)], [0, 0, 0])
+
+    def test_wp_column_without_positive_values_is_ignored(self):
+        matrix = _matrix(['benefit', 'cost'], [[4.0, 0.0], [2.0, 0.0]])
+        context = methods.MethodContext(matrix, [0.5, 0.5], saw.normalize(matrix))
+        self.assertEqual(methods.ranks(context.run('wp')), [1, 2])
+        self.assertGreater(context.run('wp')[1], 0)
+
+
+class HistoryReplayTests(TestCase):
+    def _stamp(self, when):
+        """Beri waktu ``when`` pada perubahan yang belum diberi waktu."""
+        ScoreChange.objects.filter(id__gt=self.stamped).update(changed_at=when)
+        self.stamped = ScoreChange.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    def setUp(self):
+        self.stamped = 0
+        self.t1 = timezone.now() - timedelta(hours=3)
+        self.t2 = self.t1 + timedelta(hours=2)
+
+        speed = Criteria.objects.create(name='Kecepatan', weight=0.6, attribute='benefit')
+        price = Criteria.objects.create(name='Biaya', weight=0.4, attribute='cost')
+        self.frameworks = [Framework.objects.create(name=name) for name in ('A', 'B', 'C')]
+        for framework, (x, y) in zip(self.frameworks, [(3, 2), (5, 4), (1, 1)]):
+            FrameworkScore.objects.create(framework=framework, criteria=speed, value=x)
+            FrameworkScore.objects.create(framework=framework, criteria=price, value=y)
+        self._stamp(self.t1)
+        self.state_t1 = history.current_state().to_snapshot()
+
+        a, b, c = self.frameworks
+        upsert_scores([(a.id, speed.id, 9.0), (c.id, price.id, 8.0)])
+        b.delete()
+        price.weight, speed.weight = 0.5, 0.5
+        price.save()
+        speed.save()
+        self._stamp(self.t2)
+
+    def test_full_replay_matches_state_at_each_point(self):
+        state, snapshot, replayed = history.state_as_of(self.t1)
+        self.assertIsNone(snapshot)
+        self.assertEqual(replayed, 11)
+        self.assertEqual(state.to_snapshot(), self.state_t1)
+
+        state, _, _ = history.state_as_of(self.t2)
+        self.assertEqual(state.to_snapshot(), history.current_state().to_snapshot())
+        self.assertEqual(history.state_as_of(self.t1 - timedelta(hours=1))[0].to_snapshot(), history.HistoryState().to_snapshot())
+
+    def test_snapshot_replays_only_later_changes(self):
+        snapshot = history.take_snapshot()
+        ScoreSnapshot.objects.filter(pk=snapshot.pk).update(created_at=self.t2)
+        state, used, replayed = history.state_as_of(self.t2 + timedelta(minutes=1))
+        self.assertEqual((used.pk, replayed), (snapshot.pk, 0))
+        self.assertEqual(state.to_snapshot(), history.current_state().to_snapshot())
+
+        # Snapshot sesudah T tidak dipakai untuk T
+        state, used, _ = history.state_as_of(self.t1)
+        self.assertIsNone(used)
+        self.assertEqual(state.to_snapshot(), self.state_t1)
+
+    def test_ranking_as_of_matches_engine(self):
+        result = history.ranking_as_of(self.t2)
+        expected = saw.rank(saw.evaluate(saw.load_matrix(list(Criteria.objects.order_by('id')))))
+        self.assertEqual(
+            [(row['framework_id'], row['score']) for row in result['ranking']],
+            [(row['framework_id'], row['score']) for row in expected],
+        )
+        self.assertEqual(history.ranking_as_of(self.t1 - timedelta(hours=1))['ranking'], [])
+
+    def test_reset_clears_frameworks_and_scores(self):
+        state = history.HistoryState.from_snapshot(self.state_t1)
+        state.apply(ScoreChange(kind=ScoreChange.RESET))
+        self.assertEqual((state.frameworks, state.scores), ({}, {}))
+        self.assertEqual(len(state.criteria), 2)
+        state.apply(ScoreChange(kind=ScoreChange.RESET_ALL))
+        self.assertEqual(state.criteria, {})
+
+
+class UpsertTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.criteria = Criteria.objects.create(name='Performa', weight=1.0, attribute='benefit')
+        cls.framework = Framework.objects.create(name='Django')
+
+    def test_insert_then_update_logs_history_and_bumps_version(self):
+        version = get_data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(upsert_scores([(self.framework.id, self.criteria.id, 1.0)]), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_scores([
+                (self.framework.id, self.criteria.id, 2.0),
+                (self.framework.id, self.criteria.id, 3.0),
+            ])
+        self.assertEqual(FrameworkScore.objects.get().value, 3.0)
+        self.assertNotEqual(get_data_version(), version)
+        self.assertEqual(
+            list(ScoreChange.objects.filter(kind=ScoreChange.SCORE).values_list('value', flat=True)),
+            [1.0, 3.0],
+        )
+
+    def test_one_version_bump_per_transaction(self):
+        second = Framework.objects.create(name='Flask')
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic(), bump_once():
+                Framework.objects.create(name='Laravel')
+                FrameworkScore.objects.create(framework=self.framework, criteria=self.criteria, value=1.0)
+                upsert_scores([(second.id, self.criteria.id, 2.0)])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_score_upload_is_one_upsert_and_one_bump(self):
+        user = User.objects.create_user('uploader')
+        self.client.force_login(user)
+        Framework.objects.create(name='Flask')
+        upload = SimpleUploadedFile(
+            'score.csv', b'framework,criteria,value\nDjango,Performa,4\nFlask,Performa,5\nRails,Performa,6\n'
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/upload/', {'csv_file': upload})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(
+            dict(FrameworkScore.objects.values_list('framework__name', 'value')),
+            {'Django': 4.0, 'Flask': 5.0},
+        )
+
+    def test_rater_scores_are_per_rater(self):
+        alice = User.objects.create_user('alice')
+        bob = User.objects.create_user('bob')
+        upsert_rater_scores(alice.id, [(self.framework.id, self.criteria.id, 4.0)])
+        upsert_rater_scores(bob.id, [(self.framework.id, self.criteria.id, 2.0)])
+        upsert_rater_scores(alice.id, [(self.framework.id, self.criteria.id, 5.0)])
+        self.assertEqual(
+            dict(RaterScore.objects.values_list('rater__username', 'value')),
+            {'alice': 5.0, 'bob': 2.0},
+        )
+
+    def test_dirty_cells_skips_unchanged(self):
+        changes = {(1, 1): 2.0, (1, 2): None, (2, 1): 5.0}
+        existing = {(1, 1): 2.0, (1, 2): 3.0}
+        self.assertEqual(dirty_cells(changes, existing), [(1, 2, None), (2, 1, 5.0)])
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'spk-test-default'},
+        'sessions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'spk-test-sessions'},
+    },
+    SPK_AUTH_USER_CACHE_ALIAS='sessions',
+)
+class ScoreGridTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('admin'))
+        self.framework = Framework.objects.create(name='A')
+        self.criteria = [Criteria.objects.create(name=f'K{i}', weight=0.5, attribute='benefit') for i in range(2)]
+
+    def _post(self, *values):
+        changes = [
+            {'framework': self.framework.id, 'criteria': c.id, 'value': value}
+            for c, value in zip(self.criteria, values)
+        ]
+        return self.client.post('/frameworks/grid/', json.dumps({'changes': changes}), content_type='application/json')
+
+    def test_invalid_cells_are_reported_per_cell_and_nothing_is_written(self):
+        for bad in ('inf', 'NaN', '-1', 'abc', True):
+            response = self._post('4', bad)
+            self.assertEqual(response.status_code, 400, bad)
+            cells = response.json()['cells']
+            self.assertEqual([(c['criteria'], bool(c['error'])) for c in cells], [(self.criteria[1].id, True)])
+        # Literal NaN/Infinity juga diterima json.loads
+        response = self.client.post(
+            '/frameworks/grid/',
+            f'{{"changes": [{{"framework": {self.framework.id}, "criteria": {self.criteria[0].id}, "value": Infinity}}]}}',
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(FrameworkScore.objects.exists())
+
+    def test_valid_and_empty_cells_are_saved(self):
+        response = self._post('4.5', '')
+        self.assertEqual(response.json(), {'updated': 2, 'received': 2})
+        self.assertEqual(
+            list(FrameworkScore.objects.order_by('criteria_id').values_list('value', flat=True)),
+            [4.5, None],
+        )
+
+
+class CachedModelBackendTests(TestCase):
+    def setUp(self):
+        caches['sessions'].clear()
+        self.backend = CachedModelBackend()
+        self.user = User.objects.create_user('alice', password='secret')
+
+    def test_cached_user_is_invalidated_on_save(self):
+        self.backend.get_user(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.id).username, 'alice')
+        self.user.first_name = 'Alice'
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.backend.get_user(self.user.id).first_name, 'Alice')
+
+    def test_inactive_cached_user_is_rejected(self):
+        cached = self.backend.get_user(self.user.id)
+        cached.is_active = False
+        caches['sessions'].set(user_cache_key(self.user.id), cached)
+        self.assertIsNone(self.backend.get_user(self.user.id))
+
+    @override_settings(SPK_AUTH_USER_CACHE_ALIAS=None)
+    def test_without_session_cache_every_lookup_hits_database(self):
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.backend.get_user(self.user.id)
+
+
+@override_settings(SPK_DB_REPLICAS=['replica'], SPK_REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.router = routers.PrimaryReplicaRouter()
+        self.seen = {}
+
+    def _view(self, write=False):
+        def view(request):
+            if write:
+                self.router.db_for_write(Framework)
+            self.seen['framework'] = self.router.db_for_read(Framework)
+            self.seen['user'] = self.router.db_for_read(User)
+            return 'ok'
+        return routers.replica_reads(view)
+
+    def _request(self, method='get', session=None, write=False):
+        request = getattr(RequestFactory(), method)('/')
+        request.session = {} if session is None else session
+        view = self._view(write)
+        middleware = routers.ReplicaRoutingMiddleware(
+            lambda r: middleware.process_view(r, view, (), {}) or view(r)
+        )
+        middleware(request)
+        return request
+
+    def test_safe_request_reads_spk_models_from_replica(self):
+        request = self._request()
+        self.assertEqual(self.seen, {'framework': 'replica', 'user': None})
+        self.assertNotIn(routers.PIN_SESSION_KEY, request.session)
+        # Di luar request kembali ke primary
+        self.assertIsNone(self.router.db_for_read(Framework))
+
+    def test_unmarked_view_and_unsafe_method_use_primary(self):
+        def view(request):
+            return self.router.db_for_read(Framework)
+        middleware = routers.ReplicaRoutingMiddleware(
+            lambda r: middleware.process_view(r, view, (), {}) or view(r)
+        )
+        self.assertIsNone(middleware(RequestFactory().get('/')))
+        self._request('post')
+        self.assertIsNone(self.seen['framework'])
+
+    def test_write_pins_session_to_primary(self):
+        request = self._request(write=True)
+        self.assertGreater(request.session[routers.PIN_SESSION_KEY], 0)
+        self._request(session=request.session)
+        self.assertIsNone(self.seen['framework'])
+
+        request.session[routers.PIN_SESSION_KEY] = 0
+        self._request(session=request.session)
+        self.assertEqual(self.seen['framework'], 'replica')
+
+    @override_settings(SPK_DB_REPLICAS=[])
+    def test_without_replicas_reads_stay_on_primary(self):
+        self._request()
+        self.assertIsNone(self.seen['framework'])
+
+
+@override_settings(SPK_WARMUP_ENABLED=True, SPK_WARMUP_DELAY=2, SPK_WARMUP_MAX_DELAY=5)
+class WarmupSchedulerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 100.0
+        patches = [
+            mock.patch('spk.warmup.time.monotonic', lambda: self.now),
+            mock.patch('spk.warmup.threading.Thread'),
+            mock.patch('spk.warmup.warm', return_value={'version': 1}),
+        ]
+        self.thread, self.warm = [p.start() for p in patches][1:]
+        for p in patches:
+            self.addCleanup(p.stop)
+        self.scheduler = warmup.WarmupScheduler()
+
+    def test_burst_is_debounced_up_to_max_delay(self):
+        for step in range(4):
+            self.now = 100.0 + step
+            self.scheduler.schedule()
+        # Jadwal mundur per perubahan, tetapi tidak lewat batas 5 detik dari yang pertama
+        self.assertEqual(self.scheduler._due, 105.0)
+        self.assertEqual(self.thread.call_count, 1)
+
+        self.now = 105.0
+        self.scheduler._take()
+        self.assertFalse(self.scheduler.pending)
+        self.now = 110.0
+        self.scheduler.schedule()
+        self.assertEqual(self.scheduler._due, 112.0)
+
+    def test_flush_runs_pending_warmup_once(self):
+        self.assertIsNone(self.scheduler.flush())
+        self.scheduler.schedule()
+        self.scheduler.schedule()
+        self.assertEqual(self.scheduler.flush(), {'version': 1})
+        self.assertIsNone(self.scheduler.flush())
+        self.assertEqual(self.warm.call_count, 1)
+
+    @override_settings(SPK_WARMUP_ENABLED=False)
+    def test_disabled_scheduler_does_nothing(self):
+        self.scheduler.schedule()
+        self.assertFalse(self.scheduler.pending)
+        self.thread.assert_not_called()
+
+    def test_failed_warmup_is_logged_and_counted(self):
+        self.warm.side_effect = RuntimeError('boom')
+        with mock.patch('spk.warmup.spk_metrics.record_warmup') as record, \
+                self.assertLogs('spk.warmup', 'ERROR'):
+            self.scheduler._warm()
+        record.assert_called_once_with(None)
+
+
+class WarmupSignalTests(TestCase):
+    def test_version_bump_schedules_warmup_after_commit(self):
+        with mock.patch.object(warmup.scheduler, 'schedule') as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                Framework.objects.create(name='Baru')
+                schedule.assert_not_called()
+        schedule.assert_called_once_with()
+
+
+class StaticFilesTests(SimpleTestCase):
+    CSS = ('.kartu { margin: 0 auto; padding: 1rem; }\n' * 40).encode()
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        source = os.path.join(tmp.name, 'src')
+        self.root = os.path.join(tmp.name, 'root')
+        os.makedirs(os.path.join(source, 'css'))
+        with open(os.path.join(source, 'css', 'app.css'), 'wb') as f:
+            f.write(self.CSS)
+        with open(os.path.join(source, 'kecil.txt'), 'wb') as f:
+            f.write(b'kecil')
+        settings_override = override_settings(
+            STATIC_ROOT=self.root, STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        storage = staticfiles.CompressedManifestStaticFilesStorage(location=self.root)
+        self.hashed = storage.stored_name('css/app.css')
+        self.middleware = staticfiles.StaticFilesMiddleware(lambda request: HttpResponse('view'))
+
+    def _get(self, path, **headers):
+        response = self.middleware(RequestFactory().get('/static/' + path, headers=headers))
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def test_collectstatic_writes_gzip_for_large_text_files(self):
+        self.assertNotEqual(self.hashed, 'css/app.css')
+        for name in (self.hashed, 'css/app.css'):
+            with open(os.path.join(self.root, name + '.gz'), 'rb') as f:
+                self.assertEqual(gzip.decompress(f.read()), self.CSS)
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'kecil.txt.gz')))
+
+    def test_serves_negotiated_encoding_with_immutable_cache(self):
+        response, body = self._get(self.hashed, accept_encoding='br;q=0, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(body), self.CSS)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertNotIn('Content-Disposition', response)
+
+        response, body = self._get(self.hashed, accept_encoding='gzip;q=0')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(body, self.CSS)
+
+        # brotli lebih diutamakan bila variannya ada
+        with open(os.path.join(self.root, self.hashed + '.br'), 'wb') as f:
+            f.write(b'br')
+        self.middleware._index = None
+        response, body = self._get(self.hashed, accept_encoding='gzip, br')
+        self.assertEqual((response['Content-Encoding'], body), ('br', b'br'))
+
+    @override_settings(SPK_STATIC_MAX_AGE=120)
+    def test_unhashed_files_get_short_cache_and_conditional_requests(self):
+        response, _ = self._get('kecil.txt')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=120')
+        self.assertNotIn('Vary', response)
+
+        response, body = self._get('kecil.txt', if_none_match=response['ETag'])
+        self.assertEqual((response.status_code, body), (304, b''))
+        # ETag varian gzip berbeda dari versi asli
+        gzipped, _ = self._get(self.hashed, accept_encoding='gzip')
+        plain, _ = self._get(self.hashed)
+        self.assertNotEqual(gzipped['ETag'], plain['ETag'])
+        self.assertEqual(self._get(self.hashed, if_none_match=gzipped['ETag'])[0].status_code, 200)
+
+    def test_unknown_paths_and_unsafe_methods_reach_the_view(self):
+        self.assertEqual(self._get('tidak-ada.css')[1], b'view')
+        self.assertEqual(self._get('css/app.css.gz')[1], b'view')
+        response = self.middleware(RequestFactory().post('/static/' + self.hashed))
+        self.assertEqual(response.content, b'view')
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(SPK_PROFILE_DIR=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.staff = User.objects.create_user('admin', is_staff=True)
+
+    def _call(self, view):
+        # Rantai minimal seperti BaseHandler: process_view lalu view
+        middleware = profiling.ProfilingMiddleware(
+            lambda request: middleware.process_view(request, view, (), {}) or view(request)
+        )
+        request = RequestFactory().get('/', {'_profile': '1'})
+        request.user = self.staff
+        return middleware(request)
+
+    def test_staff_request_is_profiled_through_the_normal_chain(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/?_profile=1')
+        self.assertEqual(response.status_code, 200)
+        capture_id = response['X-SPK-Profile-Id']
+        self.assertTrue(os.path.isfile(profiling.profile_path(capture_id, 'pstats')))
+        self.assertEqual(profiling.list_profiles()[0]['view'], 'dashboard')
+
+    def test_view_exception_propagates_and_capture_is_saved(self):
+        def broken(request):
+            raise ValueError('rusak')
+        with self.assertRaises(ValueError):
+            self._call(broken)
+        self.assertEqual([c['view'] for c in profiling.list_profiles()], ['broken'])
+
+    def test_async_views_are_not_profiled(self):
+        async def view(request):
+            return HttpResponse()
+        self.assertIsNone(profiling.ProfilingMiddleware(None).process_view(
+            RequestFactory().get('/', {'_profile': '1'}), view, (), {},
+        ))
+        self.assertEqual(profiling.list_profiles(), [])
+
+
+class RankingStreamAuthTests(TestCase):
+    async def test_anonymous_request_is_redirected_to_login(self):
+        response = await self.async_client.get('/calculate/stream/')
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/calculate/stream/', response['Location'])
+
+    async def test_logged_in_request_reaches_the_stream(self):
+        user = await sync_to_async(User.objects.create_user)('alice')
+        await self.async_client.aforce_login(user)
+        with mock.patch('spk.views.live.ranking_events', return_value=iter([])):
+            response = await self.async_client.get('/calculate/stream/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+
+class PageRenderTests(TestCase):
+    def test_pages_render_without_collectstatic(self):
+        # Test runner memakai DEBUG=False; manifest static belum ada
+        self.client.force_login(User.objects.create_user('admin'))
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '/static/css/app.css')
+
+
+class _LoginRedirectTransport:
+    """Login berhasil, tetapi setiap request berikutnya diarahkan ke halaman login."""
+
+    def request(self, method, path, body=b'', headers=None):
+        if path == '/login/':
+            return (302 if method == 'POST' else 200), [('Location', '/')], b''
+        return 302, [('Location', '/login/?next=' + path)], b''
+
+
+class LoadTestAccountingTests(SimpleTestCase):
+    @override_settings(LOGIN_URL='/login/')
+    def test_redirect_to_login_is_not_success(self):
+        test = loadtest.LoadTest(
+            _LoginRedirectTransport(), users=1, duration=0.05, username='u', password='p',
+            mix={'dashboard': 1, 'edit': 1}, frameworks=[(1, 'F1')], criteria=[(1, 'K1')],
+        )
+        report = test.run()
+        total = report['total']
+        self.assertGreater(total['requests'], 0)
+        self.assertEqual(total['errors'], total['requests'])
+        self.assertEqual(total['redirects'], total['requests'])
+
+
+@override_settings(SPK_SSE_RANKING_SIZE=5)
+class RankingBroadcasterTests(TestCase):
+    async def test_refresh_skips_unchanged_ranking_and_serializes(self):
+        await sync_to_async(generate_dataset)(20, 3, seed=4)
+        broadcaster = live.RankingBroadcaster()
+        await broadcaster._refresh()
+        first = broadcaster.version
+
+        def add_framework():
+            # Skor terburuk di semua kriteria: batas max/min kolom tidak berubah
+            with self.captureOnCommitCallbacks(execute=True):
+                framework = Framework.objects.create(name='Baru')
+                FrameworkScore.objects.bulk_create(
+                    FrameworkScore(
+                        framework=framework, criteria=c,
+                        value=0.001 if c.attribute == 'benefit' else 1e9,
+                    )
+                    for c in Criteria.objects.all()
+                )
+
+        def bump_top():
+            with self.captureOnCommitCallbacks(execute=True):
+                cell = FrameworkScore.objects.filter(criteria__attribute='benefit', value__isnull=False).first()
+                cell.value = 9999
+                cell.save()
+
+        # Framework baru yang terburuk tidak masuk top-5: tidak ada event
+        await sync_to_async(add_framework)()
+        await broadcaster._refresh()
+        self.assertNotEqual(broadcaster.checked_version, first)
+        self.assertEqual(broadcaster.version, first)
+        self.assertIsNone(broadcaster.diff)
+
+        await sync_to_async(bump_top)()
+        await asyncio.gather(*(broadcaster._refresh() for _ in range(4)))
+        self.assertNotEqual(broadcaster.version, first)
+        self.assertEqual(broadcaster.previous_version, first)
+        self.assertTrue(broadcaster.diff['changed'])
@@ -16,12 +16,16 @@ urlpatterns = [
     path('add-criteria/', views.add_criteria, name='add_criteria'),
     path('edit-criteria/<int:criteria_id>/', views.edit_criteria, name='edit_criteria'),
     path('delete-criteria/<int:criteria_id>/', views.delete_criteria, name='delete_criteria'),
+    path('criteria/objective-weights/', views.objective_weights_view, name='objective_weights'),
     
     # Framework Management
     path('frameworks/', views.framework_list, name='framework_list'),
+    path('frameworks/rows/', views.framework_rows, name='framework_rows'),
+    path('frameworks/grid/', views.score_grid, name='score_grid'),
     path('add-framework/', views.add_framework, name='add_framework'),
     path('edit-scores/<int:framework_id>/', views.edit_framework_scores, name='edit_framework_scores'),
     path('frameworks/<int:framework_id>/delete/', views.delete_framework, name='delete_framework'),
+    path('frameworks/<int:framework_id>/similar/', views.similar_frameworks, name='similar_frameworks'),
     
     #Quick Aksi
     path('export/', views.export_data, name='export_data'),
@@ -29,8 +33,22 @@ urlpatterns = [
     
     # SAW Calculation
     path('calculate/', views.calculate_saw, name='calculate_saw'),
+    path('calculate/matrix/', views.saw_matrix, name='saw_matrix'),
+    path('calculate/methods/', views.compare_methods, name='compare_methods'),
+    path('calculate/compare/', views.compare_rankings, name='compare_rankings'),
+    path('calculate/stream/', views.ranking_stream, name='ranking_stream'),
+    path('history/', views.ranking_history, name='ranking_history'),
+    path('group/', views.group_ranking, name='group_ranking'),
+    path('weights/', views.weight_profile_list, name='weight_profile_list'),
+    path('pareto/', views.pareto_front, name='pareto_front'),
+    path('pareto/data/', views.pareto_data, name='pareto_data'),
     
     # CSV Upload
     path('upload/', views.upload_csv, name='upload_csv'),
     path('download-template/', views.download_csv_template, name='download_csv_template'),
+
+    # Monitoring
+    path('metrics/', views.metrics, name='metrics'),
+    path('profiles/', views.profile_list, name='profile_list'),
+    path('profiles/<str:profile_id>.<str:fmt>', views.profile_download, name='profile_download'),
 ]
\ No newline at end of file
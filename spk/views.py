@@ -1,14 +1,35 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.template.defaultfilters import floatformat
+from django.utils.text import Truncator
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import authenticate, login as auth_login, logout
+from django.contrib.auth.views import redirect_to_login
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, FileResponse, Http404, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
+from django.db import transaction
 from io import TextIOWrapper
 import csv
 import io
+import json
+import re
+import time
+from . import metrics as spk_metrics
+from . import profiling
 from .forms import RegisterForm, CriteriaForm, CSVUploadForm, FrameworkForm
-from .models import Criteria, Framework, FrameworkScore, UserProfile
-from django.core.management.base import BaseCommand
+from .models import Criteria, Framework, FrameworkScore, RaterScore, UserProfile
+from .pagination import keyset_page
+from .routers import replica_reads
+from .stats import dashboard_stats
+from .scores import dirty_cells, parse_score, upsert_rater_scores, upsert_scores
+from .caching import bump_data_version, bump_once, cached, get_data_version
+from . import exports, group, history, live, methods as mcdm, objective_weights, pareto, rank_compare, saw, similarity, weight_profiles
 
 
 def login(request):
@@ -50,19 +71,11 @@ def logout_view(request):
     return redirect('login')
 
 # Dashboard
+@replica_reads
 @login_required
 def dashboard(request):
-    # Statistik dasar
-    total_frameworks = Framework.objects.count()
-    total_criteria = Criteria.objects.count()
-    total_weight = sum(c.weight for c in Criteria.objects.all())
-    
-    context = {
-        'total_frameworks': total_frameworks,
-        'total_criteria': total_criteria,
-        'total_weight': total_weight,
-        'is_ready_to_calculate': abs(total_weight - 1.0) < 0.001 and total_frameworks > 0
-    }
+    # Statistik dasar (satu query agregat, di-cache per data version)
+    context = dashboard_stats()
     return render(request, 'dashboard.html', context)
 
 # Criteria Management
@@ -107,6 +120,54 @@ def delete_criteria(request, criteria_id):
         messages.success(request, f'Kriteria "{criteria_name}" berhasil dihapus.')
     return redirect('framework_list')
 
+@login_required
+def objective_weights_view(request):
+    # Pratinjau bobot entropy/CRITIC dari data; POST menerapkannya ke Criteria
+    # Urutan eksplisit: bobot yang di-cache dicocokkan ke kriteria berdasarkan posisi
+    criteria_list = list(Criteria.objects.order_by('id'))
+    if not criteria_list or not Framework.objects.exists():
+        messages.error(request, 'Data kriteria atau framework masih kosong.')
+        return redirect('criteria_list')
+
+    method = request.POST.get('method') or request.GET.get('method', 'entropy')
+    if method not in objective_weights.METHODS:
+        method = 'entropy'
+    threshold = getattr(settings, 'SPK_STREAMING_THRESHOLD', 50000)
+    stream = Framework.objects.count() > threshold
+    weights = cached(
+        f'objective-weights:{method}',
+        lambda: objective_weights.derive_weights(criteria_list, method, stream=stream),
+    )
+
+    # Bobot 0 (kriteria tanpa variasi) tidak bisa disimpan lewat CriteriaForm
+    # dan membuat kriteria diabaikan; jangan diterapkan diam-diam
+    zero_weight = [c.name for c, weight in zip(criteria_list, weights) if weight <= 0]
+
+    if request.method == 'POST':
+        if zero_weight:
+            messages.error(
+                request,
+                f'Bobot tidak diterapkan: {", ".join(zero_weight)} mendapat bobot 0 '
+                '(nilai tidak bervariasi). Lengkapi data atau atur bobot secara manual.'
+            )
+            return redirect(f"{reverse('objective_weights')}?method={method}")
+        with transaction.atomic():
+            for criteria, weight in zip(criteria_list, weights):
+                criteria.weight = weight
+                criteria.save(update_fields=['weight'])
+        messages.success(request, f'Bobot {objective_weights.METHODS[method]} berhasil diterapkan.')
+        return redirect('criteria_list')
+
+    return render(request, 'objective_weights.html', {
+        'method': method,
+        'methods': list(objective_weights.METHODS.items()),
+        'rows': [(c, weight, weight - c.weight) for c, weight in zip(criteria_list, weights)],
+        'total_current': sum(c.weight for c in criteria_list),
+        'total_derived': sum(weights),
+        'zero_weight': zero_weight,
+    })
+
+
 @login_required
 def add_framework(request):
     criteria_list = Criteria.objects.all()
@@ -123,64 +184,62 @@ def add_framework(request):
                 file_data = TextIOWrapper(csv_file.file, encoding='utf-8-sig')
                 reader = csv.DictReader(file_data, delimiter=';')
 
-                count = 0
-                for row in reader:
-                    row = {k.strip(): v for k, v in row.items()}
-                    # Asumsi kolom CSV: name, description, score_<criteria_id> ...
-                    name = row.get('name')
-                    description = row.get('description', '')
+                # Framework dan semua skornya ditulis dalam satu transaksi
+                with transaction.atomic(), bump_once():
+                    count = 0
+                    cells = []
+                    for row in reader:
+                        row = {k.strip(): v for k, v in row.items()}
+                        # Asumsi kolom CSV: name, description, score_<criteria_id> ...
+                        name = row.get('name')
+                        description = row.get('description', '')
 
-                    if not name:
-                        continue  # skip jika nama kosong
+                        if not name:
+                            continue  # skip jika nama kosong
                 
 
-                    # Simpan framework (bisa ada duplikat)
-                    framework = Framework.objects.create(
-                        name=name,
-                        description=description
-                    )
+                        # Simpan framework (bisa ada duplikat)
+                        framework = Framework.objects.create(
+                            name=name,
+                            description=description
+                        )
                     
-                    form = FrameworkForm(request.POST)
-                    if form.is_valid():
-                        name = form.cleaned_data['name']
-                        if Framework.objects.filter(name=name).exists():
-                            messages.error(request, f'Framework "{name}" sudah ada.')
-                        else:
-                            framework = form.save()
-                    # Simpan nilai untuk tiap criteria
-                    for criteria in criteria_list:
-                        score_val = row.get(criteria.name)
-                        try:
-                            score_val = float(score_val) if score_val else None
-                        except ValueError:
-                            score_val = None
-
-                        if score_val is not None:
-                            FrameworkScore.objects.create(
-                                framework=framework,
-                                criteria=criteria,
-                                value=score_val
-                                )
-                    count += 1
+                        form = FrameworkForm(request.POST)
+                        if form.is_valid():
+                            name = form.cleaned_data['name']
+                            if Framework.objects.filter(name=name).exists():
+                                messages.error(request, f'Framework "{name}" sudah ada.')
+                            else:
+                                framework = form.save()
+                        # Simpan nilai untuk tiap criteria
+                        for criteria in criteria_list:
+                            score_val = row.get(criteria.name)
+                            try:
+                                score_val = float(score_val) if score_val else None
+                            except ValueError:
+                                score_val = None
+
+                            if score_val is not None:
+                                cells.append((framework.id, criteria.id, score_val))
+                        count += 1
+                    upsert_scores(cells)
                 messages.success(request, f'{count} framework berhasil diimport dari CSV.')
                 return redirect('framework_list')
 
         else:
             form = FrameworkForm(request.POST)
             if form.is_valid():
-                fw = form.save()
-                for crit in criteria_list:
-                    nilai = request.POST.get(f'score_{crit.id}')
-                    if nilai:
-                        try:
-                            value = float(nilai)
-                            FrameworkScore.objects.update_or_create(
-                                framework=fw,
-                                criteria=crit,
-                                defaults={'value': value}
-                                )
-                        except ValueError:
-                            continue
+                with transaction.atomic(), bump_once():
+                    fw = form.save()
+                    cells = []
+                    for crit in criteria_list:
+                        nilai = request.POST.get(f'score_{crit.id}')
+                        if nilai:
+                            try:
+                                cells.append((fw.id, crit.id, float(nilai)))
+                            except ValueError:
+                                continue
+                    upsert_scores(cells)
                 messages.success(request, f'Framework "{fw.name}" berhasil ditambahkan.')
                 return redirect('framework_list')
             else:
@@ -200,22 +259,23 @@ def edit_framework_scores(request, framework_id):
     criteria_list = Criteria.objects.all()
 
     # Ambil nilai existing jadi dict {criteria.id: value}
-    existing = FrameworkScore.objects.filter(framework=framework)
-    scores = {s.criteria.id: s.value for s in existing}
+    scores = dict(
+        FrameworkScore.objects.filter(framework=framework).values_list('criteria_id', 'value')
+    )
 
     if request.method == 'POST':
+        changes = {}
         for criteria in criteria_list:
             key = f'score_{criteria.id}'
             if key in request.POST:
                 raw = request.POST[key]
                 try:
-                    FrameworkScore.objects.update_or_create(
-                        framework=framework,
-                        criteria=criteria,
-                        defaults={'value': float(raw)}
-                    )
+                    changes[(framework.id, criteria.id)] = float(raw)
                 except ValueError:
                     messages.error(request, f'Nilai tidak valid untuk kriteria {criteria.name}')
+        # Hanya sel yang berubah yang ditulis, dalam satu upsert
+        existing = {(framework.id, cid): value for cid, value in scores.items()}
+        upsert_scores(dirty_cells(changes, existing))
         messages.success(request, f'Skor untuk "{framework.name}" berhasil diperbarui.')
         return redirect('framework_list')
 
@@ -237,123 +297,606 @@ def delete_framework(request, framework_id):
         'framework': framework
     })
 # Framework List
+FRAMEWORK_ORDERINGS = {
+    'name': ('name', 'id'),
+    'id': ('id',),
+}
+
+
+def _framework_page(request):
+    order = request.GET.get('order', 'name')
+    if order not in FRAMEWORK_ORDERINGS:
+        order = 'name'
+    page = keyset_page(
+        Framework.objects.all(),
+        FRAMEWORK_ORDERINGS[order],
+        getattr(settings, 'SPK_FRAMEWORK_PAGE_SIZE', 50),
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    return order, page
+
+
+def _score_cell(value):
+    if value is None:
+        return ('text-muted', '-')
+    if value == 0:
+        return ('text-muted', '0')
+    if float(value).is_integer():
+        return ('badge bg-primary', str(int(value)))
+    return ('badge bg-primary', floatformat(value, 0))
+
+
+def _framework_rows(page, criteria_list):
+    """
+    Baris tabel siap tampil untuk satu halaman framework:
+    (no, nama, deskripsi, [(css, teks) per kriteria], edit_url, delete_url).
+    Semua skor halaman ini diambil dalam satu query.
+    """
+    grid = {fw.id: {c.id: 0 for c in criteria_list} for fw in page}
+    scores = FrameworkScore.objects.filter(framework_id__in=list(grid)).values_list(
+        'framework_id', 'criteria_id', 'value'
+    )
+    for framework_id, criteria_id, value in scores:
+        if criteria_id in grid[framework_id]:
+            grid[framework_id][criteria_id] = value
+
+    edit_url = reverse('edit_framework_scores', args=[0]).replace('/0/', '/{}/')
+    delete_url = reverse('delete_framework', args=[0]).replace('/0/', '/{}/')
+    rows = []
+    for number, fw in enumerate(page, start=page.start_index + 1):
+        fw_scores = grid[fw.id]
+        rows.append((
+            number,
+            fw.name,
+            Truncator(fw.description or '-').chars(50),
+            [_score_cell(fw_scores[c.id]) for c in criteria_list],
+            edit_url.format(fw.id),
+            delete_url.format(fw.id),
+        ))
+    return rows
+
+
+def _framework_rows_context(request, order, page, criteria_list):
+    return {
+        # Dievaluasi malas oleh template: tidak dihitung bila fragment cache hit
+        'framework_data': lambda: _framework_rows(page, criteria_list),
+        'data_version': get_data_version(),
+        'page_key': f"{order}:{request.GET.get('after', '')}:{request.GET.get('before', '')}",
+        'fragment_timeout': getattr(settings, 'SPK_FRAGMENT_CACHE_TIMEOUT', 600),
+    }
+
+
+@replica_reads
 @login_required
 def framework_list(request):
-    criteria_list = Criteria.objects.all()
-    frameworks = Framework.objects.all()
+    criteria_list = list(Criteria.objects.all())
     total_weight = sum(c.weight for c in criteria_list)
-    
-    # Siapkan data untuk tabel dengan scores
-    framework_data = []
-    for fw in frameworks:
-        fw_scores = {}
-        for criteria in criteria_list:
-            score = FrameworkScore.objects.filter(framework=fw, criteria=criteria).first()
-            fw_scores[criteria.id] = score.value if score else 0
-        
-        framework_data.append({
-            'framework': fw,
-            'scores': fw_scores
-        })
+    total_frameworks = Framework.objects.count()
+    order, page = _framework_page(request)
     
     return render(request, 'framework_list.html', {
-        'framework_data': framework_data,
+        **_framework_rows_context(request, order, page, criteria_list),
         'criteria_list': criteria_list,
         'total_weight': total_weight,
-        'is_ready': len(frameworks) > 0
+        'total_frameworks': total_frameworks,
+        'page': page,
+        'page_length': len(page),
+        'order': order,
+        'is_ready': total_frameworks > 0
+    })
+
+
+@replica_reads
+@login_required
+def framework_rows(request):
+    # Fragment baris tabel untuk tombol "Muat lebih banyak" di framework_list
+    criteria_list = list(Criteria.objects.all())
+    order, page = _framework_page(request)
+    html = render_to_string(
+        '_framework_rows.html',
+        _framework_rows_context(request, order, page, criteria_list),
+        request=request,
+    )
+    next_url = None
+    if page.next_cursor:
+        next_url = f"{reverse('framework_rows')}?order={order}&after={page.next_cursor}"
+    return JsonResponse({
+        'html': html,
+        'order': order,
+        'next': page.next_cursor,
+        'next_url': next_url,
+        'end_index': page.start_index + len(page),
+    })
+
+@login_required
+def score_grid(request):
+    # Editor skor bergaya spreadsheet: GET menampilkan grid satu halaman,
+    # POST (JSON) menerima hanya sel yang berubah dan menulisnya sekaligus.
+    # ?rater=1 mengedit skor milik user sendiri (RaterScore) untuk mode kelompok.
+    rater_mode = request.GET.get('rater') == '1'
+    if rater_mode:
+        scores = RaterScore.objects.filter(rater=request.user)
+    else:
+        scores = FrameworkScore.objects.all()
+
+    if request.method == 'POST':
+        try:
+            payload = json.loads(request.body)
+            changes = {}
+            invalid = []
+            for cell in payload.get('changes', []):
+                key = (int(cell['framework']), int(cell['criteria']))
+                try:
+                    changes[key] = parse_score(cell.get('value'))
+                except ValueError as e:
+                    invalid.append({'framework': key[0], 'criteria': key[1], 'error': str(e)})
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return JsonResponse({'error': 'Format perubahan tidak valid.'}, status=400)
+        if invalid:
+            return JsonResponse({'error': 'Ada nilai sel yang tidak valid.', 'cells': invalid}, status=400)
+
+        framework_ids = {fid for fid, _ in changes}
+        criteria_ids = {cid for _, cid in changes}
+        known_frameworks = set(Framework.objects.filter(id__in=framework_ids).values_list('id', flat=True))
+        known_criteria = set(Criteria.objects.filter(id__in=criteria_ids).values_list('id', flat=True))
+        unknown = [
+            {'framework': fid, 'criteria': cid}
+            for fid, cid in changes
+            if fid not in known_frameworks or cid not in known_criteria
+        ]
+        if unknown:
+            return JsonResponse({'error': 'Framework atau kriteria tidak ditemukan.', 'cells': unknown}, status=400)
+
+        existing = {
+            (fid, cid): value
+            for fid, cid, value in scores.filter(
+                framework_id__in=framework_ids, criteria_id__in=criteria_ids
+            ).values_list('framework_id', 'criteria_id', 'value')
+        }
+        cells = dirty_cells(changes, existing)
+        if rater_mode:
+            updated = upsert_rater_scores(request.user.id, cells)
+        else:
+            updated = upsert_scores(cells)
+        return JsonResponse({'updated': updated, 'received': len(changes)})
+
+    criteria_list = list(Criteria.objects.all())
+    order, page = _framework_page(request)
+    grid = {fw.id: {} for fw in page}
+    for fid, cid, value in scores.filter(framework_id__in=list(grid)).values_list(
+        'framework_id', 'criteria_id', 'value'
+    ):
+        grid[fid][cid] = value
+    rows = [
+        (fw.id, fw.name, [(c.id, '' if grid[fw.id].get(c.id) is None else grid[fw.id][c.id]) for c in criteria_list])
+        for fw in page
+    ]
+    return render(request, 'score_grid.html', {
+        'criteria_list': criteria_list,
+        'rows': rows,
+        'page': page,
+        'order': order,
+        'rater_mode': rater_mode,
     })
 
+
+@replica_reads
 @login_required
 def calculate_saw(request):
-    # Ambil semua kriteria dan framework
+    # Ambil semua kriteria dan cek ada framework
     criteria_list = list(Criteria.objects.all())
-    frameworks   = list(Framework.objects.all())
 
     # Validasi data
-    if not criteria_list or not frameworks:
+    if not criteria_list or not Framework.objects.exists():
         messages.error(request, 'Data kriteria atau framework masih kosong.')
         return redirect('framework_list')
 
+    # Bobot global atau profil bobot milik user (?profile=nama)
+    profile_name = request.GET.get('profile', '')
+    weights = None
+    if profile_name:
+        stored = weight_profiles.get_profile(request.user, profile_name)
+        if stored is None:
+            messages.error(request, f'Profil bobot "{profile_name}" tidak ditemukan.')
+            return redirect('weight_profile_list')
+        weights = weight_profiles.profile_weights(criteria_list, stored)
+
     # Total bobot harus 1.0
-    total_weight = sum(c.weight for c in criteria_list)
+    total_weight = sum(weights if weights is not None else (c.weight for c in criteria_list))
     if abs(total_weight - 1.0) > 0.001:
         messages.error(request, f'Total bobot kriteria harus 1.0 (saat ini: {total_weight:.3f}).')
         return redirect('framework_list')
 
-    # 1. Bangun matriks X dan cari max/min per kriteria
-    raw_values = {}  # {fw.id: {c.id: value, ...}, ...}
-    max_vals   = {}
-    min_vals   = {}
-
-    # Inisialisasi max/min
-    for c in criteria_list:
-        max_vals[c.id] = 0
-        min_vals[c.id] = float('inf')
-
-    # Isi raw_values dan update max/min
-    for fw in frameworks:
-        vals = {}
-        for c in criteria_list:
-            fs = FrameworkScore.objects.filter(framework=fw, criteria=c).first()
-            x = fs.value if fs and fs.value is not None else 0.0
-            vals[c.id] = x
-
-            if x > max_vals[c.id]:
-                max_vals[c.id] = x
-            if x < min_vals[c.id]:
-                min_vals[c.id] = x
-        raw_values[fw.id] = vals
-
-    # Jika semua nilai kriteria nol, atur min=0, max=1 agar tidak div/0
-    for c in criteria_list:
-        if max_vals[c.id] == 0:
-            max_vals[c.id] = 1
-        if min_vals[c.id] == float('inf'):
-            min_vals[c.id] = 0
-
-    # 2. Normalisasi R dan hitung skor V
-    final_scores = []  # list of dict {framework, score, score_display, percentage, rank, medal}
-
-    for fw in frameworks:
-        total_score = 0.0
-        for c in criteria_list:
-            x = raw_values[fw.id][c.id]
-            if c.attribute == 'benefit':
-                # Benefit: x / max
-                r = x / max_vals[c.id] if max_vals[c.id] > 0 else 0
-            else:
-                # Cost: min / x
-                r = (min_vals[c.id] / x) if x > 0 else 0
-
-            total_score += r * c.weight
-
-        final_scores.append({
-            'framework': fw.name,
-            'score': total_score,
-            'score_display': round(total_score, 6),
-            'percentage': round(total_score * 100, 2),
-        })
-
-    # 3. Urutkan berdasarkan score dan beri peringkat/medali
-    final_scores.sort(key=lambda d: d['score'], reverse=True)
-    for idx, item in enumerate(final_scores, start=1):
-        item['rank'] = idx
-        if idx == 1:
-            item['medal'] = '🥇'
-        elif idx == 2:
-            item['medal'] = '🥈'
-        elif idx == 3:
-            item['medal'] = '🥉'
-        else:
-            item['medal'] = ''
+    data_version = get_data_version()
+    result = saw.cached_result(criteria_list, weights, data_version)
+    final_scores = result['ranking']
 
     # Framework terbaik
     best_framework = final_scores[0] if final_scores else None
 
+    # Matriks X, R dan kontribusi: hanya halaman pertama, sisanya via saw_matrix.
+    # Dipanggil template hanya saat fragment cache-nya miss.
+    preview = getattr(settings, 'SPK_MATRIX_PAGE_SIZE', 20)
+
+    def matrix_preview(kind):
+        return lambda: saw.matrix_page(criteria_list, kind, 0, preview, weights, data_version)[0]
+
     return render(request, 'result.html', {
         'criteria_list': criteria_list,
+        'criteria_weights': list(zip(criteria_list, weights or [c.weight for c in criteria_list])),
+        'profile_name': profile_name,
         'final_scores': final_scores,
+        # Baris tabel ranking hanya dibangun saat fragment cache-nya miss
+        'ranking_rows': lambda: saw.ranking_rows(final_scores),
         'best_framework': best_framework,
+        'decision_matrix': matrix_preview('decision'),
+        'normalized_matrix': matrix_preview('normalized'),
+        'weighted_matrix': matrix_preview('weighted'),
+        'matrix_total': len(final_scores),
+        'matrix_page_size': preview,
+        'data_version': data_version,
+        'weights_key': result['key'],
+        'fragment_timeout': getattr(settings, 'SPK_FRAGMENT_CACHE_TIMEOUT', 600),
+    })
+
+
+@replica_reads
+@login_required
+def saw_matrix(request):
+    # Halaman matriks X / R / kontribusi dalam JSON untuk dataset besar
+    kind = request.GET.get('kind', 'decision')
+    if kind not in ('decision', 'normalized', 'weighted'):
+        return JsonResponse({'error': 'Jenis matriks tidak dikenal.'}, status=400)
+    try:
+        offset = max(int(request.GET.get('offset', 0)), 0)
+        limit = min(max(int(request.GET.get('limit', 100)), 1), 500)
+    except ValueError:
+        return JsonResponse({'error': 'offset/limit harus angka.'}, status=400)
+
+    criteria_list = list(Criteria.objects.all())
+    weights = None
+    profile_name = request.GET.get('profile', '')
+    if profile_name:
+        stored = weight_profiles.get_profile(request.user, profile_name)
+        if stored is None:
+            return JsonResponse({'error': 'Profil bobot tidak ditemukan.'}, status=404)
+        weights = weight_profiles.profile_weights(criteria_list, stored)
+    rows, total = saw.matrix_page(criteria_list, kind, offset, limit, weights)
+    return JsonResponse({
+        'kind': kind,
+        'criteria': [c.name for c in criteria_list],
+        'total': total,
+        'offset': offset,
+        'rows': [{'framework': name, 'values': values} for name, values in rows],
+    })
+
+
+async def ranking_stream(request):
+    # SSE: diff ranking (bobot default) setiap kali data version berubah.
+    # login_required baru mendukung view async sejak Django 5.1; cek di sini.
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Stream ranking membutuhkan server ASGI (saw_project.asgi).'}, status=501)
+    response = StreamingHttpResponse(
+        live.ranking_events(request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _pareto_result(criteria_list, data_version=None):
+    return cached(
+        'pareto-layers',
+        lambda: pareto.pareto_layers(saw.load_matrix(criteria_list)),
+        version=data_version,
+    )
+
+
+@replica_reads
+@login_required
+def pareto_front(request):
+    # Framework yang tidak didominasi + ringkasan lapisan dominansi
+    criteria_list = list(Criteria.objects.all())
+    if not criteria_list or not Framework.objects.exists():
+        messages.error(request, 'Data kriteria atau framework masih kosong.')
+        return redirect('framework_list')
+
+    try:
+        offset = max(int(request.GET.get('offset', 0)), 0)
+    except ValueError:
+        offset = 0
+    page_size = getattr(settings, 'SPK_MATRIX_PAGE_SIZE', 20)
+
+    groups = pareto.group_layers(_pareto_result(criteria_list, get_data_version()))
+    front = groups[0][1] if groups else []
+    # Front bisa berisi ribuan framework: tampilkan per halaman
+    offset = min(offset, max(len(front) - 1, 0) // page_size * page_size)
+    page = front[offset:offset + page_size]
+    return render(request, 'pareto.html', {
+        'criteria_list': criteria_list,
+        'front_rows': saw.matrix_rows([d['framework'] for d in page], [d['values'] for d in page]),
+        'front_size': len(front),
+        'page_start': offset + 1 if page else 0,
+        'page_end': offset + len(page),
+        'previous_offset': max(offset - page_size, 0) if offset else None,
+        'next_offset': offset + page_size if offset + page_size < len(front) else None,
+        'layer_summary': [
+            (layer, len(items), ', '.join(d['framework'] for d in items[:5]), max(len(items) - 5, 0))
+            for layer, items in groups
+        ],
+        'total_frameworks': sum(len(items) for _, items in groups),
+    })
+
+
+@replica_reads
+@login_required
+def pareto_data(request):
+    # ?layers=N membatasi jumlah lapisan yang dikirim (default semua)
+    try:
+        max_layer = int(request.GET.get('layers', 0))
+    except ValueError:
+        return JsonResponse({'error': 'layers harus angka.'}, status=400)
+
+    criteria_list = list(Criteria.objects.all())
+    items = _pareto_result(criteria_list)
+    if max_layer > 0:
+        items = [d for d in items if d['layer'] <= max_layer]
+    return JsonResponse({
+        'criteria': [{'name': c.name, 'attribute': c.attribute} for c in criteria_list],
+        'layers': max((d['layer'] for d in items), default=0),
+        'front': [d['framework'] for d in items if d['layer'] == 1],
+        'frameworks': [
+            {'id': d['framework_id'], 'framework': d['framework'], 'layer': d['layer']}
+            for d in items
+        ],
+    })
+
+
+@replica_reads
+@login_required
+def similar_frameworks(request, framework_id):
+    # k framework terdekat (jarak Euclidean berbobot pada matriks R)
+    try:
+        k = min(max(int(request.GET.get('k', 5)), 1), 100)
+    except ValueError:
+        return JsonResponse({'error': 'k harus angka.'}, status=400)
+
+    index = similarity.get_index()
+    neighbours = index.neighbours(framework_id, k)
+    if neighbours is None:
+        return JsonResponse({'error': 'Framework tidak ditemukan.'}, status=404)
+    return JsonResponse({
+        'framework_id': framework_id,
+        'framework': index.framework_names[index.row_index[framework_id]],
+        'k': k,
+        'neighbours': [dict(n, distance=round(n['distance'], 6)) for n in neighbours],
+    })
+
+
+@replica_reads
+@login_required
+def compare_methods(request):
+    # SAW, WP, TOPSIS dan WASPAS berdampingan + kesepakatan rank antar metode
+    criteria_list = list(Criteria.objects.all())
+    if not criteria_list or not Framework.objects.exists():
+        messages.error(request, 'Data kriteria atau framework masih kosong.')
+        return redirect('framework_list')
+    total_weight = sum(c.weight for c in criteria_list)
+    if abs(total_weight - 1.0) > 0.001:
+        messages.error(request, f'Total bobot kriteria harus 1.0 (saat ini: {total_weight:.3f}).')
+        return redirect('framework_list')
+
+    selected = [name for name in request.GET.get('methods', '').split(',') if name in mcdm.METHODS]
+    result = mcdm.compare_methods(criteria_list, selected or None)
+    if request.GET.get('format') == 'json':
+        names = [name for name, _ in result['methods']]
+        return JsonResponse({
+            'methods': names,
+            'winners': result['winners'],
+            'agreement': [
+                {'a': a, 'b': b, 'spearman': rho, 'same_winner': same}
+                for a, b, rho, same in result['agreement']
+            ],
+            'frameworks': [
+                {
+                    'framework_id': row['framework_id'],
+                    'framework': row['framework'],
+                    'rank_spread': row['rank_spread'],
+                    **{name: {'score': score, 'rank': rank} for name, (score, rank) in zip(names, row['results'])},
+                }
+                for row in result['rows']
+            ],
+        })
+
+    page_size = getattr(settings, 'SPK_FRAMEWORK_PAGE_SIZE', 50)
+    return render(request, 'compare_methods.html', {
+        'result': result,
+        'rows': result['rows'][:page_size],
+        'total_frameworks': len(result['rows']),
+        'winners': [(label, result['winners'].get(name)) for name, label in result['methods']],
+        'all_methods': [(name, label) for name, (label, _) in mcdm.METHODS.items()],
+        'selected': [name for name, _ in result['methods']],
+    })
+
+
+# "+07:00" di query string tanpa URL-encode sampai sebagai " 07:00"
+_DECODED_OFFSET_RE = re.compile(r'(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?) (\d{2}:?\d{2})$')
+
+
+def _parse_as_of(text):
+    """Waktu ISO (offset ``Z``/``+HH:MM`` boleh) menjadi datetime aware, atau None."""
+    when = parse_datetime(_DECODED_OFFSET_RE.sub(r'\1+\2', text.strip()))
+    if when is not None and timezone.is_naive(when):
+        when = timezone.make_aware(when)
+    return when
+
+
+def _ranking_for(request, criteria_list, spec):
+    """
+    Ranking untuk satu sisi perbandingan: ``global``, ``profile:<nama>`` atau
+    ``asof:<waktu ISO>``. Mengembalikan None jika spesifikasi tidak valid.
+    """
+    kind, _, arg = spec.partition(':')
+    if kind in ('', 'global'):
+        return saw.cached_result(criteria_list)['ranking']
+    if kind == 'profile':
+        stored = weight_profiles.get_profile(request.user, arg)
+        if stored is None:
+            return None
+        return saw.cached_result(criteria_list, weight_profiles.profile_weights(criteria_list, stored))['ranking']
+    if kind == 'asof':
+        when = _parse_as_of(arg)
+        if when is None:
+            return None
+        return cached(f'history-ranking:{when.isoformat()}', lambda: history.ranking_as_of(when))['ranking']
+    return None
+
+
+@replica_reads
+@login_required
+def compare_rankings(request):
+    # ?a=global&b=profile:Tim%20A (atau asof:2026-10-01T09:00) &k=10&movers=10
+    criteria_list = list(Criteria.objects.all())
+    try:
+        k = min(max(int(request.GET.get('k', 10)), 1), 1000)
+        movers = min(max(int(request.GET.get('movers', 10)), 0), 1000)
+    except ValueError:
+        return JsonResponse({'error': 'k/movers harus angka.'}, status=400)
+
+    spec_a = request.GET.get('a', 'global')
+    spec_b = request.GET.get('b', 'global')
+    ranking_a = _ranking_for(request, criteria_list, spec_a)
+    ranking_b = _ranking_for(request, criteria_list, spec_b)
+    invalid = [spec for spec, ranking in ((spec_a, ranking_a), (spec_b, ranking_b)) if ranking is None]
+    if invalid:
+        return JsonResponse({'error': 'Ranking tidak ditemukan.', 'specs': invalid}, status=400)
+
+    result = rank_compare.compare_rankings(ranking_a, ranking_b, k=k, movers=movers)
+    return JsonResponse(dict(result, a=spec_a, b=spec_b))
+
+
+@replica_reads
+@login_required
+def group_ranking(request):
+    # Ranking konsensus dari skor semua rater + ranking per rater + sebaran
+    criteria_list = list(Criteria.objects.all())
+    if not criteria_list or not Framework.objects.exists():
+        messages.error(request, 'Data kriteria atau framework masih kosong.')
+        return redirect('framework_list')
+    total_weight = sum(c.weight for c in criteria_list)
+    if abs(total_weight - 1.0) > 0.001:
+        messages.error(request, f'Total bobot kriteria harus 1.0 (saat ini: {total_weight:.3f}).')
+        return redirect('framework_list')
+
+    method = request.GET.get('method', 'mean')
+    if method not in group.AGGREGATION_METHODS:
+        method = 'mean'
+    rater_weights = {}
+    for key, value in request.GET.items():
+        if key.startswith('weight_'):
+            try:
+                rater_weights[int(key[len('weight_'):])] = max(float(value), 0.0)
+            except ValueError:
+                continue
+
+    result = group.group_ranking(criteria_list, method, rater_weights)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'method': result['method'],
+            'kendall_w': result['kendall_w'],
+            'raters': [{'id': rid, 'username': name, 'weight': w} for rid, name, w in result['raters']],
+            'ranking': [
+                {key: item[key] for key in (
+                    'framework_id', 'framework', 'score', 'rank', 'rater_ranks', 'rank_min', 'rank_max', 'rank_stdev'
+                )}
+                for item in result['ranking']
+            ],
+        })
+    return render(request, 'group_ranking.html', {
+        'result': result,
+        'method': method,
+        'methods': list(group.AGGREGATION_METHODS.items()),
+    })
+
+
+@login_required
+def ranking_history(request):
+    # Ranking pada waktu tertentu (?as_of=YYYY-MM-DDTHH:MM), dibangun dari
+    # snapshot terdekat + replay log perubahan
+    as_of_text = request.GET.get('as_of', '')
+    as_of = _parse_as_of(as_of_text) if as_of_text else None
+    if as_of_text and as_of is None:
+        messages.error(request, 'Format waktu tidak valid.')
+        return redirect('ranking_history')
+
+    result = None
+    if as_of is not None:
+        result = cached(f'history-ranking:{as_of.isoformat()}', lambda: history.ranking_as_of(as_of))
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'as_of': as_of.isoformat(),
+                'snapshot': result['snapshot'].isoformat() if result['snapshot'] else None,
+                'replayed': result['replayed'],
+                'criteria': [{'name': c.name, 'weight': c.weight, 'attribute': c.attribute} for c in result['criteria']],
+                'ranking': [
+                    {key: item[key] for key in ('framework_id', 'framework', 'score', 'rank')}
+                    for item in result['ranking']
+                ],
+            })
+
+    return render(request, 'history.html', {
+        'as_of': as_of,
+        'as_of_value': timezone.localtime(as_of).strftime('%Y-%m-%dT%H:%M') if as_of else '',
+        'result': result,
+        'ranking_rows': saw.ranking_rows(result['ranking']) if result else [],
+    })
+
+
+@login_required
+def weight_profile_list(request):
+    criteria_list = list(Criteria.objects.all())
+
+    if request.method == 'POST':
+        name = request.POST.get('name', '').strip()
+        if request.POST.get('action') == 'delete':
+            if weight_profiles.delete_profile(request.user, name):
+                messages.success(request, f'Profil bobot "{name}" berhasil dihapus.')
+            return redirect('weight_profile_list')
+
+        if not name or len(name) > weight_profiles.MAX_NAME_LENGTH:
+            messages.error(request, 'Nama profil wajib diisi (maksimal 50 karakter).')
+            return redirect('weight_profile_list')
+        weights = {}
+        try:
+            for c in criteria_list:
+                weights[c.id] = float(request.POST.get(f'weight_{c.id}') or 0)
+        except ValueError:
+            messages.error(request, 'Bobot harus berupa angka.')
+            return redirect('weight_profile_list')
+        if any(w < 0 for w in weights.values()):
+            messages.error(request, 'Bobot tidak boleh negatif.')
+            return redirect('weight_profile_list')
+        total_weight = sum(weights.values())
+        if abs(total_weight - 1.0) > 0.001:
+            messages.error(request, f'Total bobot profil harus 1.0 (saat ini: {total_weight:.3f}).')
+            return redirect('weight_profile_list')
+
+        weight_profiles.save_profile(request.user, name, weights)
+        messages.success(request, f'Profil bobot "{name}" berhasil disimpan.')
+        return redirect('weight_profile_list')
+
+    profiles = [
+        (name, [(c.name, stored.get(str(c.id), 0.0)) for c in criteria_list])
+        for name, stored in sorted(weight_profiles.list_profiles(request.user).items())
+    ]
+    return render(request, 'weight_profiles.html', {
+        'criteria_list': criteria_list,
+        'profiles': profiles,
     })
 
 
@@ -363,175 +906,190 @@ def upload_csv(request):
         form = CSVUploadForm(request.POST, request.FILES)
         if form.is_valid():
             csv_file = request.FILES['csv_file']
+            started = time.perf_counter()
+            import_rows = 0
             
             try:
-                # Read & decode
-                file_data = csv_file.read().decode('utf-8')
-                io_string = io.StringIO(file_data)
-                reader = csv.DictReader(io_string)
+                # Read & decode (sekali saja; file upload tidak bisa dibaca ulang)
+                file_data = csv_file.read().decode('utf-8-sig')
+                first_line = file_data.split('\n', 1)[0]
+                delimiter = '\t' if '\t' in first_line else ','
+                reader = csv.DictReader(io.StringIO(file_data), delimiter=delimiter)
                 
                 # --- normalize headers: strip spaces off each fieldname ---
                 if reader.fieldnames:
                     reader.fieldnames = [h.strip() for h in reader.fieldnames]
                 
-                filename = csv_file.name.lower()
+                # Satu transaksi dan satu kenaikan data version untuk seluruh file
+                with transaction.atomic(), bump_once():
+                    filename = csv_file.name.lower()
                 
-                # 1) Upload criteria
-                if 'criteria' in filename:
-                    expected = ['name', 'weight', 'attribute']
-                    missing = [c for c in expected if c not in reader.fieldnames]
-                    if missing:
-                        messages.error(request, f'Kolom criteria hilang: {", ".join(missing)}')
-                        return redirect('framework_list')
-
-                    success_count = 0
-                    for idx, row in enumerate(reader, start=1):
-                        try:
-                            Criteria.objects.update_or_create(
-                                name=row['name'].strip(),
-                                defaults={
-                                    'weight': float(row['weight']),
-                                    'attribute': row['attribute'].strip().lower()
-                                }
-                            )
-                            success_count += 1
-                        except Exception as e:
-                            messages.warning(request,
-                                             f'Error di baris {idx} (criteria): {e}'
-                                             )
-                    messages.success(request, f'{success_count} kriteria berhasil diupload.')
-                
-                # 2) Upload framework & scores (data)
-                file_data = csv_file.read().decode('utf-8')
-                io_string = io.StringIO(file_data)
-                reader = csv.DictReader(io_string, delimiter='\t')  # <-- penting, sesuaikan delimiter
-                if reader.fieldnames:
-                    reader.fieldnames = [h.strip().lower() for h in reader.fieldnames]
-                    
-                elif 'framework' in filename or 'data' in filename:
-                    expected = [
-                        'Framework',
-                        'Deskripsi',
-                        'Performa (req/s)',
-                        'Skalabilitas (1-5)',
-                        'Komunitas (User)',
-                        'Kemudahan Belajar (Jam)',
-                        'Pemeliharaan & Update (per Tahun)'
-                    ]
-                    missing = [c for c in expected if c not in reader.fieldnames]
-                    if missing:
-                        messages.error(request,
-                                       f'Kolom data hilang: {", ".join(missing)}'
-                                       )
-                        return redirect('framework_list')
-
-                    row_count = 0
-                    score_count = 0
-
-                    column_mapping = {
-                        'Performa (req/s)': 'Performa',
-                        'Skalabilitas (1-5)': 'Skalabilitas',
-                        'Komunitas (User)': 'Komunitas',
-                        'Kemudahan Belajar (Jam)': 'Kemudahan Belajar',
-                        'Pemeliharaan & Update (per Tahun)': 'Pemeliharaan & Update',
-                    }
-
-                    for row in reader:
-                        name = row.get('Framework', '').strip()
-                        if not name:
-                            continue
-                        row_count += 1
-
-                        framework, created = Framework.objects.get_or_create(
-                            name=name,
-                            defaults={'description': f'Framework {name}'}
-                        )
-
-                        for csv_col, crit_name in column_mapping.items():
-                            raw = row.get(csv_col, '').strip()
-                            if not raw:
-                                continue
+                    # 1) Upload criteria
+                    if 'criteria' in filename:
+                        expected = ['name', 'weight', 'attribute']
+                        missing = [c for c in expected if c not in reader.fieldnames]
+                        if missing:
+                            messages.error(request, f'Kolom criteria hilang: {", ".join(missing)}')
+                            return redirect('framework_list')
+
+                        success_count = 0
+                        for idx, row in enumerate(reader, start=1):
                             try:
-                                val = float(raw)
-                            except ValueError:
-                                messages.warning(
-                                    request,
-                                    f'Nilai tidak valid di kolom "{csv_col}", baris {row_count}: "{raw}"'
-                                )
-                                continue
-
-                            crit = Criteria.objects.filter(name=crit_name).first()
-                            if not crit:
-                                messages.warning(
-                                    request,
-                                    f'Criteria "{crit_name}" tidak ditemukan (baris {row_count}).'
-                                )
+                                # Savepoint: baris yang gagal tidak membatalkan baris lain
+                                with transaction.atomic():
+                                    Criteria.objects.update_or_create(
+                                        name=row['name'].strip(),
+                                        defaults={
+                                            'weight': float(row['weight']),
+                                            'attribute': row['attribute'].strip().lower()
+                                        }
+                                    )
+                                success_count += 1
+                            except Exception as e:
+                                messages.warning(request,
+                                                 f'Error di baris {idx} (criteria): {e}'
+                                                 )
+                        messages.success(request, f'{success_count} kriteria berhasil diupload.')
+                        import_rows += success_count
+                
+                    # 2) Upload framework & scores (data)
+                    elif 'framework' in filename or 'data' in filename:
+                        expected = [
+                            'Framework',
+                            'Performa (req/s)',
+                            'Skalabilitas (1-5)',
+                            'Komunitas (User)',
+                            'Kemudahan Belajar (Jam)',
+                            'Pemeliharaan & Update (per Tahun)'
+                        ]
+                        missing = [c for c in expected if c not in reader.fieldnames]
+                        if missing:
+                            messages.error(request,
+                                           f'Kolom data hilang: {", ".join(missing)}'
+                                           )
+                            return redirect('framework_list')
+
+                        row_count = 0
+                        cells = []
+
+                        column_mapping = {
+                            'Performa (req/s)': 'Performa',
+                            'Skalabilitas (1-5)': 'Skalabilitas',
+                            'Komunitas (User)': 'Komunitas',
+                            'Kemudahan Belajar (Jam)': 'Kemudahan Belajar',
+                            'Pemeliharaan & Update (per Tahun)': 'Pemeliharaan & Update',
+                        }
+                        criteria_by_name = {
+                            c.name: c for c in Criteria.objects.filter(name__in=column_mapping.values())
+                        }
+                        # Nama framework tidak unik: nama ganda dipetakan ke id terkecil
+                        framework_ids = {}
+                        for framework_id, fw_name in Framework.objects.order_by('-id').values_list('id', 'name'):
+                            framework_ids[fw_name] = framework_id
+
+                        for row in reader:
+                            name = row.get('Framework', '').strip()
+                            if not name:
                                 continue
-
-                            FrameworkScore.objects.update_or_create(
-                                framework=framework,
-                                criteria=crit,
-                                defaults={'value': val}
-                            )
-                            score_count += 1
-
-                    messages.success(
-                        request,
-                        f'{row_count} baris framework diproses (baru maupun update).'
-                    )
-                    if score_count:
+                            row_count += 1
+
+                            if name not in framework_ids:
+                                framework_ids[name] = Framework.objects.create(
+                                    name=name,
+                                    description=(row.get('Deskripsi') or '').strip() or f'Framework {name}'
+                                ).id
+
+                            for csv_col, crit_name in column_mapping.items():
+                                raw = row.get(csv_col, '').strip()
+                                if not raw:
+                                    continue
+                                try:
+                                    val = float(raw)
+                                except ValueError:
+                                    messages.warning(
+                                        request,
+                                        f'Nilai tidak valid di kolom "{csv_col}", baris {row_count}: "{raw}"'
+                                    )
+                                    continue
+
+                                crit = criteria_by_name.get(crit_name)
+                                if not crit:
+                                    messages.warning(
+                                        request,
+                                        f'Criteria "{crit_name}" tidak ditemukan (baris {row_count}).'
+                                    )
+                                    continue
+
+                                cells.append((framework_ids[name], crit.id, val))
+
+                        score_count = len(cells)
+                        upsert_scores(cells)
+                        import_rows += row_count
                         messages.success(
                             request,
-                            f'{score_count} skor berhasil diupload.'
+                            f'{row_count} baris framework diproses (baru maupun update).'
                         )
+                        if score_count:
+                            messages.success(
+                                request,
+                                f'{score_count} skor berhasil diupload.'
+                            )
+                        else:
+                            messages.info(
+                                request,
+                                'Tidak ada skor yang diupload.'
+                            )
+
+                    # 3) Upload khusus score saja
+                    elif 'score' in filename:
+                        reader.fieldnames = [h.lower() for h in reader.fieldnames or []]
+                        expected = ['framework', 'criteria', 'value']
+                        missing = [c for c in expected if c not in reader.fieldnames]
+                        if missing:
+                            messages.error(request,
+                                           f'Kolom score hilang: {", ".join(missing)}'
+                                           )
+                            return redirect('framework_list')
+
+                        framework_ids = {}
+                        for framework_id, fw_name in Framework.objects.order_by('-id').values_list('id', 'name'):
+                            framework_ids[fw_name] = framework_id
+                        criteria_ids = dict(Criteria.objects.values_list('name', 'id'))
+                        cells = []
+                        for idx, row in enumerate(reader, start=1):
+                            try:
+                                fw_name = row['framework'].strip()
+                                if fw_name not in framework_ids:
+                                    raise Framework.DoesNotExist
+                                crit_name = row['criteria'].strip()
+                                if crit_name not in criteria_ids:
+                                    raise Criteria.DoesNotExist
+                                val = float(row['value'])
+                                cells.append((framework_ids[fw_name], criteria_ids[crit_name], val))
+                            except Framework.DoesNotExist:
+                                messages.warning(request,
+                                                 f'Framework "{row.get("framework")}" tidak ditemukan (baris {idx}).'
+                                                 )
+                            except Criteria.DoesNotExist:
+                                messages.warning(request,
+                                                 f'Criteria "{row.get("criteria")}" tidak ditemukan (baris {idx}).'
+                                                 )
+                            except Exception as e:
+                                messages.warning(request,
+                                                 f'Error di baris {idx} (score): {e}'
+                                                 )
+                        success_count = len(cells)
+                        upsert_scores(cells)
+                        messages.success(request, f'{success_count} score berhasil diupload.')
+                        import_rows += success_count
+
                     else:
-                        messages.info(
+                        messages.error(
                             request,
-                            'Tidak ada skor yang diupload.'
+                            'Nama file harus mengandung "criteria", "framework", "data", atau "score".'
                         )
 
-                # 3) Upload khusus score saja
-                elif 'score' in filename:
-                    expected = ['framework', 'criteria', 'value']
-                    missing = [c for c in expected if c not in reader.fieldnames]
-                    if missing:
-                        messages.error(request,
-                                       f'Kolom score hilang: {", ".join(missing)}'
-                                       )
-                        return redirect('framework_list')
-
-                    success_count = 0
-                    for idx, row in enumerate(reader, start=1):
-                        try:
-                            fw = Framework.objects.get(name=row['framework'].strip())
-                            crit = Criteria.objects.get(name=row['criteria'].strip())
-                            val = float(row['value'])
-                            FrameworkScore.objects.update_or_create(
-                                framework=fw,
-                                criteria=crit,
-                                defaults={'value': val}
-                            )
-                            success_count += 1
-                        except Framework.DoesNotExist:
-                            messages.warning(request,
-                                             f'Framework "{row.get("framework")}" tidak ditemukan (baris {idx}).'
-                                             )
-                        except Criteria.DoesNotExist:
-                            messages.warning(request,
-                                             f'Criteria "{row.get("criteria")}" tidak ditemukan (baris {idx}).'
-                                             )
-                        except Exception as e:
-                            messages.warning(request,
-                                             f'Error di baris {idx} (score): {e}'
-                                             )
-                    messages.success(request, f'{success_count} score berhasil diupload.')
-
-                else:
-                    messages.error(
-                        request,
-                        'Nama file harus mengandung "criteria", "framework", "data", atau "score".'
-                    )
-
+                spk_metrics.record_import('upload_csv', import_rows, time.perf_counter() - started)
                 return redirect('framework_list')
 
             except Exception as e:
@@ -565,121 +1123,25 @@ def upload_csv(request):
         'upload_guide': upload_guide
     })
 
-# Management Command untuk import data
-class Command(BaseCommand):  
-    help = "Import criteria & framework data from CSV"
-
-    def add_arguments(self, parser):
-        parser.add_argument(
-            '--criteria-csv', required=True,
-            help="Path to criteria.csv (name,weight,attribute)"
-        )
-        parser.add_argument(
-            '--data-csv', required=True,
-            help="Path to data.csv with framework metrics"
-        )
-
-    def handle(self, *args, **options):
-        criteria_csv = options['criteria_csv']
-        data_csv = options['data_csv']
-
-        # 1. Reset & load kriteria
-        self.stdout.write("🔄 Resetting Criteria...")
-        Criteria.objects.all().delete()
-        
-        with open(criteria_csv, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                Criteria.objects.create(
-                    name=row['name'].strip(),
-                    weight=float(row['weight']),
-                    attribute=row['attribute'].strip().lower()
-                )
-        
-        all_criteria = list(Criteria.objects.all())
-        self.stdout.write(f"✔️ Loaded {len(all_criteria)} criteria.")
-
-        # 2. Load data.csv dan mapping kolom ke nama kriteria
-        mapping = {
-            'Performa (req/s)': 'Performa',
-            'Skalabilitas (1-5)': 'Skalabilitas',
-            'Komunitas (User)': 'Komunitas',
-            'Kemudahan Belajar (Jam)': 'Kemudahan Belajar',
-            'Pemeliharaan & Update (per Tahun)': 'Pemeliharaan & Update',
-        }
-
-        self.stdout.write("🔄 Processing data.csv for frameworks & scores...")
-        created_fw = 0
-        updated_scores = 0
-        
-        with open(data_csv, newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter=',')
-            for row in reader:
-                # Skip empty rows
-                if not row.get('Framework') or row.get('Framework').strip() == '':
-                    continue
-                    
-                fw_name = row['Framework'].strip()
-                
-                # 3. Create or get Framework
-                fw, created = Framework.objects.get_or_create(
-                    name=fw_name,
-                    defaults={'description': f'Framework {fw_name}'}
-                )
-                if created:
-                    created_fw += 1
-
-                # 4. For each mapped kriteria, update or create score
-                for col, crit_name in mapping.items():
-                    raw_val = row.get(col)
-                    if raw_val is None or raw_val == '':
-                        continue
-                    try:
-                        value = float(raw_val)
-                    except ValueError:
-                        continue
-
-                    crit = next((c for c in all_criteria if c.name == crit_name), None)
-                    if not crit:
-                        self.stderr.write(f"⚠️ Criteria '{crit_name}' not found, skipping.")
-                        continue
-
-                    FrameworkScore.objects.update_or_create(
-                        framework=fw,
-                        criteria=crit,
-                        defaults={'value': value}
-                    )
-
-                    updated_scores += 1
-
-        self.stdout.write(f"✔️ Created {created_fw} new frameworks.")
-        self.stdout.write(f"✔️ Updated/Created {updated_scores} framework scores.")
-        
-
+@replica_reads
 @login_required
 def export_data(request):
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="framework_scores.csv"'
 
-    writer = csv.writer(response)
-    criteria = Criteria.objects.all()
-    headers = ['Framework'] + [c.name for c in criteria]
-    writer.writerow(headers)
-
-    frameworks = Framework.objects.all()
-    for fw in frameworks:
-        row = [fw.name]
-        for c in criteria:
-            score = FrameworkScore.objects.filter(framework=fw, criteria=c).first()
-            row.append(score.value if score else '')
-        writer.writerow(row)
-
+    started = time.perf_counter()
+    content, rows = exports.export_snapshot()
+    response.write(content)
+    spk_metrics.record_export(rows, time.perf_counter() - started)
     return response
 
 @login_required
 def reset_data(request):
-    FrameworkScore.objects.all().delete()
-    Framework.objects.all().delete()
+    with transaction.atomic(), history.suppressed():
+        FrameworkScore.objects.all().delete()
+        Framework.objects.all().delete()
+        history.record_reset()
+    bump_data_version()
     messages.success(request, "Semua data framework dan skor berhasil di-reset.")
     return redirect('framework_list')
 
@@ -688,4 +1150,36 @@ def download_csv_template(request):
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="template.csv"'
     response.write("name,description\n")  # contoh header kolom
-    return response
\ No newline at end of file
+    return response
+
+
+def metrics(request):
+    # Endpoint untuk scraper lokal, dibatasi berdasarkan alamat IP
+    allowed = getattr(settings, 'SPK_METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    if request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponseForbidden('Akses metrics ditolak.')
+    if request.GET.get('format') == 'json':
+        return JsonResponse(spk_metrics.REGISTRY.as_dict())
+    return HttpResponse(
+        spk_metrics.REGISTRY.render_text(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+# Profiling (khusus staff)
+@staff_member_required
+def profile_list(request):
+    return render(request, 'profile_list.html', {'captures': profiling.list_profiles()})
+
+
+@staff_member_required
+def profile_download(request, profile_id, fmt):
+    if not profiling.PROFILE_ID_RE.match(profile_id) or fmt not in profiling.PROFILE_FORMATS:
+        raise Http404('Capture tidak ditemukan.')
+    path = profiling.profile_path(profile_id, fmt)
+    try:
+        handle = open(path, 'rb')
+    except FileNotFoundError:
+        raise Http404('Capture tidak ditemukan.')
+    extension, content_type = profiling.PROFILE_FORMATS[fmt]
+    return FileResponse(handle, as_attachment=True, filename=profile_id + extension, content_type=content_type)
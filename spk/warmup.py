@@ -0,0 +1,134 @@
+"""
+Warm-up cache di latar belakang setelah data version berubah.
+
+Setiap kenaikan data version (lihat ``caching.data_version_changed``) hanya
+menjadwalkan ulang satu warm-up: rentetan perubahan (import CSV, edit grid)
+memundurkan jadwal ``SPK_WARMUP_DELAY`` detik, tetapi warm-up tetap jalan
+paling lambat ``SPK_WARMUP_MAX_DELAY`` detik setelah perubahan pertama.
+Satu thread daemon per proses menunggu jadwal lalu menghitung:
+
+- statistik dashboard,
+- ranking SAW dan matriks X/R/kontribusi (per potongan) untuk bobot global
+  dan setiap profil bobot tersimpan (vektor bobot yang sama hanya dihitung sekali),
+- snapshot export CSV,
+- KD-tree untuk pencarian framework pengganti (``spk.similarity``).
+
+Semua hasil masuk ke cache dengan key versi data yang sama dengan yang
+dipakai view, jadi halaman pertama setelah import langsung mendapat hit.
+Cache ``default`` (DatabaseCache) dipakai bersama semua proses, jadi hasil
+warm-up satu worker langsung dipakai worker lain dan command seperti
+``warm_cache``. Hanya bila ``default`` diganti LocMemCache hasilnya tinggal
+di proses yang menghitungnya.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from . import exports, saw, similarity
+from . import metrics as spk_metrics
+from .caching import get_data_version
+from .models import Criteria, UserProfile
+from .stats import dashboard_stats
+from .weight_profiles import PREFERENCES_KEY, profile_weights
+
+logger = logging.getLogger(__name__)
+
+
+def _weight_vectors(criteria_list):
+    yield [c.weight for c in criteria_list]
+    for preferences in UserProfile.objects.values_list('preferences', flat=True).iterator():
+        for stored in (preferences or {}).get(PREFERENCES_KEY, {}).values():
+            yield profile_weights(criteria_list, stored)
+
+
+def warm():
+    """Hitung dan simpan hasil untuk data version saat ini; kembalikan ringkasan."""
+    started = time.perf_counter()
+    version = get_data_version()
+    dashboard_stats()
+    criteria_list = list(Criteria.objects.all())
+    keys = set()
+    if criteria_list:
+        preview = getattr(settings, 'SPK_MATRIX_PAGE_SIZE', 20)
+        for kind in ('decision', 'normalized'):
+            saw.matrix_page(criteria_list, kind, 0, preview, data_version=version)
+        for weights in _weight_vectors(criteria_list):
+            key = saw.weights_key(criteria_list, weights)
+            if key not in keys:
+                keys.add(key)
+                saw.cached_result(criteria_list, weights, data_version=version)
+                saw.matrix_page(criteria_list, 'weighted', 0, preview, weights, version)
+    exports.export_snapshot(version)
+    if criteria_list:
+        similarity.get_index(version)
+    seconds = time.perf_counter() - started
+    spk_metrics.record_warmup(seconds)
+    return {'version': version, 'rankings': len(keys), 'seconds': seconds}
+
+
+class WarmupScheduler:
+    """Debounce jadwal warm-up dan jalankan di satu thread daemon."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._due = None
+        self._deadline = None
+        self._thread = None
+
+    @property
+    def pending(self):
+        return self._due is not None
+
+    def schedule(self):
+        if not getattr(settings, 'SPK_WARMUP_ENABLED', True):
+            return
+        now = time.monotonic()
+        with self._condition:
+            if self._deadline is None:
+                self._deadline = now + getattr(settings, 'SPK_WARMUP_MAX_DELAY', 30)
+            self._due = min(now + getattr(settings, 'SPK_WARMUP_DELAY', 2), self._deadline)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='spk-warmup', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _take(self):
+        # Tunggu sampai jadwal jatuh tempo (jadwal bisa dimundurkan selama menunggu)
+        with self._condition:
+            while True:
+                if self._due is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._due - time.monotonic()
+                if remaining <= 0:
+                    self._due = self._deadline = None
+                    return
+                self._condition.wait(remaining)
+
+    def _run(self):
+        while True:
+            self._take()
+            self._warm()
+
+    def _warm(self):
+        try:
+            warm()
+        except Exception:
+            spk_metrics.record_warmup(None)
+            logger.exception('Warm-up cache gagal')
+        finally:
+            connection.close()
+
+    def flush(self):
+        """Jalankan warm-up yang tertunda sekarang juga (mis. di akhir command)."""
+        with self._condition:
+            if self._due is None:
+                return None
+            self._due = self._deadline = None
+        return warm()
+
+
+scheduler = WarmupScheduler()
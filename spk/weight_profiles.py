@@ -0,0 +1,56 @@
+"""
+Profil bobot per user, disimpan di ``UserProfile.preferences``.
+
+Bentuk data::
+
+    preferences['weight_profiles'] = {
+        'Tim Backend': {'<criteria_id>': 0.3, ...},
+        ...
+    }
+
+Bobot global ``Criteria.weight`` tidak disentuh; profil hanya dipakai saat
+menghitung ranking (lihat ``saw.cached_result``). Kriteria yang belum ada di
+profil dianggap berbobot 0.
+"""
+from .models import UserProfile
+
+PREFERENCES_KEY = 'weight_profiles'
+MAX_NAME_LENGTH = 50
+
+
+def _user_profile(user):
+    profile, _ = UserProfile.objects.get_or_create(user=user)
+    return profile
+
+
+def list_profiles(user):
+    """{nama: {criteria_id (str): bobot}} milik ``user``."""
+    profile = UserProfile.objects.filter(user=user).only('preferences').first()
+    if profile is None:
+        return {}
+    return dict(profile.preferences.get(PREFERENCES_KEY, {}))
+
+
+def get_profile(user, name):
+    return list_profiles(user).get(name)
+
+
+def save_profile(user, name, weights):
+    """``weights``: {criteria_id: bobot}."""
+    profile = _user_profile(user)
+    profiles = profile.preferences.setdefault(PREFERENCES_KEY, {})
+    profiles[name] = {str(cid): float(w) for cid, w in weights.items()}
+    profile.save(update_fields=['preferences'])
+
+
+def delete_profile(user, name):
+    profile = _user_profile(user)
+    if profile.preferences.get(PREFERENCES_KEY, {}).pop(name, None) is not None:
+        profile.save(update_fields=['preferences'])
+        return True
+    return False
+
+
+def profile_weights(criteria_list, stored):
+    """Vektor bobot sejajar ``criteria_list`` dari data profil tersimpan."""
+    return [float(stored.get(str(c.id), 0.0)) for c in criteria_list]